@@ -9,15 +9,40 @@ License: MIT
 """
 
 import logging
+from typing import Optional
+
 from google.adk.agents import Agent
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.models import LlmRequest, LlmResponse
 from google.adk.tools import FunctionTool
 
 from config import Config
-from tools.pdf_tools import extract_pdf_text, classify_document
-from tools.datetime_tools import get_current_datetime
+from tools.async_pdf_tools import (
+    extract_compact_text_async,
+    classify_document_async,
+    classify_pdf_async,
+    export_plan_calendar_async,
+    extract_and_classify_pdfs_async,
+    extract_exam_timetable_async,
+    index_pyq_document_async,
+    match_syllabus_to_pyq_async,
+    open_document_async,
+)
+from tools.datetime_tools import begin_turn, get_current_datetime
+from tools.document_store import (
+    get_document_pages,
+    get_document_section,
+    list_documents,
+    search_document,
+)
+from tools.pyq_index import get_pyq_topic_frequency, lookup_pyq_topic
+from tools import response_cache, telemetry
+from tools.scheduler import generate_study_plan, replan_study_plan
 
-# Initialize configuration and logging
+# Initialize configuration and logging (explicitly here rather than as a side
+# effect of importing config, so tools and scripts can import it cheaply)
 logger = logging.getLogger(__name__)
+Config.setup_logging()
 
 try:
     Config.validate()
@@ -30,18 +55,65 @@ except ValueError as e:
 # ─────────────────────────────────────────────
 # REGISTER TOOLS
 # ─────────────────────────────────────────────
+# PDF tools are async: blocking work runs on a bounded executor so one slow
+# document never stalls other students' sessions on the same worker.
 extract_pdf_tool = FunctionTool(
-    extract_pdf_text,
+    extract_compact_text_async,
     name="extract_pdf_text",
     description=(
-        "Extract text content from PDF files. "
-        "Supports exam timetables, syllabi, PYQs, and assignments. "
-        "Maximum file size: 10MB."
+        "Extract text content from PDF files, with repeated headers, page "
+        "numbers and boilerplate removed and trimmed to a token budget for "
+        "the document type. Supports exam timetables, syllabi, PYQs, and "
+        "assignments. Maximum file size: 10MB."
+    )
+)
+
+open_document_tool = FunctionTool(
+    open_document_async,
+    name="open_document",
+    description=(
+        "Open a PDF once per session and get a short document ID with its "
+        "type, page count, section titles, and a brief preview. Use the ID "
+        "with the document tools instead of extracting the PDF again."
+    )
+)
+
+document_pages_tool = FunctionTool(
+    get_document_pages,
+    name="get_document_pages",
+    description=(
+        "Get the compacted text of a page range from an open document."
+    )
+)
+
+document_section_tool = FunctionTool(
+    get_document_section,
+    name="get_document_section",
+    description=(
+        "Get the compacted text of one section (unit, module, chapter) of an "
+        "open document by its title or number."
+    )
+)
+
+search_document_tool = FunctionTool(
+    search_document,
+    name="search_document",
+    description=(
+        "Search an open document for a word or phrase and return the "
+        "matching lines with page numbers."
+    )
+)
+
+list_documents_tool = FunctionTool(
+    list_documents,
+    name="list_documents",
+    description=(
+        "List the documents opened in this session with their IDs and types."
     )
 )
 
 classify_document_tool = FunctionTool(
-    classify_document,
+    classify_document_async,
     name="classify_document",
     description=(
         "Classify document type from extracted text. "
@@ -50,17 +122,150 @@ classify_document_tool = FunctionTool(
     )
 )
 
+batch_extract_classify_tool = FunctionTool(
+    extract_and_classify_pdfs_async,
+    name="extract_and_classify_pdfs",
+    description=(
+        "Classify several PDF files in a single call. "
+        "Returns one result per file with document type, confidence score, "
+        "page count and estimated tokens (or an error message for that "
+        "file), but no text: open a file with open_document to read it."
+    )
+)
+
+exam_timetable_tool = FunctionTool(
+    extract_exam_timetable_async,
+    name="extract_exam_timetable",
+    description=(
+        "Parse an exam timetable PDF into compact structured rows "
+        "(subject, date, time, days left) without returning the raw text. "
+        "Use for documents classified as exam_timetable."
+    )
+)
+
+index_pyq_tool = FunctionTool(
+    index_pyq_document_async,
+    name="index_pyq_document",
+    description=(
+        "Add a previous year question paper to the persistent PYQ topic "
+        "index for a subject. Each paper is indexed once; the year is "
+        "detected from the paper if not given."
+    )
+)
+
+pyq_frequency_tool = FunctionTool(
+    get_pyq_topic_frequency,
+    name="get_pyq_topic_frequency",
+    description=(
+        "Rank a subject's topics by how many indexed PYQ years they appeared "
+        "in, with question counts and total marks."
+    )
+)
+
+pyq_lookup_tool = FunctionTool(
+    lookup_pyq_topic,
+    name="lookup_pyq_topic",
+    description=(
+        "Look up how often a topic appeared in a subject's indexed PYQ "
+        "papers, with the matching questions by year."
+    )
+)
+
+syllabus_match_tool = FunctionTool(
+    match_syllabus_to_pyq_async,
+    name="match_syllabus_to_pyq",
+    description=(
+        "Match a subject's indexed PYQ questions to its syllabus topics and "
+        "return a priority weight per topic (1 = never asked, 3 = asked "
+        "every year) with question counts, years, and marks."
+    )
+)
+
+classify_pdf_tool = FunctionTool(
+    classify_pdf_async,
+    name="classify_pdf",
+    description=(
+        "Classify a PDF file's document type by reading only as many pages "
+        "as needed to reach the confidence threshold. "
+        "Returns document type, confidence score, and pages read."
+    )
+)
+
+study_plan_tool = FunctionTool(
+    generate_study_plan,
+    name="generate_study_plan",
+    description=(
+        "Generate a day-by-day study plan from exams, weighted topics, and "
+        "student availability. Enforces 2-hour blocks with 10-minute breaks, "
+        "an 8-hour daily cap, and revision the day before each exam. "
+        "Returns dated sessions, unscheduled topics, and warnings."
+    )
+)
+
+replan_tool = FunctionTool(
+    replan_study_plan,
+    name="replan_study_plan",
+    description=(
+        "Update a plan from generate_study_plan after missed sessions or an "
+        "availability change. Reschedules only the affected days and returns "
+        "just the days that changed, plus unscheduled topics and warnings."
+    )
+)
+
+calendar_export_tool = FunctionTool(
+    export_plan_calendar_async,
+    name="export_plan_calendar",
+    description=(
+        "Export a study plan (including replans) to ICS calendar files with "
+        "stable event IDs. Writes the full calendar and a delta with only the "
+        "sessions added, moved or cancelled since the last export of the "
+        "same calendar_id."
+    )
+)
+
 current_datetime_tool = FunctionTool(
     get_current_datetime,
     name="get_current_datetime",
     description=(
-        "Get current UTC date and time. "
+        "Get the current date and time in the student's timezone. "
         "Use this to determine today's date for planning purposes. "
         "Never ask the user for the current date."
     )
 )
 
 
+# ─────────────────────────────────────────────
+# MODEL CALLBACKS
+# ─────────────────────────────────────────────
+def before_model(
+    callback_context: CallbackContext, llm_request: LlmRequest
+) -> Optional[LlmResponse]:
+    """Fix the turn's clock, then answer from cache or start timing the call."""
+    # Every date tool in this turn reads the same snapshot of the clock
+    begin_turn(callback_context.invocation_id)
+    if Config.RESPONSE_CACHE_ENABLED:
+        cached = response_cache.before_model_callback(callback_context, llm_request)
+        if cached is not None:
+            return cached
+    if Config.TELEMETRY_ENABLED:
+        telemetry.model_call_started(callback_context, llm_request)
+    return None
+
+
+def after_model(
+    callback_context: CallbackContext, llm_response: LlmResponse
+) -> Optional[LlmResponse]:
+    """Record the model round trip and cache the reply."""
+    if Config.TELEMETRY_ENABLED:
+        telemetry.model_call_finished(callback_context, llm_response)
+    if Config.RESPONSE_CACHE_ENABLED:
+        response_cache.after_model_callback(callback_context, llm_response)
+    return None
+
+
+_after_model_enabled = Config.RESPONSE_CACHE_ENABLED or Config.TELEMETRY_ENABLED
+
+
 # ─────────────────────────────────────────────
 # AGENT DEFINITION
 # ─────────────────────────────────────────────
@@ -72,11 +277,31 @@ root_agent = Agent(
         "study schedules by analyzing exam timetables, syllabi, and PYQs. "
         "Provides adaptive planning with visual, markdown-formatted outputs."
     ),
-    tools=[
+    # Every tool call is timed and counted when TELEMETRY_ENABLED is set
+    tools=telemetry.instrument_tools([
+        open_document_tool,
+        document_pages_tool,
+        document_section_tool,
+        search_document_tool,
+        list_documents_tool,
         extract_pdf_tool,
         classify_document_tool,
+        batch_extract_classify_tool,
+        classify_pdf_tool,
+        exam_timetable_tool,
+        index_pyq_tool,
+        pyq_frequency_tool,
+        pyq_lookup_tool,
+        syllabus_match_tool,
+        study_plan_tool,
+        replan_tool,
+        calendar_export_tool,
         current_datetime_tool,
-    ],
+    ]),
+    # Identical requests on the same day (same documents, same question)
+    # are answered from the response cache instead of calling the model
+    before_model_callback=before_model,
+    after_model_callback=after_model if _after_model_enabled else None,
     instruction="""
 You are **Taskify Agent**, an intelligent academic mentor and study planning assistant.
 
@@ -107,12 +332,29 @@ Your mission is to help students succeed by creating realistic, adaptive study p
 📄 PDF HANDLING WORKFLOW
 ━━━━━━━━━━━━━━━━━━━━━━━━━━
 When a PDF is uploaded:
-1. Call `extract_pdf_text(file_path)` to get the content
-2. Call `classify_document(text)` to identify document type
+1. Call `open_document(file_path)` once; it returns a `doc_id`, the
+   document type, page count, section titles, and a short preview
+   (call it for each file when several PDFs are uploaded together; use
+   `classify_pdf(file_path)` if you only need a file's type)
+2. Read only what you need by `doc_id`: `get_document_section(doc_id,
+   section)`, `get_document_pages(doc_id, start_page, end_page)`, or
+   `search_document(doc_id, query)`; `list_documents()` shows the IDs
+   already open this session
+   - **NEVER** re-extract or re-open a document that already has a `doc_id`
+   - Use `extract_pdf_text(file_path)` only when the whole compacted
+     document is genuinely needed at once, and `classify_document(text)`
+     for text that did not come from a PDF file
 3. Extract relevant information based on document type:
-   - **Exam Timetable**: subjects, dates, times
-   - **Syllabus**: units, chapters, topics, weightage
-   - **PYQ**: frequently asked topics, question patterns
+   - **Exam Timetable**: call `extract_exam_timetable(file_path)` and use its
+     rows (subject, date, time, days left) directly; only read the pages
+     by `doc_id` if it returns no rows
+   - **Syllabus**: units, chapters, topics, weightage; once the subject's
+     PYQs are indexed, call `match_syllabus_to_pyq(subject,
+     syllabus_file=file_path)` for per-topic PYQ weights
+   - **PYQ**: call `index_pyq_document(file_path, subject)` once per paper,
+     then use `get_pyq_topic_frequency(subject)` for frequently asked topics
+     and `lookup_pyq_topic(subject, topic)` for a single topic instead of
+     re-reading the papers
    - **Assignment**: title, deadline, estimated effort
 4. **NEVER hallucinate** missing information - only use extracted data
 5. If critical info is missing, ask the user specific questions
@@ -157,7 +399,8 @@ Present all exams and deadlines in a clear table:
 - ⚠️ Low-priority topics (can skip if time-constrained)
 
 ### 🔁 PYQ Insights (if available)
-Analyze question patterns to prioritize high-weightage topics:
+Analyze question patterns to prioritize high-weightage topics. Fill the
+Frequency column from `get_pyq_topic_frequency` (year_count/total_years):
 
 | Topic | Frequency | Importance | Action |
 |-------|-----------|------------|--------|
@@ -179,6 +422,19 @@ Detailed day-by-day schedule with realistic time blocks:
 - Never exceed 8 hours of study per day
 - Leave buffer time for unexpected events
 
+**Building the plan:** call `generate_study_plan(exams, topics, availability)`
+with the exams, topics (estimated hours and a priority weight; use the
+`weight` from `match_syllabus_to_pyq` when available), and the student's
+availability. It applies the rules above; render its `days` as this table
+and report its `unscheduled` topics and `warnings` under Warnings &
+Recommendations. Do not add or move sessions yourself.
+
+**Calendar export:** when the student wants the plan in their calendar, call
+`export_plan_calendar(plan_id, calendar_id)` with one `calendar_id` per
+student (e.g. their name), reused after replans and new plans. Point them to
+`calendar_file` for the first import and `delta_file` for later updates
+instead of repeating the table.
+
 ### ⚠️ Warnings & Recommendations
 - Time insufficiency alerts
 - Scope reduction suggestions (what to skip)
@@ -201,8 +457,12 @@ Detailed day-by-day schedule with realistic time blocks:
 - Split large assignments into smaller daily blocks
 
 **Missed Study Sessions:**
-- Perform FULL replanning, don't just shift tasks
-- Reassess priorities based on remaining time
+- Call `replan_study_plan(plan_id, missed_date, missed_subjects)` with the
+  `plan_id` of the current plan; it reprioritizes the remaining time and
+  reschedules only the affected days
+- Show only the returned `days` that changed, not the whole plan again
+- Pass `availability` as well if the student's hours have changed
+- Use `generate_study_plan` again only if exams or topics changed
 - Suggest extended hours or scope reduction if needed
 
 **Repeated PYQ Topics:**
@@ -0,0 +1,6 @@
+"""
+Taskify Agent Benchmarks.
+
+Standalone performance scripts; run from the project root, e.g.
+``python -m benchmarks.bench_parallel_extraction``.
+"""
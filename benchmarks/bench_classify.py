@@ -0,0 +1,124 @@
+"""
+Microbenchmark for classify_document across text sizes.
+
+Compares the compiled keyword scan plan against the original per-call
+implementation and a single-pass regex automaton, and checks that all three
+produce identical scores.
+
+Usage:
+    python -m benchmarks.bench_classify [--sizes 10000 100000 1000000 5000000]
+"""
+
+import argparse
+import random
+import re
+import time
+from typing import Callable, Set
+
+from tools.pdf_tools import (
+    _CLASSIFICATION_PATTERNS,
+    _classify_keywords,
+    classify_document,
+)
+
+_FILLER = (
+    "the of and explain derive theorem function matrix integral physics "
+    "chemistry semester university department page answer any five questions "
+    "communication community registration examination updated"
+).split()
+
+_KEYWORDS = [kw for kws in _CLASSIFICATION_PATTERNS.values() for kw, _ in kws]
+
+
+def legacy_classify(text: str) -> dict:
+    """The original implementation: one substring scan per keyword."""
+    if not text or not text.strip():
+        return {"type": "unknown", "confidence": 0.0}
+    text_lower = text.lower()
+    patterns = {dt: list(kws) for dt, kws in _CLASSIFICATION_PATTERNS.items()}
+    scores = {}
+    for doc_type, keywords in patterns.items():
+        scores[doc_type] = sum(w for kw, w in keywords if kw in text_lower)
+    if not any(scores.values()):
+        return {"type": "unknown", "confidence": 0.0}
+    max_type = max(scores, key=scores.get)
+    max_possible = max(sum(w for _, w in patterns[dt]) for dt in patterns)
+    confidence = min(scores[max_type] / max_possible, 1.0)
+    return {"type": max_type, "confidence": round(confidence, 2), "scores": scores}
+
+
+_AUTOMATON = re.compile(
+    "(?=(" + "|".join(map(re.escape, sorted(_KEYWORDS, key=len, reverse=True))) + "))"
+)
+
+
+def automaton_classify(text: str) -> dict:
+    """Single-pass regex automaton over overlapping keyword matches."""
+    if not text or not text.strip():
+        return {"type": "unknown", "confidence": 0.0}
+    found: Set[str] = set()
+    for match in _AUTOMATON.finditer(text.lower()):
+        keyword = match.group(1)
+        found.update(kw for kw in _KEYWORDS if kw in keyword)
+    return _classify_keywords(found)
+
+
+def _make_text(size: int, keyword_rate: float, rng: random.Random) -> str:
+    """Generate roughly ``size`` characters of filler with sparse keywords."""
+    words = []
+    length = 0
+    while length < size:
+        if rng.random() < keyword_rate:
+            word = rng.choice(_KEYWORDS)
+        else:
+            word = rng.choice(_FILLER)
+        if rng.random() < 0.1:
+            word = word.upper()
+        words.append(word)
+        length += len(word) + 1
+    return " ".join(words)
+
+
+def _best_time(func: Callable[[str], dict], text: str, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(text)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=[10_000, 100_000, 1_000_000, 5_000_000],
+    )
+    parser.add_argument("--keyword-rate", type=float, default=0.0005)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    
+    rng = random.Random(42)
+    print(
+        f"{'chars':>10} {'legacy (ms)':>12} {'compiled (ms)':>14} "
+        f"{'automaton (ms)':>15}"
+    )
+    for size in args.sizes:
+        text = _make_text(size, args.keyword_rate, rng)
+        expected = legacy_classify(text)
+        assert classify_document(text) == expected, "compiled scores differ"
+        assert automaton_classify(text) == expected, "automaton scores differ"
+        
+        legacy = _best_time(legacy_classify, text, args.repeat)
+        compiled = _best_time(classify_document, text, args.repeat)
+        automaton = _best_time(automaton_classify, text, args.repeat)
+        print(
+            f"{len(text):>10} {legacy * 1000:>12.2f} {compiled * 1000:>14.2f} "
+            f"{automaton * 1000:>15.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Benchmark agent cold-start import time.
+
+Imports a module in fresh interpreters with ``python -X importtime``, reports
+the median cumulative import time and the slowest imports, and fails if the
+time exceeds a budget or if modules that should load lazily (pypdf, numpy)
+were imported at start-up.
+
+Usage:
+    python -m benchmarks.bench_import_time [--module agent] [--budget-ms 1500]
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+# Heavy dependencies that must only be imported on first tool call
+_LAZY_MODULES = ("pypdf", "numpy")
+
+_ROOT = Path(__file__).resolve().parent.parent
+
+
+def _import_profile(module: str) -> Tuple[int, Dict[str, int]]:
+    """
+    Import ``module`` in a fresh interpreter.
+    
+    Returns:
+        Tuple of (cumulative microseconds for ``module``, cumulative
+        microseconds per imported module name)
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=_ROOT,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(
+            f"import {module} failed:\n{result.stderr.strip().splitlines()[-1]}"
+        )
+    
+    modules: Dict[str, int] = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        modules[name.strip()] = int(cumulative)
+    return modules[module], modules
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--module", default="agent")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=1500.0)
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+    
+    timings: List[int] = []
+    modules: Dict[str, int] = {}
+    for _ in range(args.repeat):
+        total, modules = _import_profile(args.module)
+        timings.append(total)
+    
+    median_ms = statistics.median(timings) / 1000
+    print(
+        f"import {args.module}: median {median_ms:.1f}ms, "
+        f"best {min(timings) / 1000:.1f}ms over {args.repeat} runs "
+        f"(budget {args.budget_ms:.0f}ms)"
+    )
+    print("slowest imports (cumulative, last run):")
+    slowest = sorted(modules.items(), key=lambda item: item[1], reverse=True)
+    for name, micros in slowest[: args.top]:
+        print(f"  {micros / 1000:8.1f}ms  {name}")
+    
+    failures = []
+    if median_ms > args.budget_ms:
+        failures.append(f"median import time {median_ms:.1f}ms exceeds budget")
+    eager = sorted({name.split(".")[0] for name in modules} & set(_LAZY_MODULES))
+    if eager:
+        failures.append(f"imported at start-up instead of lazily: {eager}")
+    
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
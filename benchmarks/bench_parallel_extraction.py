@@ -0,0 +1,69 @@
+"""
+Benchmark serial vs. process-pool PDF text extraction.
+
+Usage:
+    python -m benchmarks.bench_parallel_extraction [--pages 25 50 100] [--workers 4]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from pathlib import Path
+
+from config import Config
+from tools.pdf_tools import extract_pdf_text
+from benchmarks.synthetic_pdf import build_pdf
+
+
+def _page_text(page_no: int, lines: int = 60) -> str:
+    """Generate a dense, PYQ-like page of text."""
+    return "\n".join(
+        f"Q{page_no}.{i} Explain the concept of topic {i} with examples. "
+        f"[{(i % 4 + 1) * 5} marks] Previous year question paper 20{20 + i % 6}"
+        for i in range(lines)
+    )
+
+
+def _time_extraction(path: Path, workers: int, repeat: int) -> tuple:
+    """Return (best seconds, text) for extracting ``path`` with ``workers``."""
+    Config.PDF_EXTRACT_WORKERS = workers
+    best = float("inf")
+    text = ""
+    for _ in range(repeat):
+        start = time.perf_counter()
+        text = extract_pdf_text(str(path))
+        best = min(best, time.perf_counter() - start)
+    return best, text
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--pages", type=int, nargs="+", default=[25, 50, 100])
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 2)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    
+    # Measure raw extraction, not cache lookups
+    Config.PDF_CACHE_ENABLED = False
+    Config.PDF_PARALLEL_MIN_PAGES = 1
+    Config.MAX_PDF_PAGES = max(args.pages)
+    
+    print(f"{'pages':>6} {'serial (s)':>11} {'parallel (s)':>13} {'speedup':>8}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for num_pages in args.pages:
+            path = Path(tmp) / f"bundle_{num_pages}.pdf"
+            path.write_bytes(build_pdf([_page_text(p) for p in range(num_pages)]))
+            
+            serial, serial_text = _time_extraction(path, 1, args.repeat)
+            parallel, parallel_text = _time_extraction(path, args.workers, args.repeat)
+            assert parallel_text == serial_text, "parallel output differs from serial"
+            
+            print(
+                f"{num_pages:>6} {serial:>11.3f} {parallel:>13.3f} "
+                f"{serial / parallel:>7.2f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,273 @@
+"""
+Benchmark suite over a synthetic document corpus.
+
+Generates exam timetables, syllabi, PYQ papers and assignments from 1 page
+up to MAX_PDF_PAGES, then measures throughput and peak memory of
+extract_pdf_text, classify_document, parse_date and calculate_days_until.
+Results are written as JSON (by default to
+``.cache/benchmarks/<commit>.json``) so runs can be compared across
+commits with ``--compare``.
+
+Usage:
+    python -m benchmarks.bench_suite [--pages 1 10 100] [--repeat 3]
+    python -m benchmarks.bench_suite --compare .cache/benchmarks/<base>.json
+"""
+
+import argparse
+import json
+import platform
+import shutil
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from benchmarks.synthetic_corpus import build_corpus, generate_dates
+from config import Config
+from tools.datetime_tools import _parse_date_cached, calculate_days_until, parse_date
+from tools.pdf_tools import classify_document, extract_pdf_text
+
+RESULTS_DIR = Path(".cache/benchmarks")
+
+_DEFAULT_PAGES = [1, 2, 5, 10, 25, 50]
+
+# Metrics where a larger value is better; everything else is lower-is-better
+_HIGHER_IS_BETTER = ("pages_per_s", "mb_per_s", "ops_per_s")
+
+
+def _measure(func: Callable[[], Any], repeat: int) -> Tuple[float, int, Any]:
+    """
+    Time ``func`` and measure its peak allocation.
+    
+    Timing runs without tracemalloc (which slows allocation-heavy code
+    several times over); peak memory comes from one extra traced run.
+    
+    Returns:
+        (best seconds, peak traced bytes, last result)
+    """
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return best, peak, result
+
+
+def _bench_documents(
+    corpus: List[Tuple[str, int, Path]], repeat: int
+) -> List[Dict[str, Any]]:
+    """Extract and classify every corpus document."""
+    results = []
+    for doc_type, pages, path in corpus:
+        extract_s, extract_peak, text = _measure(
+            lambda: extract_pdf_text(str(path)), repeat
+        )
+        classify_s, classify_peak, classified = _measure(
+            lambda: classify_document(text), repeat
+        )
+        text_mb = len(text.encode("utf-8")) / 1e6
+        results.append({
+            "doc_type": doc_type,
+            "pages": pages,
+            "file_bytes": path.stat().st_size,
+            "text_chars": len(text),
+            "extract_s": round(extract_s, 6),
+            "extract_pages_per_s": round(pages / extract_s, 2),
+            "extract_peak_kb": round(extract_peak / 1024, 1),
+            "classify_s": round(classify_s, 6),
+            "classify_mb_per_s": round(text_mb / classify_s, 2),
+            "classify_peak_kb": round(classify_peak / 1024, 1),
+            "classified_as": classified["type"],
+        })
+    return results
+
+
+def _bench_dates(count: int, repeat: int) -> Dict[str, Any]:
+    """Parse distinct dates cold (cache cleared) and warm, and count days."""
+    dates = generate_dates(count)
+    
+    def parse_cold() -> List[Any]:
+        _parse_date_cached.cache_clear()
+        return [parse_date(d) for d in dates]
+    
+    def parse_warm() -> List[Any]:
+        return [parse_date(d) for d in dates]
+    
+    def days_until() -> List[Optional[int]]:
+        _parse_date_cached.cache_clear()
+        return [calculate_days_until(d) for d in dates]
+    
+    cold_s, cold_peak, parsed = _measure(parse_cold, repeat)
+    parse_cold()
+    warm_s, _, _ = _measure(parse_warm, repeat)
+    days_s, days_peak, _ = _measure(days_until, repeat)
+    
+    return {
+        "dates": count,
+        "unparsed": sum(value is None for value in parsed),
+        "parse_date_cold_ops_per_s": round(count / cold_s),
+        "parse_date_warm_ops_per_s": round(count / warm_s),
+        "parse_date_peak_kb": round(cold_peak / 1024, 1),
+        "calculate_days_until_ops_per_s": round(count / days_s),
+        "calculate_days_until_peak_kb": round(days_peak / 1024, 1),
+    }
+
+
+def _git_revision() -> str:
+    """Short commit hash, suffixed with -dirty for uncommitted changes."""
+    try:
+        sha = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+        dirty = subprocess.run(
+            ["git", "status", "--porcelain", "--untracked-files=no"],
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+    return f"{sha}-dirty" if dirty else sha
+
+
+def _flatten(results: Dict[str, Any]) -> Dict[str, float]:
+    """Map every numeric metric to a stable key for comparison."""
+    flat: Dict[str, float] = {}
+    for row in results["documents"]:
+        prefix = f"{row['doc_type']}/{row['pages']}p"
+        for key, value in row.items():
+            if key.endswith(("_per_s", "_kb")):
+                flat[f"{prefix}/{key}"] = value
+    for key, value in results["dates"].items():
+        if key.endswith(("_per_s", "_kb")):
+            flat[f"dates/{key}"] = value
+    return flat
+
+
+def compare(baseline: Dict[str, Any], current: Dict[str, Any], threshold: float) -> int:
+    """
+    Print per-metric changes against a baseline run.
+    
+    Args:
+        baseline: Results of the earlier run
+        current: Results of this run
+        threshold: Fractional change counted as a regression (0.1 = 10%)
+        
+    Returns:
+        Number of metrics that regressed by more than ``threshold``
+    """
+    old, new = _flatten(baseline), _flatten(current)
+    regressions = 0
+    print(
+        f"\nvs {baseline['meta']['revision']} "
+        f"(regression threshold {threshold:.0%})"
+    )
+    print(f"{'metric':<52} {'baseline':>12} {'current':>12} {'change':>8}")
+    for key in sorted(old.keys() & new.keys()):
+        if not old[key]:
+            continue
+        change = (new[key] - old[key]) / old[key]
+        worse = -change if key.endswith(_HIGHER_IS_BETTER) else change
+        flag = ""
+        if worse > threshold:
+            regressions += 1
+            flag = "  REGRESSION"
+        print(
+            f"{key:<52} {old[key]:>12g} {new[key]:>12g} {change:>+8.1%}{flag}"
+        )
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--pages", type=int, nargs="+",
+        help="Page counts per document (default: 1..MAX_PDF_PAGES)",
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--dates", type=int, default=20000)
+    parser.add_argument("--output", type=Path, help="Results file to write")
+    parser.add_argument("--compare", type=Path, help="Baseline results file")
+    parser.add_argument("--threshold", type=float, default=0.10)
+    parser.add_argument(
+        "--fail-on-regression", action="store_true",
+        help="Exit non-zero if any metric regresses beyond --threshold",
+    )
+    args = parser.parse_args()
+    
+    pages = args.pages or sorted(
+        {p for p in _DEFAULT_PAGES if p < Config.MAX_PDF_PAGES} | {Config.MAX_PDF_PAGES}
+    )
+    # Measure raw extraction, not cache lookups
+    Config.PDF_CACHE_ENABLED = False
+    Config.MAX_PDF_PAGES = max(Config.MAX_PDF_PAGES, max(pages))
+    
+    # Inside the project, so extraction takes the same path as real uploads
+    corpus_dir = RESULTS_DIR / "corpus"
+    try:
+        corpus = build_corpus(corpus_dir, pages)
+        documents = _bench_documents(corpus, args.repeat)
+    finally:
+        shutil.rmtree(corpus_dir, ignore_errors=True)
+    dates = _bench_dates(args.dates, args.repeat)
+    
+    results = {
+        "meta": {
+            "revision": _git_revision(),
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "repeat": args.repeat,
+            "pages": pages,
+            "pdf_extract_workers": Config.PDF_EXTRACT_WORKERS,
+            "pdf_parallel_min_pages": Config.PDF_PARALLEL_MIN_PAGES,
+        },
+        "documents": documents,
+        "dates": dates,
+    }
+    
+    print(
+        f"{'type':<15} {'pages':>5} {'extract (s)':>11} {'pages/s':>9} "
+        f"{'peak KB':>9} {'classify MB/s':>13} {'classified as':<15}"
+    )
+    for row in documents:
+        print(
+            f"{row['doc_type']:<15} {row['pages']:>5} {row['extract_s']:>11.4f} "
+            f"{row['extract_pages_per_s']:>9.1f} {row['extract_peak_kb']:>9.0f} "
+            f"{row['classify_mb_per_s']:>13.1f} {row['classified_as']:<15}"
+        )
+    misclassified = [r for r in documents if r["classified_as"] != r["doc_type"]]
+    if misclassified:
+        print(f"warning: {len(misclassified)} document(s) misclassified")
+    print(
+        f"\nparse_date: {dates['parse_date_cold_ops_per_s']:,} ops/s cold, "
+        f"{dates['parse_date_warm_ops_per_s']:,} ops/s warm; "
+        f"calculate_days_until: {dates['calculate_days_until_ops_per_s']:,} ops/s "
+        f"({dates['dates']:,} dates, {dates['unparsed']} unparsed)"
+    )
+    
+    output = args.output or RESULTS_DIR / f"{results['meta']['revision']}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(results, indent=2) + "\n")
+    print(f"\nResults written to {output}")
+    
+    if args.compare:
+        baseline = json.loads(args.compare.read_text())
+        regressions = compare(baseline, results, args.threshold)
+        if regressions and args.fail_on_regression:
+            print(f"{regressions} metric(s) regressed")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""
+Benchmark for syllabus-to-PYQ topic matching.
+
+Times match_questions on synthetic question and topic sets and checks its
+scores against a dense TF-IDF matrix product on a smaller corpus.
+
+Usage:
+    python -m benchmarks.bench_topic_matching [--questions 10000] [--topics 1000]
+"""
+
+import argparse
+import random
+import time
+from typing import List, Tuple
+
+import numpy as np
+
+from tools.topic_matcher import _ngram_features, match_questions
+
+_STEMS = (
+    "fourier laplace eigen matrix integral differential vector tensor "
+    "thermo kinetic quantum orbital polymer enzyme circuit signal network "
+    "compiler parser graph sorting hashing database transaction kernel "
+    "memory process thread cache optical laser magnetic electric fluid"
+).split()
+
+_SUFFIXES = ("", "s", " theorem", " transform", " analysis", " methods", " systems")
+
+_VERBS = ("Explain", "Derive", "Define", "Describe", "Prove", "Discuss", "Solve")
+
+
+def _make_topics(count: int, rng: random.Random) -> List[str]:
+    """Generate distinct two- or three-word topic names."""
+    topics = set()
+    while len(topics) < count:
+        words = rng.sample(_STEMS, rng.choice((2, 3)))
+        topics.add(" ".join(words) + rng.choice(_SUFFIXES))
+    return sorted(topics)
+
+
+def _make_questions(
+    count: int, topics: List[str], rng: random.Random
+) -> Tuple[List[str], List[int]]:
+    """Generate questions that each paraphrase one known topic."""
+    questions = []
+    truth = []
+    for _ in range(count):
+        index = rng.randrange(len(topics))
+        filler = " ".join(rng.sample(_STEMS, 2))
+        questions.append(
+            f"{rng.choice(_VERBS)} the {topics[index]} with reference to "
+            f"{filler}. ({rng.choice((5, 10, 15))} marks)"
+        )
+        truth.append(index)
+    return questions, truth
+
+
+def _dense_scores(questions: List[str], topics: List[str]) -> np.ndarray:
+    """Reference cosine scores from dense TF-IDF matrices over the same vocab."""
+    topic_docs, topic_hashes = _ngram_features(topics)
+    question_docs, question_hashes = _ngram_features(questions)
+    vocab = np.unique(topic_hashes)
+    width = len(vocab)
+    question_cols = np.searchsorted(vocab, question_hashes).clip(max=width - 1)
+    known = vocab[question_cols] == question_hashes
+    
+    def counts(docs, cols, rows):
+        matrix = np.zeros((rows, width))
+        np.add.at(matrix, (docs, cols), 1)
+        return matrix
+    
+    t_counts = counts(topic_docs, np.searchsorted(vocab, topic_hashes), len(topics))
+    q_counts = counts(question_docs[known], question_cols[known], len(questions))
+    df = (t_counts > 0).sum(axis=0) + (q_counts > 0).sum(axis=0)
+    idf = np.log((1.0 + len(questions) + len(topics)) / (1.0 + df)) + 1.0
+    
+    def tfidf(matrix):
+        weighted = np.where(matrix > 0, 1.0 + np.log(np.maximum(matrix, 1)), 0.0)
+        weighted *= idf
+        norms = np.linalg.norm(weighted, axis=1, keepdims=True)
+        return weighted / np.maximum(norms, 1e-12)
+    
+    return tfidf(q_counts) @ tfidf(t_counts).T
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--questions", type=int, default=10000)
+    parser.add_argument("--topics", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+    
+    rng = random.Random(args.seed)
+    topics = _make_topics(args.topics, rng)
+    questions, truth = _make_questions(args.questions, topics, rng)
+    
+    timings = []
+    for _ in range(args.repeat):
+        started = time.perf_counter()
+        best, scores = match_questions(questions, topics)
+        timings.append(time.perf_counter() - started)
+    
+    accuracy = float(np.mean(best == np.array(truth)))
+    print(
+        f"{args.questions} questions x {args.topics} topics: "
+        f"best {min(timings) * 1000:.1f}ms, "
+        f"median {sorted(timings)[len(timings) // 2] * 1000:.1f}ms, "
+        f"top-1 accuracy {accuracy:.3f}"
+    )
+    
+    # Check the sparse product against dense matrices on a smaller corpus
+    check_topics = _make_topics(100, rng)
+    check_questions, _ = _make_questions(500, check_topics, rng)
+    _, check_scores = match_questions(check_questions, check_topics)
+    reference = _dense_scores(check_questions, check_topics).max(axis=1)
+    error = float(np.abs(reference - check_scores).max())
+    print(f"max score difference vs dense product (500 x 100): {error:.2e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+"""
+Synthetic document corpus for benchmarks.
+
+Generates deterministic exam timetables, syllabi, PYQ papers and
+assignments of any page count, as page texts or as PDF files built with
+:func:`benchmarks.synthetic_pdf.build_pdf`.
+"""
+
+import random
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+from benchmarks.synthetic_pdf import build_pdf
+
+DOC_TYPES = ("exam_timetable", "syllabus", "pyq", "assignment")
+
+# Lines per generated page, close to a dense A4 page at 9pt
+_LINES_PER_PAGE = 60
+
+_SUBJECTS = (
+    "Engineering Mathematics", "Applied Physics", "Organic Chemistry",
+    "Data Structures", "Digital Electronics", "Thermodynamics",
+    "Signals and Systems", "Operating Systems", "Computer Networks",
+    "Fluid Mechanics", "Control Systems", "Database Management",
+)
+
+_TOPICS = (
+    "Fourier series", "Laplace transform", "eigenvalues and eigenvectors",
+    "binary search trees", "graph traversal", "entropy and enthalpy",
+    "Bernoulli's equation", "process scheduling", "TCP congestion control",
+    "normal forms", "Karnaugh maps", "stability criteria", "hash tables",
+    "partial differential equations", "reaction mechanisms", "page replacement",
+)
+
+# One date per supported format, so parse_date sees the full mix
+_DATE_FORMATS = ("%Y-%m-%d", "%d/%m/%Y", "%d-%m-%Y", "%b %d, %Y", "%B %d, %Y")
+
+
+def _format_date(day: date, rng: random.Random) -> str:
+    return day.strftime(rng.choice(_DATE_FORMATS))
+
+
+def _timetable_page(page_no: int, rng: random.Random) -> List[str]:
+    lines = [
+        "END SEMESTER EXAMINATION TIMETABLE",
+        f"Date Time Subject Venue (page {page_no})",
+    ]
+    start = date(2026, 11, 2)
+    while len(lines) < _LINES_PER_PAGE:
+        day = start + timedelta(days=rng.randrange(45))
+        slot = rng.choice(("09:30 AM - 12:30 PM", "02:00 PM - 05:00 PM"))
+        lines.append(
+            f"{_format_date(day, rng)}   {slot}   {rng.choice(_SUBJECTS)}   "
+            f"Hall {rng.randrange(1, 20)}"
+        )
+    return lines
+
+
+def _syllabus_page(page_no: int, rng: random.Random) -> List[str]:
+    lines = [f"COURSE SYLLABUS - {rng.choice(_SUBJECTS)}"]
+    unit = page_no * 2 - 1
+    while len(lines) < _LINES_PER_PAGE:
+        if len(lines) % 12 == 1:
+            lines.append(f"UNIT {unit}: {rng.choice(_TOPICS).title()} (8 hours)")
+            unit += 1
+            continue
+        topics = ", ".join(rng.sample(_TOPICS, 3))
+        lines.append(f"Topics: {topics}; course outcome CO{rng.randrange(1, 6)}")
+    return lines
+
+
+def _pyq_page(page_no: int, rng: random.Random) -> List[str]:
+    lines = [
+        f"Previous Year Question Paper {rng.choice((2021, 2022, 2023, 2024))}",
+        "Answer any five questions. Maximum marks: 100",
+    ]
+    question = (page_no - 1) * 20 + 1
+    while len(lines) < _LINES_PER_PAGE:
+        lines.append(
+            f"Q{question}. Explain {rng.choice(_TOPICS)} with a suitable example. "
+            f"({rng.choice((5, 10, 15))} marks)"
+        )
+        if rng.random() < 0.4:
+            lines.append(f"(b) Derive the expression for {rng.choice(_TOPICS)}.")
+        question += 1
+    return lines
+
+
+def _assignment_page(page_no: int, rng: random.Random) -> List[str]:
+    due = date(2026, 11, 1) + timedelta(days=rng.randrange(30))
+    lines = [
+        f"ASSIGNMENT {page_no} - {rng.choice(_SUBJECTS)}",
+        f"Submission deadline: {_format_date(due, rng)}. Submit on the portal.",
+    ]
+    task = 1
+    while len(lines) < _LINES_PER_PAGE:
+        lines.append(
+            f"Task {task}: Implement and analyse {rng.choice(_TOPICS)}; "
+            f"include a short report."
+        )
+        task += 1
+    return lines
+
+
+_PAGE_GENERATORS: Dict[str, Callable[[int, random.Random], List[str]]] = {
+    "exam_timetable": _timetable_page,
+    "syllabus": _syllabus_page,
+    "pyq": _pyq_page,
+    "assignment": _assignment_page,
+}
+
+
+def generate_pages(doc_type: str, page_count: int, seed: int = 0) -> List[str]:
+    """
+    Generate the page texts of one synthetic document.
+    
+    Args:
+        doc_type: One of :data:`DOC_TYPES`
+        page_count: Number of pages
+        seed: Random seed; the same arguments always give the same text
+        
+    Returns:
+        Text of each page
+    """
+    rng = random.Random(f"{doc_type}:{page_count}:{seed}")
+    generator = _PAGE_GENERATORS[doc_type]
+    return [
+        "\n".join(generator(page_no, rng)) for page_no in range(1, page_count + 1)
+    ]
+
+
+def generate_dates(count: int, seed: int = 0) -> List[str]:
+    """Generate ``count`` distinct date strings in a mix of supported formats."""
+    rng = random.Random(seed)
+    start = date(1950, 1, 1)
+    return [
+        _format_date(start + timedelta(days=offset), rng) for offset in range(count)
+    ]
+
+
+def build_corpus(
+    out_dir: Path, page_counts: List[int], seed: int = 0
+) -> List[Tuple[str, int, Path]]:
+    """
+    Write one PDF per document type and page count.
+    
+    Args:
+        out_dir: Directory for the generated files
+        page_counts: Page counts to generate
+        seed: Random seed
+        
+    Returns:
+        (document type, page count, path) for each file
+    """
+    out_dir.mkdir(parents=True, exist_ok=True)
+    corpus = []
+    for doc_type in DOC_TYPES:
+        for pages in page_counts:
+            path = out_dir / f"{doc_type}_{pages:03d}.pdf"
+            path.write_bytes(build_pdf(generate_pages(doc_type, pages, seed)))
+            corpus.append((doc_type, pages, path))
+    return corpus
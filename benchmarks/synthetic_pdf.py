@@ -0,0 +1,69 @@
+"""
+Synthetic PDF generation for benchmarks.
+
+Builds small, valid text PDFs without any third-party dependency so that
+benchmarks can run on any machine with only the project requirements.
+"""
+
+from typing import List
+
+
+def _escape(line: str) -> str:
+    """Escape a line for use inside a PDF string literal."""
+    return line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def build_pdf(pages: List[str]) -> bytes:
+    """
+    Build a PDF document with one text page per entry in ``pages``.
+    
+    Args:
+        pages: Page texts; newlines start new lines on the page
+    
+    Returns:
+        PDF file content as bytes
+    """
+    objects: List[bytes] = []
+    
+    def add(obj: bytes) -> int:
+        objects.append(obj)
+        return len(objects)
+    
+    font_id = add(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+    pages_id = add(b"")  # Filled in once all page ids are known
+    
+    page_ids = []
+    for text in pages:
+        ops = ["BT /F1 9 Tf 11 TL 40 800 Td"]
+        ops.extend(f"({_escape(line)}) Tj T*" for line in text.split("\n"))
+        ops.append("ET")
+        stream = "\n".join(ops).encode("latin-1", errors="replace")
+        content_id = add(
+            b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream"
+        )
+        page_ids.append(add(
+            b"<< /Type /Page /Parent %d 0 R /MediaBox [0 0 595 842] "
+            b"/Contents %d 0 R /Resources << /Font << /F1 %d 0 R >> >> >>"
+            % (pages_id, content_id, font_id)
+        ))
+    
+    kids = b" ".join(b"%d 0 R" % pid for pid in page_ids)
+    objects[pages_id - 1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (
+        kids, len(page_ids)
+    )
+    catalog_id = add(b"<< /Type /Catalog /Pages %d 0 R >>" % pages_id)
+    
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, obj in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % number + obj + b"\nendobj\n"
+    
+    xref_offset = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for offset in offsets:
+        out += b"%010d 00000 n \n" % offset
+    out += b"trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (
+        len(objects) + 1, catalog_id, xref_offset
+    )
+    return bytes(out)
@@ -6,9 +6,36 @@ with proper validation and security measures.
 """
 
 import os
+import json
 import logging
 from typing import Optional
 from pathlib import Path
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+
+class JsonLogFormatter(logging.Formatter):
+    """Format log records as one JSON object per line, including extras."""
+    
+    # Attributes every LogRecord has; anything else was passed via extra=
+    _STANDARD_ATTRS = frozenset(
+        vars(logging.LogRecord("", 0, "", 0, "", (), None))
+    ) | {"message", "asctime"}
+    
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        entry.update(
+            (key, value)
+            for key, value in vars(record).items()
+            if key not in self._STANDARD_ATTRS
+        )
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str, ensure_ascii=False)
 
 
 class Config:
@@ -22,9 +49,128 @@ class Config:
     MAX_PDF_SIZE_MB: int = int(os.getenv("MAX_PDF_SIZE_MB", "10"))
     MAX_PDF_PAGES: int = int(os.getenv("MAX_PDF_PAGES", "100"))
     
+    # Parallel Extraction (1 worker = serial extraction)
+    PDF_EXTRACT_WORKERS: int = int(os.getenv("PDF_EXTRACT_WORKERS", "1"))
+    PDF_PARALLEL_MIN_PAGES: int = int(os.getenv("PDF_PARALLEL_MIN_PAGES", "16"))
+    
+    # Batch Processing
+    PDF_BATCH_WORKERS: int = int(os.getenv("PDF_BATCH_WORKERS", "4"))
+    PDF_BATCH_MAX_FILES: int = int(os.getenv("PDF_BATCH_MAX_FILES", "50"))
+    
+    # Async Tool Execution
+    ASYNC_TOOL_CONCURRENCY: int = int(os.getenv("ASYNC_TOOL_CONCURRENCY", "8"))
+    
+    # Extraction Cache
+    PDF_CACHE_ENABLED: bool = os.getenv("PDF_CACHE_ENABLED", "true").lower() == "true"
+    PDF_CACHE_DIR: str = os.getenv("PDF_CACHE_DIR", ".cache/pdf_text")
+    PDF_CACHE_MAX_MB: int = int(os.getenv("PDF_CACHE_MAX_MB", "256"))
+    
+    # OCR Fallback for scanned pages (needs pytesseract, Pillow and tesseract)
+    ENABLE_OCR: bool = os.getenv("ENABLE_OCR", "false").lower() == "true"
+    OCR_LANGUAGE: str = os.getenv("OCR_LANGUAGE", "eng")
+    OCR_WORKERS: int = int(os.getenv("OCR_WORKERS", "2"))
+    OCR_PAGE_TIMEOUT_SECONDS: int = int(os.getenv("OCR_PAGE_TIMEOUT_SECONDS", "30"))
+    OCR_MAX_PAGES: int = int(os.getenv("OCR_MAX_PAGES", "50"))
+    
+    # PYQ Topic Index
+    PYQ_INDEX_PATH: str = os.getenv("PYQ_INDEX_PATH", ".cache/pyq_index.json")
+    # Minimum cosine similarity for a question to count toward a topic
+    TOPIC_MATCH_THRESHOLD: float = float(os.getenv("TOPIC_MATCH_THRESHOLD", "0.2"))
+    
+    # Context Compaction (token budgets for extracted text, ~4 chars/token)
+    CONTEXT_TOKEN_BUDGETS: dict = {
+        "exam_timetable": int(os.getenv("CONTEXT_TOKENS_EXAM_TIMETABLE", "3000")),
+        "syllabus": int(os.getenv("CONTEXT_TOKENS_SYLLABUS", "6000")),
+        "pyq": int(os.getenv("CONTEXT_TOKENS_PYQ", "8000")),
+        "assignment": int(os.getenv("CONTEXT_TOKENS_ASSIGNMENT", "3000")),
+        "unknown": int(os.getenv("CONTEXT_TOKENS_UNKNOWN", "4000")),
+    }
+    
+    # Per-Type Extraction Budgets: the first pages are classified, then
+    # extraction stops at the type's page budget or once its extracted text
+    # reaches the KB budget (both capped by MAX_PDF_PAGES)
+    PAGE_POLICY_ENABLED: bool = (
+        os.getenv("PAGE_POLICY_ENABLED", "true").lower() == "true"
+    )
+    PAGE_POLICY_SNIFF_PAGES: int = int(os.getenv("PAGE_POLICY_SNIFF_PAGES", "2"))
+    # Budgets apply only when the sniffed pages classify at least this
+    # confidently; otherwise the whole document is read
+    PAGE_POLICY_MIN_CONFIDENCE: float = float(
+        os.getenv("PAGE_POLICY_MIN_CONFIDENCE", "0.6")
+    )
+    PDF_PAGE_BUDGETS: dict = {
+        "exam_timetable": int(os.getenv("PDF_PAGES_EXAM_TIMETABLE", "5")),
+        "syllabus": int(os.getenv("PDF_PAGES_SYLLABUS", "40")),
+        "pyq": int(os.getenv("PDF_PAGES_PYQ", str(MAX_PDF_PAGES))),
+        "assignment": int(os.getenv("PDF_PAGES_ASSIGNMENT", "10")),
+        "unknown": int(os.getenv("PDF_PAGES_UNKNOWN", str(MAX_PDF_PAGES))),
+    }
+    PDF_TEXT_KB_BUDGETS: dict = {
+        "exam_timetable": int(os.getenv("PDF_TEXT_KB_EXAM_TIMETABLE", "64")),
+        "syllabus": int(os.getenv("PDF_TEXT_KB_SYLLABUS", "512")),
+        "pyq": int(os.getenv("PDF_TEXT_KB_PYQ", "4096")),
+        "assignment": int(os.getenv("PDF_TEXT_KB_ASSIGNMENT", "128")),
+        "unknown": int(os.getenv("PDF_TEXT_KB_UNKNOWN", "4096")),
+    }
+    
+    # Model Response Cache (final replies to identical requests, per day)
+    RESPONSE_CACHE_ENABLED: bool = (
+        os.getenv("RESPONSE_CACHE_ENABLED", "true").lower() == "true"
+    )
+    RESPONSE_CACHE_BACKEND: str = os.getenv("RESPONSE_CACHE_BACKEND", "memory")
+    RESPONSE_CACHE_PATH: str = os.getenv(
+        "RESPONSE_CACHE_PATH", ".cache/responses.sqlite3"
+    )
+    RESPONSE_CACHE_TTL_SECONDS: int = int(
+        os.getenv("RESPONSE_CACHE_TTL_SECONDS", "21600")
+    )
+    RESPONSE_CACHE_MAX_ENTRIES: int = int(
+        os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "1000")
+    )
+    
+    # Session Document Store
+    DOCUMENT_STORE_MAX_DOCS: int = int(os.getenv("DOCUMENT_STORE_MAX_DOCS", "64"))
+    DOCUMENT_PREVIEW_TOKENS: int = int(os.getenv("DOCUMENT_PREVIEW_TOKENS", "250"))
+    
+    # Study Planning
+    DEFAULT_STUDY_HOURS: float = float(os.getenv("DEFAULT_STUDY_HOURS", "6"))
+    STUDY_SLOT_MINUTES: int = int(os.getenv("STUDY_SLOT_MINUTES", "30"))
+    PLAN_STORE_MAX_PLANS: int = int(os.getenv("PLAN_STORE_MAX_PLANS", "256"))
+    # IANA timezone that plan times and "today" are in, e.g. Asia/Kolkata
+    STUDENT_TIMEZONE: str = os.getenv("STUDENT_TIMEZONE", "UTC")
+    
+    # Calendar Export (ICS files plus the state each delta is computed from)
+    CALENDAR_EXPORT_DIR: str = os.getenv("CALENDAR_EXPORT_DIR", "calendar_exports")
+    
+    # Cohort Planning (tools/cohort.py); 0 workers means one per CPU
+    COHORT_WORKERS: int = int(os.getenv("COHORT_WORKERS", "0"))
+    COHORT_BATCH_SIZE: int = int(os.getenv("COHORT_BATCH_SIZE", "25"))
+    COHORT_TOPIC_HOURS: float = float(os.getenv("COHORT_TOPIC_HOURS", "2"))
+    
+    # HTTP Server (server.py); limits are per worker process
+    SERVER_HOST: str = os.getenv("SERVER_HOST", "0.0.0.0")
+    SERVER_PORT: int = int(os.getenv("SERVER_PORT", "8080"))
+    SERVER_WORKERS: int = int(os.getenv("SERVER_WORKERS", "1"))
+    SERVER_MAX_CONCURRENCY: int = int(os.getenv("SERVER_MAX_CONCURRENCY", "16"))
+    SERVER_MAX_QUEUE: int = int(os.getenv("SERVER_MAX_QUEUE", "32"))
+    SERVER_QUEUE_TIMEOUT_SECONDS: float = float(
+        os.getenv("SERVER_QUEUE_TIMEOUT_SECONDS", "30")
+    )
+    SERVER_DRAIN_TIMEOUT_SECONDS: int = int(
+        os.getenv("SERVER_DRAIN_TIMEOUT_SECONDS", "30")
+    )
+    # Shared session database (SQLAlchemy URL); required for sessions to
+    # survive across workers, in-memory per worker when unset
+    SESSION_DB_URL: Optional[str] = os.getenv("SESSION_DB_URL") or None
+    
+    # Telemetry (tool/model timings, /metrics on the HTTP server)
+    TELEMETRY_ENABLED: bool = os.getenv("TELEMETRY_ENABLED", "false").lower() == "true"
+    
     # Logging Configuration
     LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
     LOG_FORMAT: str = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+    # One JSON object per line (with telemetry fields) instead of plain text
+    LOG_JSON: bool = os.getenv("LOG_JSON", "false").lower() == "true"
     
     # Security Settings
     ALLOWED_FILE_EXTENSIONS: tuple = (".pdf",)
@@ -53,16 +199,104 @@ class Config:
         if cls.MAX_PDF_SIZE_MB <= 0 or cls.MAX_PDF_SIZE_MB > 100:
             raise ValueError("MAX_PDF_SIZE_MB must be between 1 and 100")
         
+        if cls.PDF_EXTRACT_WORKERS < 1:
+            raise ValueError("PDF_EXTRACT_WORKERS must be at least 1")
+        
+        if cls.PDF_BATCH_WORKERS < 1:
+            raise ValueError("PDF_BATCH_WORKERS must be at least 1")
+        
+        if cls.ASYNC_TOOL_CONCURRENCY < 1:
+            raise ValueError("ASYNC_TOOL_CONCURRENCY must be at least 1")
+        
+        if cls.OCR_WORKERS < 1:
+            raise ValueError("OCR_WORKERS must be at least 1")
+        
+        if cls.OCR_PAGE_TIMEOUT_SECONDS < 1:
+            raise ValueError("OCR_PAGE_TIMEOUT_SECONDS must be at least 1")
+        
+        if cls.OCR_MAX_PAGES < 1:
+            raise ValueError("OCR_MAX_PAGES must be at least 1")
+        
+        if cls.STUDY_SLOT_MINUTES <= 0 or 120 % cls.STUDY_SLOT_MINUTES:
+            raise ValueError("STUDY_SLOT_MINUTES must evenly divide 120")
+        
+        if cls.PLAN_STORE_MAX_PLANS < 1:
+            raise ValueError("PLAN_STORE_MAX_PLANS must be at least 1")
+        
+        try:
+            ZoneInfo(cls.STUDENT_TIMEZONE)
+        except (ZoneInfoNotFoundError, ValueError):
+            raise ValueError(f"Unknown STUDENT_TIMEZONE: {cls.STUDENT_TIMEZONE}")
+        
+        if cls.COHORT_WORKERS < 0:
+            raise ValueError("COHORT_WORKERS must be 0 (one per CPU) or more")
+        
+        if cls.COHORT_BATCH_SIZE < 1:
+            raise ValueError("COHORT_BATCH_SIZE must be at least 1")
+        
+        if cls.COHORT_TOPIC_HOURS <= 0:
+            raise ValueError("COHORT_TOPIC_HOURS must be positive")
+        
+        if not 0 < cls.TOPIC_MATCH_THRESHOLD <= 1:
+            raise ValueError("TOPIC_MATCH_THRESHOLD must be between 0 and 1")
+        
+        if min(cls.CONTEXT_TOKEN_BUDGETS.values()) <= 0:
+            raise ValueError("CONTEXT_TOKENS_* budgets must be positive")
+        
+        if cls.PAGE_POLICY_SNIFF_PAGES < 1:
+            raise ValueError("PAGE_POLICY_SNIFF_PAGES must be at least 1")
+        
+        if not 0 <= cls.PAGE_POLICY_MIN_CONFIDENCE <= 1:
+            raise ValueError("PAGE_POLICY_MIN_CONFIDENCE must be between 0 and 1")
+        
+        if min(cls.PDF_PAGE_BUDGETS.values()) <= 0:
+            raise ValueError("PDF_PAGES_* budgets must be positive")
+        
+        if min(cls.PDF_TEXT_KB_BUDGETS.values()) <= 0:
+            raise ValueError("PDF_TEXT_KB_* budgets must be positive")
+        
+        if cls.DOCUMENT_STORE_MAX_DOCS < 1:
+            raise ValueError("DOCUMENT_STORE_MAX_DOCS must be at least 1")
+        
+        if cls.RESPONSE_CACHE_BACKEND not in ("memory", "sqlite"):
+            raise ValueError("RESPONSE_CACHE_BACKEND must be 'memory' or 'sqlite'")
+        
+        if cls.RESPONSE_CACHE_TTL_SECONDS <= 0 or cls.RESPONSE_CACHE_MAX_ENTRIES < 1:
+            raise ValueError(
+                "RESPONSE_CACHE_TTL_SECONDS and RESPONSE_CACHE_MAX_ENTRIES "
+                "must be positive"
+            )
+        
+        if cls.SERVER_WORKERS < 1 or cls.SERVER_MAX_CONCURRENCY < 1:
+            raise ValueError(
+                "SERVER_WORKERS and SERVER_MAX_CONCURRENCY must be at least 1"
+            )
+        
+        if cls.SERVER_MAX_QUEUE < 0:
+            raise ValueError("SERVER_MAX_QUEUE must not be negative")
+        
+        if cls.SERVER_QUEUE_TIMEOUT_SECONDS <= 0:
+            raise ValueError("SERVER_QUEUE_TIMEOUT_SECONDS must be positive")
+        
+        if cls.SERVER_DRAIN_TIMEOUT_SECONDS < 0:
+            raise ValueError("SERVER_DRAIN_TIMEOUT_SECONDS must not be negative")
+        
+        if cls.PDF_CACHE_MAX_MB <= 0:
+            raise ValueError("PDF_CACHE_MAX_MB must be positive")
+        
         return True
     
     @classmethod
     def setup_logging(cls) -> None:
         """Configure application logging."""
+        handler = logging.StreamHandler()
+        if cls.LOG_JSON:
+            handler.setFormatter(JsonLogFormatter())
         logging.basicConfig(
             level=getattr(logging, cls.LOG_LEVEL.upper(), logging.INFO),
             format=cls.LOG_FORMAT,
             handlers=[
-                logging.StreamHandler(),
+                handler,
             ]
         )
         
@@ -86,7 +320,3 @@ class Config:
     def get_project_root(cls) -> Path:
         """Get the project root directory."""
         return Path(__file__).parent.absolute()
-
-
-# Initialize logging on module import
-Config.setup_logging()
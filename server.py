@@ -0,0 +1,332 @@
+"""
+HTTP server for Taskify Agent.
+
+Serves ``root_agent`` over HTTP with uvicorn worker processes. Each worker
+runs at most SERVER_MAX_CONCURRENCY agent turns at once and queues up to
+SERVER_MAX_QUEUE more; beyond that, or when a queued request waits longer
+than SERVER_QUEUE_TIMEOUT_SECONDS, requests are rejected with 429 so load
+spills to other replicas instead of piling up. On SIGTERM a worker stops
+accepting work (503 on /readyz and new requests) and lets in-flight turns
+finish for up to SERVER_DRAIN_TIMEOUT_SECONDS.
+
+Usage:
+    python server.py
+"""
+
+import asyncio
+import logging
+import signal
+import threading
+import uuid
+from contextlib import asynccontextmanager
+from types import FrameType
+from typing import Any, AsyncIterator, Callable, Optional, Tuple
+
+import uvicorn
+from fastapi import FastAPI, HTTPException
+from fastapi.responses import PlainTextResponse
+from google.adk.runners import Runner
+from google.adk.sessions import DatabaseSessionService, InMemorySessionService
+from google.genai import types
+from pydantic import BaseModel, Field
+
+from agent import root_agent
+from config import Config
+from tools import telemetry
+from tools.async_pdf_tools import get_async_tool_stats
+from tools.response_cache import get_response_cache_stats
+
+logger = logging.getLogger(__name__)
+
+APP_NAME = "taskify_agent"
+
+# Seconds clients are told to wait before retrying a rejected request
+_RETRY_AFTER_SECONDS = 5
+
+
+class AdmissionControl:
+    """
+    Per-worker concurrency limit with a bounded wait queue.
+    
+    Requests beyond the running limit wait for a slot; once the queue is
+    full, or while the worker drains for shutdown, they are rejected
+    immediately rather than holding a connection open.
+    """
+    
+    def __init__(self, max_concurrency: int, max_queue: int, queue_timeout: float):
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self._slots = asyncio.Semaphore(max_concurrency)
+        self.admitted = 0
+        self.running = 0
+        self.rejected = 0
+        self.draining = False
+    
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        """
+        Hold a concurrency slot for the duration of the block.
+        
+        Raises:
+            HTTPException: 503 while draining; 429 when the queue is full or
+                the wait for a slot times out
+        """
+        if self.draining:
+            raise HTTPException(
+                status_code=503,
+                detail="Server is shutting down; retry on another instance",
+                headers={"Retry-After": str(_RETRY_AFTER_SECONDS)},
+            )
+        if self.admitted >= self.max_concurrency + self.max_queue:
+            self.rejected += 1
+            raise _too_busy("request queue is full")
+        
+        self.admitted += 1
+        try:
+            try:
+                await asyncio.wait_for(self._slots.acquire(), self.queue_timeout)
+            except asyncio.TimeoutError:
+                self.rejected += 1
+                raise _too_busy("timed out waiting for a free slot")
+            self.running += 1
+            try:
+                yield
+            finally:
+                self.running -= 1
+                self._slots.release()
+        finally:
+            self.admitted -= 1
+    
+    def stats(self) -> dict:
+        return {
+            "running": self.running,
+            "queued": self.admitted - self.running,
+            "max_concurrency": self.max_concurrency,
+            "max_queue": self.max_queue,
+            "rejected": self.rejected,
+            "draining": self.draining,
+        }
+
+
+def _too_busy(reason: str) -> HTTPException:
+    return HTTPException(
+        status_code=429,
+        detail=f"Server busy ({reason}); retry shortly",
+        headers={"Retry-After": str(_RETRY_AFTER_SECONDS)},
+    )
+
+
+class RunRequest(BaseModel):
+    user_id: str = Field(..., min_length=1)
+    message: str = Field(..., min_length=1)
+    session_id: Optional[str] = None
+
+
+class RunResponse(BaseModel):
+    session_id: str
+    response: str
+
+
+_admission: Optional[AdmissionControl] = None
+_runner: Optional[Runner] = None
+
+SignalHandler = Callable[[int, Optional[FrameType]], Any]
+
+
+def _worker() -> Tuple[AdmissionControl, Runner]:
+    """Return this worker's admission control and runner, set by lifespan."""
+    if _admission is None or _runner is None:
+        raise RuntimeError("Worker used before application startup")
+    return _admission, _runner
+
+
+def _drain_on_exit_signals(admission: AdmissionControl) -> None:
+    """
+    Mark the worker as draining when uvicorn is told to shut down.
+    
+    uvicorn installs its own SIGINT/SIGTERM handlers before application
+    startup; chaining onto them lets the worker reject new work while
+    uvicorn finishes in-flight requests.
+    """
+    if threading.current_thread() is not threading.main_thread():
+        # Embedded or test runs own no signals; only uvicorn's main thread does
+        return
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        previous = signal.getsignal(sig)
+        if not callable(previous):
+            continue
+        
+        def handler(
+            signum: int,
+            frame: Optional[FrameType],
+            previous: SignalHandler = previous,
+        ) -> None:
+            if not admission.draining:
+                admission.draining = True
+                logger.info(
+                    f"Draining: {admission.running} running, "
+                    f"{admission.admitted - admission.running} queued"
+                )
+            previous(signum, frame)
+        
+        signal.signal(sig, handler)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """Create this worker's runner and admission control."""
+    global _admission, _runner
+    
+    if Config.SESSION_DB_URL:
+        session_service = DatabaseSessionService(db_url=Config.SESSION_DB_URL)
+    else:
+        session_service = InMemorySessionService()
+    _runner = Runner(
+        app_name=APP_NAME, agent=root_agent, session_service=session_service
+    )
+    _admission = AdmissionControl(
+        Config.SERVER_MAX_CONCURRENCY,
+        Config.SERVER_MAX_QUEUE,
+        Config.SERVER_QUEUE_TIMEOUT_SECONDS,
+    )
+    _drain_on_exit_signals(_admission)
+    logger.info(
+        f"Worker ready: {Config.SERVER_MAX_CONCURRENCY} concurrent turns, "
+        f"queue {Config.SERVER_MAX_QUEUE}"
+    )
+    yield
+    logger.info(f"Worker stopped: {_admission.stats()}")
+
+
+app = FastAPI(title="Taskify Agent", lifespan=lifespan)
+
+
+@app.get("/healthz")
+async def healthz() -> dict:
+    """Liveness: the worker process is up."""
+    return {"status": "ok"}
+
+
+@app.get("/readyz")
+async def readyz() -> dict:
+    """Readiness: 503 once the worker starts draining for shutdown."""
+    admission, _ = _worker()
+    if admission.draining:
+        raise HTTPException(status_code=503, detail="draining")
+    return {"status": "ready", **admission.stats()}
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics() -> PlainTextResponse:
+    """
+    Prometheus metrics for this worker.
+    
+    Tool and model histograms are collected when TELEMETRY_ENABLED is set;
+    admission, tool executor and response cache metrics are always present.
+    Each worker keeps its own counters, so scrape every worker.
+    """
+    admission = _worker()[0].stats()
+    executor = get_async_tool_stats()
+    gauges = [
+        ("taskify_server_running_requests", "Agent turns running.",
+         admission["running"]),
+        ("taskify_server_queued_requests", "Agent turns waiting for a slot.",
+         admission["queued"]),
+        ("taskify_server_draining", "1 while draining for shutdown.",
+         int(admission["draining"])),
+        ("taskify_tool_executor_queue_depth", "Blocking tool calls queued.",
+         executor["queue_depth"]),
+        ("taskify_tool_executor_running", "Blocking tool calls running.",
+         executor["running"]),
+    ]
+    counters = [
+        ("taskify_server_rejected_requests_total", "Requests rejected with 429.",
+         admission["rejected"]),
+        ("taskify_tool_executor_completed_total", "Blocking tool calls finished.",
+         executor["completed"]),
+        ("taskify_tool_executor_failed_total", "Blocking tool calls that raised.",
+         executor["failed"]),
+    ]
+    cache = get_response_cache_stats()
+    if cache["enabled"]:
+        gauges.append(
+            ("taskify_response_cache_entries", "Cached replies.", cache["entries"])
+        )
+        counters += [
+            ("taskify_response_cache_hits_total", "Model calls answered from cache.",
+             cache["hits"]),
+            ("taskify_response_cache_misses_total", "Model calls not in cache.",
+             cache["misses"]),
+        ]
+    return PlainTextResponse(
+        telemetry.render_metrics(gauges, counters),
+        media_type="text/plain; version=0.0.4; charset=utf-8",
+    )
+
+
+@app.post("/run", response_model=RunResponse)
+async def run(request: RunRequest) -> RunResponse:
+    """
+    Send one user message to the agent and return its final reply.
+    
+    A new session is created when ``session_id`` is omitted; pass the
+    returned ID on later turns to continue the conversation.
+    """
+    admission, runner = _worker()
+    async with admission.slot():
+        sessions = runner.session_service
+        if request.session_id is None:
+            session = sessions.create_session(
+                app_name=APP_NAME,
+                user_id=request.user_id,
+                session_id=uuid.uuid4().hex,
+            )
+        else:
+            session = sessions.get_session(
+                app_name=APP_NAME,
+                user_id=request.user_id,
+                session_id=request.session_id,
+            )
+            if session is None:
+                raise HTTPException(
+                    status_code=404, detail=f"Unknown session: {request.session_id}"
+                )
+        
+        message = types.Content(role="user", parts=[types.Part(text=request.message)])
+        reply = ""
+        async for event in runner.run_async(
+            user_id=request.user_id, session_id=session.id, new_message=message
+        ):
+            if event.is_final_response() and event.content and event.content.parts:
+                reply = "".join(part.text or "" for part in event.content.parts)
+        
+        return RunResponse(session_id=session.id, response=reply)
+
+
+def main() -> None:
+    Config.setup_logging()
+    Config.validate()
+    
+    if Config.SERVER_WORKERS > 1 and not Config.SESSION_DB_URL:
+        logger.warning(
+            "SERVER_WORKERS > 1 without SESSION_DB_URL: sessions live in one "
+            "worker's memory, so clients need sticky routing"
+        )
+    
+    logger.info(
+        f"Serving on {Config.SERVER_HOST}:{Config.SERVER_PORT} with "
+        f"{Config.SERVER_WORKERS} worker(s)"
+    )
+    uvicorn.run(
+        "server:app",
+        host=Config.SERVER_HOST,
+        port=Config.SERVER_PORT,
+        workers=Config.SERVER_WORKERS,
+        timeout_graceful_shutdown=Config.SERVER_DRAIN_TIMEOUT_SECONDS,
+        log_config=None,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,34 @@
+"""
+Shared fixtures for the Taskify Agent tests.
+
+Tests run offline: PDFs are generated on the fly, and the extraction cache
+and telemetry are off unless a test turns them on.
+"""
+
+from pathlib import Path
+from typing import Callable, List
+
+import pytest
+
+from benchmarks.synthetic_pdf import build_pdf
+from config import Config
+
+
+@pytest.fixture(autouse=True)
+def _isolated_config(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(Config, "PDF_CACHE_ENABLED", False)
+    monkeypatch.setattr(Config, "TELEMETRY_ENABLED", False)
+    monkeypatch.setattr(Config, "ENABLE_OCR", False)
+    monkeypatch.setattr(Config, "PDF_EXTRACT_WORKERS", 1)
+
+
+@pytest.fixture
+def make_pdf(tmp_path: Path) -> Callable[..., str]:
+    """Write a text PDF with one page per entry and return its path."""
+    
+    def make(pages: List[str], name: str = "document.pdf") -> str:
+        path = tmp_path / name
+        path.write_bytes(build_pdf(pages))
+        return str(path)
+    
+    return make
@@ -0,0 +1,20 @@
+"""Tests for batch PDF classification."""
+
+from tools.pdf_tools import extract_and_classify_pdfs
+
+
+def test_batch_returns_reports_without_text(make_pdf, tmp_path):
+    timetable = make_pdf(
+        ["Exam Timetable\nSchedule of examinations\n12/11/2026 Mathematics"],
+        name="timetable.pdf",
+    )
+    missing = str(tmp_path / "missing.pdf")
+    
+    ok, failed = extract_and_classify_pdfs([timetable, missing])
+    
+    assert "text" not in ok
+    assert ok["file_name"] == "timetable.pdf"
+    assert ok["type"] == "exam_timetable"
+    assert ok["tokens"] > 0
+    assert ok["page_count"] == ok["pages_extracted"] == 1
+    assert set(failed) == {"file_path", "error"}
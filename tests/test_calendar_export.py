@@ -0,0 +1,56 @@
+"""Tests for the ICS calendar export."""
+
+import io
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from config import Config
+from tools.calendar_export import export_plan_calendar, write_plan_calendar
+from tools.scheduler import generate_study_plan
+
+
+def _session(start: str, minutes: int = 60) -> dict:
+    return {
+        "start": start,
+        "minutes": minutes,
+        "kind": "study",
+        "subject": "Mathematics",
+        "topic": "Calculus",
+    }
+
+
+def _write(days: list) -> str:
+    full, delta = io.StringIO(), io.StringIO()
+    write_plan_calendar(days, "test", {}, full, delta, "UTC")
+    return full.getvalue()
+
+
+def test_session_past_midnight_rolls_over_to_next_day():
+    calendar = _write([{"date": "2026-11-01", "sessions": [_session("24:10")]}])
+    
+    assert "DTSTART:20261102T001000Z" in calendar
+
+
+def test_invalid_session_time_is_a_clean_error():
+    with pytest.raises(ValueError, match="invalid start time"):
+        _write([{"date": "2026-11-01", "sessions": [_session("9am")]}])
+
+
+def test_concurrent_exports_of_one_calendar(tmp_path, monkeypatch):
+    monkeypatch.setattr(Config, "CALENDAR_EXPORT_DIR", str(tmp_path))
+    plan = generate_study_plan(
+        [{"subject": "Mathematics", "date": "2026-11-20"}],
+        [{"subject": "Mathematics", "topic": "Calculus", "hours": 10}],
+        start_date="2026-11-01",
+    )
+    
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(
+            lambda _: export_plan_calendar(plan["plan_id"], "shared"), range(16)
+        ))
+    
+    assert all(result["events"] == results[0]["events"] for result in results)
+    assert sorted(p.name for p in tmp_path.iterdir()) == [
+        "shared.delta.ics", "shared.ics", "shared.state.json"
+    ]
@@ -0,0 +1,32 @@
+"""Tests for the streaming, early-stopping PDF classifier."""
+
+from tools.pdf_tools import classify_pdf
+
+TIMETABLE = "Exam Timetable\nSchedule of examinations\nDate Time Subject"
+
+
+def test_stops_early_when_confident_before_the_last_page(make_pdf):
+    path = make_pdf([TIMETABLE, "Room allocation", "Invigilators"])
+    
+    result = classify_pdf(path)
+    
+    assert result["type"] == "exam_timetable"
+    assert result["pages_read"] == 1
+    assert result["stopped_early"] is True
+
+
+def test_confident_on_the_last_page_is_not_stopped_early(make_pdf):
+    path = make_pdf(["Notice", "", TIMETABLE])
+    
+    result = classify_pdf(path)
+    
+    assert result["type"] == "exam_timetable"
+    assert result["pages_read"] == 3
+    assert result["stopped_early"] is False
+
+
+def test_single_page_document_is_not_stopped_early(make_pdf):
+    result = classify_pdf(make_pdf([TIMETABLE]))
+    
+    assert result["pages_read"] == 1
+    assert result["stopped_early"] is False
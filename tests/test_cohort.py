@@ -0,0 +1,52 @@
+"""Tests for cohort planning from one shared analysis."""
+
+from pathlib import Path
+
+import pytest
+
+from config import Config
+from tools import pyq_index
+from tools.cohort import analyze_cohort, plan_cohort
+
+EXAMS = [{"subject": "Mathematics", "date": "2026-11-20"}]
+
+
+def test_bad_student_is_reported_without_stopping_the_run():
+    analysis = analyze_cohort(
+        [{"subject": "Mathematics", "topics": ["Calculus"]}], exams=EXAMS
+    )
+    students = [
+        {"student_id": "s1"},
+        {"student_id": "s2", "availability": "x"},
+        {"student_id": "s3", "progress": ["Calculus"]},
+        {"student_id": "s4", "availability": {"hours_per_day": 3}},
+    ]
+    
+    plans = list(plan_cohort(analysis, students, "2026-11-01", workers=1))
+    
+    assert [plan["student_id"] for plan in plans] == ["s1", "s2", "s3", "s4"]
+    assert "availability" in plans[1]["error"]
+    assert "progress" in plans[2]["error"]
+    assert "error" not in plans[0] and "error" not in plans[3]
+
+
+def test_cohort_papers_stay_out_of_the_shared_index(
+    make_pdf, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+):
+    shared = tmp_path / "shared" / "pyq_index.json"
+    monkeypatch.setattr(Config, "PYQ_INDEX_PATH", str(shared))
+    monkeypatch.setattr(pyq_index, "_index", None)
+    paper = make_pdf(
+        ["Mathematics Examination 2024\nQ1. Explain calculus limits. (10 marks)"],
+        name="maths_2024.pdf",
+    )
+    
+    analysis = analyze_cohort(
+        [{"subject": "Mathematics", "topics": ["Calculus", "Algebra"],
+          "pyq_files": [paper]}],
+        exams=EXAMS,
+    )
+    
+    weights = {t["topic"]: t["weight"] for t in analysis["topics"]}
+    assert weights["Calculus"] > weights["Algebra"]
+    assert not shared.exists()
@@ -0,0 +1,68 @@
+"""Tests for context compaction of extracted documents."""
+
+from config import Config
+from tools.compaction import compact_pages, extract_compact_text
+
+QUESTION = "Q1. Derive the Fourier series of a square wave. (10 marks)"
+
+
+def test_pyq_questions_repeated_across_years_are_kept():
+    pages = [f"Question Paper {year}\n{QUESTION}" for year in (2022, 2023, 2024)]
+    
+    result = compact_pages(pages, "pyq")
+    
+    assert result["text"].count(QUESTION) == 3
+
+
+def test_long_repeated_lines_are_deduplicated_outside_pyqs():
+    pages = [f"Unit {n}\n{QUESTION}\nTopic {n}" for n in (1, 2, 3)]
+    
+    result = compact_pages(pages, "syllabus")
+    
+    assert result["text"].count(QUESTION) == 1
+
+
+def test_bare_numbers_at_page_edges_are_content():
+    pages = ["Q1. Define entropy.\n10", "Q2. State Hess's law.\n5 marks\nTotal\n70"]
+    
+    text = compact_pages(pages, "pyq")["text"]
+    
+    assert "10" in text.splitlines()
+    assert "70" in text.splitlines()
+
+
+def test_page_numbers_on_every_page_are_removed():
+    pages = [f"Chapter {n} notes\nSome content {n}\n{n}" for n in (1, 2, 3)]
+    
+    lines = compact_pages(pages, "syllabus")["text"].splitlines()
+    
+    assert "2" not in lines
+    assert "Some content 2" in lines
+
+
+def test_explicit_page_labels_are_removed():
+    pages = [f"Page {n} of 3\nBody text {n}" for n in (1, 2, 3)]
+    
+    lines = compact_pages(pages)["text"].splitlines()
+    
+    assert lines == ["Body text 1", "Body text 2", "Body text 3"]
+
+
+def test_compact_tool_reports_page_budget(make_pdf):
+    pages = [
+        f"Exam Timetable - Schedule page {n}\nDate {n:02d}/11/2026 Time 10:00"
+        for n in range(1, 21)
+    ]
+    
+    result = extract_compact_text(make_pdf(pages))
+    
+    assert result["page_count"] == 20
+    assert result["pages_extracted"] == Config.PDF_PAGE_BUDGETS["exam_timetable"]
+    assert "extraction_note" in result
+
+
+def test_compact_tool_ignores_blank_pages(make_pdf):
+    result = extract_compact_text(make_pdf(["Unit 1 Syllabus", "", "Unit 2 Course"]))
+    
+    assert result["page_count"] == 3
+    assert result["text"].splitlines() == ["Unit 1 Syllabus", "Unit 2 Course"]
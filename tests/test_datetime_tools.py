@@ -0,0 +1,99 @@
+"""Tests for date parsing and the dd/mm vs mm/dd slash-date order."""
+
+from datetime import datetime
+
+import pytest
+
+from tools.datetime_tools import (
+    DAY_FIRST,
+    MONTH_FIRST,
+    DateParser,
+    _parse_date_cached,
+    infer_slash_order,
+    parse_date,
+    parse_dates,
+)
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("2026-01-15", datetime(2026, 1, 15)),
+        ("2026-01-15 09:30:00", datetime(2026, 1, 15, 9, 30)),
+        ("15/01/2026", datetime(2026, 1, 15)),
+        ("15-01-2026", datetime(2026, 1, 15)),
+        ("Jan 15, 2026", datetime(2026, 1, 15)),
+        ("january 15, 2026", datetime(2026, 1, 15)),
+    ],
+)
+def test_supported_formats(text, expected):
+    assert parse_date(text) == expected
+
+
+def test_ambiguous_slash_date_defaults_to_day_first():
+    assert parse_date("03/04/2026") == datetime(2026, 4, 3)
+
+
+def test_unambiguous_month_first_date_parses():
+    assert parse_date("12/25/2026") == datetime(2026, 12, 25)
+
+
+@pytest.mark.parametrize(
+    "text",
+    ["31/02/2026", "13/13/2026", "2026-02-30", "2026-01-15 24:00:00",
+     "Foo 15, 2026", "next Tuesday", ""],
+)
+def test_invalid_dates_return_none(text):
+    assert parse_date(text) is None
+
+
+def test_parser_switches_order_after_unambiguous_date():
+    parser = DateParser()
+    
+    assert parser.parse("03/04/2026") == datetime(2026, 4, 3)
+    assert parser.parse("12/25/2026") == datetime(2026, 12, 25)
+    assert parser.slash_order == MONTH_FIRST
+    assert parser.parse("03/04/2026") == datetime(2026, 3, 4)
+
+
+def test_batch_infers_order_from_unambiguous_dates():
+    dates = ["03/04/2026", "12/25/2026", "01/02/2026"]
+    
+    assert infer_slash_order(dates) == MONTH_FIRST
+    assert parse_dates(dates) == [
+        datetime(2026, 3, 4),
+        datetime(2026, 12, 25),
+        datetime(2026, 1, 2),
+    ]
+
+
+def test_batch_without_evidence_is_day_first():
+    assert infer_slash_order(["03/04/2026", "2026-05-01"]) == DAY_FIRST
+    assert parse_dates(["03/04/2026", "bad"]) == [datetime(2026, 4, 3), None]
+
+
+def test_repeat_calls_are_memoized():
+    _parse_date_cached.cache_clear()
+    
+    first = parse_date("05/06/2026")
+    second = parse_date("05/06/2026")
+    
+    assert first == second == datetime(2026, 6, 5)
+    info = _parse_date_cached.cache_info()
+    assert (info.hits, info.misses) == (1, 1)
+
+
+def test_parser_memo_is_keyed_by_order():
+    parser = DateParser(slash_order=MONTH_FIRST)
+    
+    assert parser.parse("05/06/2026") == datetime(2026, 5, 6)
+    parser.slash_order = DAY_FIRST
+    assert parser.parse("05/06/2026") == datetime(2026, 6, 5)
+    assert len(parser._memo) == 2
+
+
+@pytest.mark.parametrize(
+    "text", ["12 Jan. 2025", "12 Jan 2025", "12 january 2025", "Jan. 12, 2025"]
+)
+def test_month_names_with_optional_period(text):
+    assert parse_date(text) == datetime(2025, 1, 12)
@@ -0,0 +1,15 @@
+"""Tests for the session document store."""
+
+from tools.document_store import DocumentStore
+
+
+def test_blank_pages_keep_page_numbers(make_pdf):
+    path = make_pdf(
+        ["UNIT 1 INTRODUCTION", "", "UNIT 2 CALCULUS", "", "UNIT 3 ALGEBRA"]
+    )
+    
+    _, document = DocumentStore(max_documents=4).load(path)
+    
+    assert len(document.pages) == 5
+    assert document.pages[1] == ""
+    assert [page for _, page, _ in document.sections] == [0, 2, 4]
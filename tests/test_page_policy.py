@@ -0,0 +1,67 @@
+"""Tests for the per-document-type extraction budgets."""
+
+from config import Config
+from tools.pdf_tools import extract_and_classify_pdfs, extract_pdf_text
+
+YEARS = (2020, 2021, 2022, 2023, 2024)
+
+
+def _pyq_bundle() -> list:
+    """A 30-page, 5-year PYQ bundle whose cover reads like a timetable."""
+    pages = []
+    for year in YEARS:
+        pages.append(
+            f"Examination {year}\nDate: 12/05/{year}\nTime: 10:00 - 13:00\n"
+            f"Max Marks: 70"
+        )
+        pages.extend(
+            f"Q{n}. Explain topic {n} of the {year} paper. (7 marks)"
+            for n in range(1, 6)
+        )
+    return pages
+
+
+def _timetable(page_count: int) -> list:
+    return [
+        f"Exam Timetable - Schedule page {n}\n"
+        f"Date {n:02d}/11/2026 Time 10:00 Mathematics"
+        for n in range(1, page_count + 1)
+    ]
+
+
+def test_unconfident_sniff_reads_whole_bundle(make_pdf):
+    path = make_pdf(_pyq_bundle())
+    
+    text = extract_pdf_text(path)
+    
+    for year in YEARS:
+        assert f"the {year} paper" in text
+
+
+def test_unconfident_sniff_reports_no_truncation(make_pdf):
+    [result] = extract_and_classify_pdfs([make_pdf(_pyq_bundle())])
+    
+    assert result["page_count"] == 30
+    assert result["pages_extracted"] == 30
+    assert "extraction_note" not in result
+
+
+def test_confident_timetable_stops_at_budget_and_says_so(make_pdf):
+    path = make_pdf(_timetable(20))
+    
+    [result] = extract_and_classify_pdfs([path])
+    
+    budget = Config.PDF_PAGE_BUDGETS["exam_timetable"]
+    assert result["pages_extracted"] == budget
+    assert result["page_count"] == 20
+    assert "extraction_note" in result
+    assert f"page {budget + 1}\n" not in extract_pdf_text(path)
+
+
+def test_policy_disabled_reads_everything(make_pdf, monkeypatch):
+    monkeypatch.setattr(Config, "PAGE_POLICY_ENABLED", False)
+    
+    [result] = extract_and_classify_pdfs([make_pdf(_timetable(20))])
+    
+    assert result["pages_extracted"] == 20
+    assert "extraction_note" not in result
@@ -0,0 +1,42 @@
+"""Tests for the PYQ index file shared between processes."""
+
+from pathlib import Path
+
+import pytest
+
+from tools import pyq_index
+from tools.pyq_index import PyqIndex
+
+
+def _paper(year: int) -> str:
+    return (
+        f"Mathematics Examination {year}\n"
+        f"Q1. Explain the Fourier transform. (10 marks)\n"
+        f"Q2. Derive the Laplace transform of sin t. [5]"
+    )
+
+
+def test_writers_merge_instead_of_overwriting(tmp_path: Path):
+    path = tmp_path / "pyq_index.json"
+    first = PyqIndex(path)
+    second = PyqIndex(path)
+    
+    first.add_paper("Mathematics", 2023, _paper(2023))
+    second.add_paper("Mathematics", 2024, _paper(2024))
+    
+    assert PyqIndex(path).years("Mathematics") == [2023, 2024]
+    assert first.years("Mathematics") == [2023, 2024]
+
+
+def test_failed_write_leaves_no_temp_file(tmp_path: Path, monkeypatch):
+    path = tmp_path / "pyq_index.json"
+    index = PyqIndex(path)
+    
+    def broken_dump(*args, **kwargs):
+        raise OSError("disk full")
+    
+    monkeypatch.setattr(pyq_index.json, "dump", broken_dump)
+    with pytest.raises(OSError):
+        index.add_paper("Mathematics", 2024, _paper(2024))
+    
+    assert list(tmp_path.glob("*.tmp")) == []
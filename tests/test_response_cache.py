@@ -0,0 +1,241 @@
+"""Tests for the model response cache, driven by a stub model."""
+
+import time
+from pathlib import Path
+from types import SimpleNamespace
+from typing import List, Optional, Union
+
+import pytest
+from pydantic import BaseModel
+
+from benchmarks.synthetic_pdf import build_pdf
+from config import Config
+from tools import response_cache
+from tools.document_store import STATE_KEY, open_document
+from tools.response_cache import MemoryBackend, ResponseCache, SQLiteBackend
+
+
+class FunctionResponse(BaseModel):
+    name: str
+    response: dict
+
+
+class Part(BaseModel):
+    text: Optional[str] = None
+    function_call: None = None
+    function_response: Optional[FunctionResponse] = None
+
+
+class Content(BaseModel):
+    """The shape of a google.genai Content, so the tests run without ADK."""
+    
+    role: str
+    parts: List[Part]
+
+
+class Reply(BaseModel):
+    """The fields of an ADK LlmResponse the cache reads."""
+    
+    content: Optional[Content] = None
+    partial: Optional[bool] = None
+    error_code: Optional[str] = None
+
+
+def _reply(text: str) -> Reply:
+    return Reply(content=Content(role="model", parts=[Part(text=text)]))
+
+
+class StubModel:
+    """Answers every request with a fixed reply and counts the calls."""
+    
+    def __init__(self, reply: str):
+        self.reply = reply
+        self.calls = 0
+    
+    def __call__(self, llm_request: SimpleNamespace) -> Reply:
+        self.calls += 1
+        return _reply(self.reply)
+
+
+@pytest.fixture
+def today(monkeypatch: pytest.MonkeyPatch) -> SimpleNamespace:
+    """Fresh in-memory cache whose date bucket the test controls."""
+    monkeypatch.setattr(Config, "RESPONSE_CACHE_ENABLED", True)
+    monkeypatch.setattr(
+        response_cache,
+        "_cache",
+        ResponseCache(MemoryBackend(100), 3600, Reply.model_validate_json),
+    )
+    clock = SimpleNamespace(date="2026-11-02")
+    monkeypatch.setattr(
+        response_cache, "get_current_datetime", lambda fmt=None: clock.date
+    )
+    return clock
+
+
+def _user(text: str) -> Content:
+    return Content(role="user", parts=[Part(text=text)])
+
+
+def _tool_result(name: str, response: dict) -> Content:
+    part = Part(
+        function_response=FunctionResponse(name=name, response=response)
+    )
+    return Content(role="user", parts=[part])
+
+
+def _turn(
+    model: StubModel,
+    contents: List[Content],
+    state: Optional[dict] = None,
+    invocation_id: str = "inv",
+) -> str:
+    """Run one model call through the cache callbacks and return the reply."""
+    context = SimpleNamespace(invocation_id=invocation_id, state=state or {})
+    request = SimpleNamespace(model="stub-model", contents=contents, config=None)
+    response = response_cache.before_model_callback(context, request)
+    if response is None:
+        response = model(request)
+        response_cache.after_model_callback(context, response)
+    assert response.content is not None and response.content.parts
+    return response.content.parts[0].text or ""
+
+
+def test_identical_same_day_request_is_a_hit(today):
+    model = StubModel("Revise calculus first.")
+    
+    first = _turn(model, [_user("What should I study first?")], invocation_id="a")
+    second = _turn(model, [_user("what should I   study first?")], invocation_id="b")
+    
+    assert first == second == "Revise calculus first."
+    assert model.calls == 1
+    assert response_cache.get_response_cache_stats()["hits"] == 1
+
+
+def test_date_change_is_a_miss(today):
+    model = StubModel("Revise calculus first.")
+    
+    _turn(model, [_user("What should I study first?")], invocation_id="a")
+    today.date = "2026-11-03"
+    _turn(model, [_user("What should I study first?")], invocation_id="b")
+    
+    assert model.calls == 2
+
+
+def test_changed_pdf_content_is_a_miss(today, tmp_path: Path):
+    model = StubModel("Your first exam is Mathematics.")
+    path = tmp_path / "timetable.pdf"
+    
+    def ask(invocation_id: str) -> None:
+        tool_context = SimpleNamespace(state={})
+        opened = open_document(str(path), tool_context)
+        contents = [
+            _user(f"When is my first exam? {path}"),
+            _tool_result("open_document", opened),
+        ]
+        _turn(model, contents, tool_context.state, invocation_id)
+    
+    path.write_bytes(build_pdf(["Exam Timetable\n12/11/2026 Mathematics"]))
+    ask("a")
+    ask("b")
+    assert model.calls == 1
+    
+    path.write_bytes(build_pdf(["Exam Timetable\n12/11/2026 Physics"]))
+    ask("c")
+    assert model.calls == 2
+
+
+def test_documents_are_keyed_by_content_not_upload_path(today, tmp_path: Path):
+    model = StubModel("Your first exam is Mathematics.")
+    pdf = build_pdf(["Exam Timetable\n12/11/2026 Mathematics"])
+    
+    for invocation_id, name in (("a", "mine.pdf"), ("b", "theirs.pdf")):
+        path = tmp_path / name
+        path.write_bytes(pdf)
+        tool_context = SimpleNamespace(state={})
+        open_document(str(path), tool_context)
+        handle = next(iter(tool_context.state[STATE_KEY].values()))
+        contents = [_user(f"When is my first exam? {handle['file_path']}")]
+        _turn(model, contents, tool_context.state, invocation_id)
+    
+    assert model.calls == 1
+
+
+def _plan_turn(model: StubModel, plan_id: str, invocation_id: str) -> str:
+    contents = [
+        _user("Make me a study plan"),
+        _tool_result("generate_study_plan", {"plan_id": plan_id, "days": []}),
+    ]
+    return _turn(model, contents, invocation_id=invocation_id)
+
+
+def test_reply_quoting_a_volatile_value_is_not_cached(today):
+    model = StubModel("Saved as plan plan_1111; export it any time.")
+    
+    _plan_turn(model, "plan_1111", "a")
+    model.reply = "Saved as plan plan_2222; export it any time."
+    second = _plan_turn(model, "plan_2222", "b")
+    
+    assert second == "Saved as plan plan_2222; export it any time."
+    assert model.calls == 2
+    assert response_cache.get_response_cache_stats()["stores"] == 0
+
+
+def test_volatile_values_do_not_split_the_cache(today):
+    model = StubModel("Your plan is ready; study two hours a day.")
+    
+    _plan_turn(model, "plan_1111", "a")
+    _plan_turn(model, "plan_2222", "b")
+    
+    assert model.calls == 1
+
+
+def _backend(kind: str, tmp_path: Path, max_entries: int) -> Union[
+    MemoryBackend, SQLiteBackend
+]:
+    if kind == "sqlite":
+        return SQLiteBackend(tmp_path / "responses.sqlite3", max_entries)
+    return MemoryBackend(max_entries)
+
+
+@pytest.mark.parametrize("kind", ["memory", "sqlite"])
+def test_least_recently_used_entry_is_evicted(kind, tmp_path: Path):
+    backend = _backend(kind, tmp_path, max_entries=2)
+    
+    expires_at = time.time() + 3600
+    backend.put("a", "A", expires_at)
+    backend.put("b", "B", expires_at)
+    backend.get("a", now=time.time() + 1)
+    evicted = backend.put("c", "C", expires_at)
+    
+    assert evicted == 1
+    assert backend.get("b", now=time.time()) == (None, False)
+    assert backend.get("a", now=time.time()) == ("A", False)
+    assert len(backend) == 2
+
+
+@pytest.mark.parametrize("kind", ["memory", "sqlite"])
+def test_expired_entry_is_a_miss(kind, tmp_path: Path):
+    backend = _backend(kind, tmp_path, max_entries=10)
+    
+    expires_at = time.time() + 60
+    backend.put("a", "A", expires_at)
+    
+    assert backend.get("a", now=expires_at - 1) == ("A", False)
+    assert backend.get("a", now=expires_at) == (None, True)
+    assert len(backend) == 0
+
+
+def test_partial_and_error_replies_are_not_stored():
+    cache = ResponseCache(MemoryBackend(10), 3600, Reply.model_validate_json)
+    partial = _reply("Revise")
+    partial.partial = True
+    
+    for invocation_id, reply in (
+        ("a", partial),
+        ("b", Reply(error_code="RESOURCE_EXHAUSTED")),
+    ):
+        assert cache.lookup(invocation_id, "key") is None
+        cache.store(invocation_id, reply)
+    
+    assert cache.stats()["stores"] == 0
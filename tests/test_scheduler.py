@@ -0,0 +1,80 @@
+"""Tests for the deterministic study plan scheduler."""
+
+from typing import List
+
+import pytest
+
+from tools.scheduler import generate_study_plan, get_plan_days, replan_study_plan
+
+EXAMS = [{"subject": "Mathematics", "date": "2026-11-20"}]
+TOPICS = [{"subject": "Mathematics", "topic": "Calculus", "hours": 20}]
+
+
+def _plan(start_time: str, hours: float) -> dict:
+    return generate_study_plan(
+        EXAMS,
+        TOPICS,
+        {"hours_per_day": hours, "start_time": start_time},
+        start_date="2026-11-01",
+    )
+
+
+def test_day_running_past_midnight_is_rejected():
+    with pytest.raises(ValueError, match="past midnight"):
+        _plan("20:00", 8)
+
+
+def test_late_start_that_fits_before_midnight():
+    plan = _plan("15:30", 8)
+    
+    ends = [s["end"] for day in plan["days"] for s in day["sessions"]]
+    assert max(ends) <= "24:00"
+    assert all(s["start"] < "24:00" for day in plan["days"] for s in day["sessions"])
+
+
+def test_adjacent_blocks_alternate_while_another_subject_is_open():
+    exams = [
+        {"subject": "Mathematics", "date": "2026-11-20"},
+        {"subject": "Physics", "date": "2026-11-25"},
+    ]
+    topics = [
+        {"subject": "Mathematics", "topic": f"Topic {n}", "hours": 6}
+        for n in range(1, 6)
+    ] + [{"subject": "Physics", "topic": "Mechanics", "hours": 20}]
+    
+    plan = generate_study_plan(
+        exams, topics, {"hours_per_day": 8}, start_date="2026-11-05"
+    )
+    
+    # Study block subjects in plan order, and where each day's blocks start
+    blocks: List[str] = []
+    day_starts = set()
+    for day in plan["days"]:
+        day_starts.add(len(blocks))
+        blocks += [s["subject"] for s in day["sessions"] if s["kind"] == "study"]
+    assert {"Mathematics", "Physics"} <= set(blocks)
+    for i in range(1, len(blocks)):
+        if i in day_starts or blocks[i] != blocks[i - 1]:
+            continue
+        # A repeat is only allowed once no other subject has work left
+        assert set(blocks[i:]) == {blocks[i]}, (i, blocks)
+
+
+def test_extra_hours_absorb_previously_unscheduled_work():
+    plan = generate_study_plan(
+        EXAMS, TOPICS, {"hours_per_day": 1}, start_date="2026-11-10"
+    )
+    assert plan["unscheduled"]
+    
+    result = replan_study_plan(
+        plan["plan_id"], "2026-11-11", availability={"hours_per_day": 6}
+    )
+    
+    assert result["unscheduled"] == []
+    studied = sum(
+        session["minutes"]
+        for day in get_plan_days(plan["plan_id"])
+        for session in day["sessions"]
+        if session["kind"] == "study" and not session.get("missed")
+    )
+    assert studied == 20 * 60
@@ -0,0 +1,63 @@
+"""Tests for the deterministic exam timetable parser."""
+
+import pytest
+
+from tools.timetable_tools import parse_exam_timetable
+
+
+@pytest.mark.parametrize(
+    "written",
+    ["12 Jan. 2025", "12 Jan 2025", "12 January 2025", "Jan. 12, 2025"],
+)
+def test_month_name_dates(written):
+    text = f"S.No  Subject  Date  Time\n1  Mathematics  {written}  10:00 AM"
+    
+    [row] = parse_exam_timetable(text)
+    
+    assert row["subject"] == "Mathematics"
+    assert row["date"] == "2025-01-12"
+    assert row["time"] == "10:00 AM"
+
+
+def test_date_headings_with_abbreviated_months():
+    text = "\n".join([
+        "Exam Timetable",
+        "12 Jan. 2025 (FN)",
+        "Mathematics",
+        "3 Feb. 2025 (AN)",
+        "Physics",
+    ])
+    
+    rows = parse_exam_timetable(text)
+    
+    assert [(r["subject"], r["date"], r["time"]) for r in rows] == [
+        ("Mathematics", "2025-01-12", "FN"),
+        ("Physics", "2025-02-03", "AN"),
+    ]
+
+
+def test_words_between_numbers_are_not_dates():
+    text = "Batch 12 Session 2025\nMathematics  2025-01-12  10:00 AM"
+    
+    [row] = parse_exam_timetable(text)
+    
+    assert row["date"] == "2025-01-12"
+
+
+def test_venue_lines_are_not_subjects():
+    text = "\n".join([
+        "Exam Timetable",
+        "12 Jan. 2025 (FN)",
+        "Mathematics",
+        "Room 12 Block 3",
+        "Invigilator: Dr. Rao",
+        "3 Feb. 2025 (AN)",
+        "Physics  Hall 2",
+    ])
+    
+    rows = parse_exam_timetable(text)
+    
+    assert [(r["subject"], r["date"]) for r in rows] == [
+        ("Mathematics", "2025-01-12"),
+        ("Physics", "2025-02-03"),
+    ]
@@ -2,15 +2,76 @@
 Taskify Agent Tools Package.
 
 This package contains utility tools for PDF processing and datetime operations.
+
+Tools are exported lazily (PEP 562): ``from tools import parse_date`` imports
+only the module that defines it, so importing one tool does not pull in
+pypdf, numpy, or the ADK for the others.
 """
 
-from tools.pdf_tools import extract_pdf_text, classify_document
-from tools.datetime_tools import get_current_datetime, parse_date, calculate_days_until
+import importlib
+from typing import Any, Dict, List
+
+# Public name -> module that defines it
+_EXPORTS: Dict[str, str] = {
+    "extract_pdf_text": "tools.pdf_tools",
+    "extract_pdf_bytes": "tools.pdf_tools",
+    "extract_pdf_pages": "tools.pdf_tools",
+    "classify_document": "tools.pdf_tools",
+    "classify_pdf": "tools.pdf_tools",
+    "extract_and_classify_pdfs": "tools.pdf_tools",
+    "iter_pdf_pages": "tools.pdf_tools",
+    "get_extraction_cache_stats": "tools.pdf_tools",
+    "extract_pdf_text_async": "tools.async_pdf_tools",
+    "extract_compact_text_async": "tools.async_pdf_tools",
+    "open_document_async": "tools.async_pdf_tools",
+    "classify_document_async": "tools.async_pdf_tools",
+    "classify_pdf_async": "tools.async_pdf_tools",
+    "extract_and_classify_pdfs_async": "tools.async_pdf_tools",
+    "extract_exam_timetable_async": "tools.async_pdf_tools",
+    "index_pyq_document_async": "tools.async_pdf_tools",
+    "match_syllabus_to_pyq_async": "tools.async_pdf_tools",
+    "get_async_tool_stats": "tools.async_pdf_tools",
+    "compact_pages": "tools.compaction",
+    "extract_compact_text": "tools.compaction",
+    "get_response_cache_stats": "tools.response_cache",
+    "open_document": "tools.document_store",
+    "list_documents": "tools.document_store",
+    "get_document_pages": "tools.document_store",
+    "get_document_section": "tools.document_store",
+    "search_document": "tools.document_store",
+    "extract_exam_timetable": "tools.timetable_tools",
+    "parse_exam_timetable": "tools.timetable_tools",
+    "index_pyq_document": "tools.pyq_index",
+    "get_pyq_topic_frequency": "tools.pyq_index",
+    "lookup_pyq_topic": "tools.pyq_index",
+    "match_syllabus_to_pyq": "tools.topic_matcher",
+    "generate_study_plan": "tools.scheduler",
+    "replan_study_plan": "tools.scheduler",
+    "get_plan_days": "tools.scheduler",
+    "analyze_cohort": "tools.cohort",
+    "export_plan_calendar": "tools.calendar_export",
+    "export_plan_calendar_async": "tools.async_pdf_tools",
+    "plan_cohort": "tools.cohort",
+    "get_current_datetime": "tools.datetime_tools",
+    "parse_date": "tools.datetime_tools",
+    "parse_dates": "tools.datetime_tools",
+    "calculate_days_until": "tools.datetime_tools",
+    "days_until": "tools.datetime_tools",
+    "time_context": "tools.datetime_tools",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str) -> Any:
+    """Import a tool's module on first access and cache the attribute."""
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
+
 
-__all__ = [
-    "extract_pdf_text",
-    "classify_document",
-    "get_current_datetime",
-    "parse_date",
-    "calculate_days_until",
-]
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,308 @@
+"""
+Async PDF tools for Taskify Agent.
+
+This module wraps the blocking PDF tools so they run on a bounded worker
+pool instead of the event loop, letting one agent process serve many
+concurrent sessions without head-of-line blocking.
+"""
+
+import asyncio
+import contextvars
+import importlib
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, Callable, List, Optional, TypeVar
+
+from config import Config
+
+if TYPE_CHECKING:
+    from google.adk.tools import ToolContext
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+def _deferred(module_name: str, name: str) -> Callable[..., Any]:
+    """
+    Return a stand-in for ``module_name.name`` that imports it when called.
+    
+    The wrapped tools pull in pypdf and numpy; deferring the import keeps
+    agent start-up cheap and, because the stand-in runs on the executor, the
+    first call's import happens in a worker thread rather than on the event
+    loop.
+    """
+    def call(*args: Any) -> Any:
+        return getattr(importlib.import_module(module_name), name)(*args)
+    
+    call.__name__ = call.__qualname__ = name
+    return call
+
+
+extract_pdf_text = _deferred("tools.pdf_tools", "extract_pdf_text")
+classify_document = _deferred("tools.pdf_tools", "classify_document")
+classify_pdf = _deferred("tools.pdf_tools", "classify_pdf")
+extract_and_classify_pdfs = _deferred("tools.pdf_tools", "extract_and_classify_pdfs")
+extract_compact_text = _deferred("tools.compaction", "extract_compact_text")
+open_document = _deferred("tools.document_store", "open_document")
+extract_exam_timetable = _deferred("tools.timetable_tools", "extract_exam_timetable")
+index_pyq_document = _deferred("tools.pyq_index", "index_pyq_document")
+match_syllabus_to_pyq = _deferred("tools.topic_matcher", "match_syllabus_to_pyq")
+export_plan_calendar = _deferred("tools.calendar_export", "export_plan_calendar")
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+_stats_lock = threading.Lock()
+_queued = 0
+_running = 0
+_completed = 0
+_failed = 0
+_max_queue_depth = 0
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    """Return the shared tool executor, creating it on first use."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=Config.ASYNC_TOOL_CONCURRENCY,
+                thread_name_prefix="taskify-tool",
+            )
+            logger.info(
+                f"Started async tool executor with "
+                f"{Config.ASYNC_TOOL_CONCURRENCY} workers"
+            )
+        return _executor
+
+
+async def _run_bounded(func: Callable[..., T], *args: Any) -> T:
+    """
+    Run a blocking tool on the bounded executor without blocking the loop.
+    
+    At most Config.ASYNC_TOOL_CONCURRENCY calls run at once; the rest wait
+    in the executor queue and are counted in the queue-depth metric. The
+    caller's context variables are carried into the worker thread.
+    
+    Args:
+        func: Blocking function to call
+        *args: Positional arguments for ``func``
+        
+    Returns:
+        The function's return value
+    """
+    global _queued, _max_queue_depth
+    
+    context = contextvars.copy_context()
+    
+    def call() -> T:
+        global _queued, _running, _completed, _failed
+        with _stats_lock:
+            _queued -= 1
+            _running += 1
+        try:
+            result = context.run(func, *args)
+        except BaseException:
+            with _stats_lock:
+                _failed += 1
+            raise
+        finally:
+            with _stats_lock:
+                _running -= 1
+                _completed += 1
+        return result
+    
+    with _stats_lock:
+        _queued += 1
+        _max_queue_depth = max(_max_queue_depth, _queued)
+    
+    future = _get_executor().submit(call)
+    try:
+        return await asyncio.wrap_future(future)
+    except asyncio.CancelledError:
+        # A call cancelled while still queued never runs, so release its slot
+        if future.cancelled():
+            with _stats_lock:
+                _queued -= 1
+        raise
+
+
+async def extract_pdf_text_async(file_path: str) -> str:
+    """
+    Extract text from a PDF file without blocking the event loop.
+    
+    Args:
+        file_path: Path to the PDF file
+        
+    Returns:
+        Extracted text from all pages
+    """
+    return await _run_bounded(extract_pdf_text, file_path)
+
+
+async def extract_compact_text_async(file_path: str) -> dict:
+    """
+    Extract and compact a PDF's text without blocking the event loop.
+    
+    Args:
+        file_path: Path to the PDF file
+        
+    Returns:
+        Dictionary with 'document_type', 'confidence', 'page_count', 'text',
+        'tokens_before', 'tokens_after' and 'truncated' keys, among others
+    """
+    return await _run_bounded(extract_compact_text, file_path)
+
+
+async def open_document_async(file_path: str, tool_context: "ToolContext") -> dict:
+    """
+    Open a PDF for the session without blocking the event loop.
+    
+    Args:
+        file_path: Path to the PDF file
+        tool_context: ADK tool context (injected)
+        
+    Returns:
+        Dictionary with 'doc_id', 'document_type', 'page_count', 'sections'
+        and 'preview' keys, among others
+    """
+    return await _run_bounded(open_document, file_path, tool_context)
+
+
+async def classify_document_async(text: str) -> dict:
+    """
+    Classify document text without blocking the event loop.
+    
+    Args:
+        text: Document text content
+        
+    Returns:
+        Dictionary with 'type' and 'confidence' keys
+    """
+    return await _run_bounded(classify_document, text)
+
+
+async def classify_pdf_async(
+    file_path: str, confidence_threshold: float = 0.6
+) -> dict:
+    """
+    Classify a PDF from its first pages without blocking the event loop.
+    
+    Args:
+        file_path: Path to the PDF file
+        confidence_threshold: Confidence (0-1) at which to stop reading
+        
+    Returns:
+        Dictionary with 'type', 'confidence', 'scores', 'pages_read' and
+        'stopped_early' keys
+    """
+    return await _run_bounded(classify_pdf, file_path, confidence_threshold)
+
+
+async def extract_and_classify_pdfs_async(file_paths: List[str]) -> List[dict]:
+    """
+    Extract and classify several PDF files without blocking the event loop.
+    
+    Args:
+        file_paths: Paths to the PDF files
+        
+    Returns:
+        One result dictionary per file, in input order, without the text
+        (see :func:`tools.pdf_tools.extract_and_classify_pdfs`)
+    """
+    return await _run_bounded(extract_and_classify_pdfs, file_paths)
+
+
+async def extract_exam_timetable_async(file_path: str) -> dict:
+    """
+    Extract structured exam rows from a timetable PDF without blocking.
+    
+    Args:
+        file_path: Path to the timetable PDF
+        
+    Returns:
+        Dictionary with 'document_type', 'confidence', 'rows' and
+        'row_count' keys
+    """
+    return await _run_bounded(extract_exam_timetable, file_path)
+
+
+async def index_pyq_document_async(
+    file_path: str, subject: str, year: Optional[int] = None
+) -> dict:
+    """
+    Add a PYQ paper to the topic index without blocking the event loop.
+    
+    Args:
+        file_path: Path to the PYQ PDF
+        subject: Subject the paper belongs to
+        year: Exam year; detected from the paper if omitted
+        
+    Returns:
+        Dictionary with 'subject', 'year', 'questions_indexed',
+        'already_indexed' and 'years' keys
+    """
+    return await _run_bounded(index_pyq_document, file_path, subject, year)
+
+
+async def match_syllabus_to_pyq_async(
+    subject: str,
+    topics: Optional[List[str]] = None,
+    syllabus_file: Optional[str] = None,
+) -> dict:
+    """
+    Weight syllabus topics by PYQ frequency without blocking the event loop.
+    
+    Args:
+        subject: Subject whose PYQ papers were indexed
+        topics: Syllabus topic names; alternatively give ``syllabus_file``
+        syllabus_file: Path to the syllabus PDF to read topics from
+        
+    Returns:
+        Dictionary with 'subject', 'years', 'question_count',
+        'matched_questions' and 'topics' keys
+    """
+    return await _run_bounded(match_syllabus_to_pyq, subject, topics, syllabus_file)
+
+
+async def export_plan_calendar_async(
+    plan_id: str,
+    calendar_id: Optional[str] = None,
+    time_zone: Optional[str] = None,
+) -> dict:
+    """
+    Export a study plan to ICS without blocking the event loop.
+    
+    Args:
+        plan_id: Identifier returned by ``generate_study_plan``
+        calendar_id: Name of the student's calendar; reuse it on every
+            export so only changes are re-imported
+        time_zone: IANA timezone of the plan's times
+        
+    Returns:
+        Dictionary with 'calendar_id', 'calendar_file', 'delta_file',
+        'timezone', 'events', 'added', 'moved', 'cancelled' and 'unchanged'
+        keys
+    """
+    return await _run_bounded(export_plan_calendar, plan_id, calendar_id, time_zone)
+
+
+def get_async_tool_stats() -> dict:
+    """
+    Report load on the async tool executor.
+    
+    Returns:
+        Dictionary with the concurrency limit, current queue depth, running
+        calls, the deepest queue seen, and completed/failed call counts
+    """
+    with _stats_lock:
+        return {
+            "concurrency_limit": Config.ASYNC_TOOL_CONCURRENCY,
+            "queue_depth": _queued,
+            "running": _running,
+            "max_queue_depth": _max_queue_depth,
+            "completed": _completed,
+            "failed": _failed,
+        }
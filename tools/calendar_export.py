@@ -0,0 +1,367 @@
+"""
+Calendar export for Taskify Agent.
+
+This module writes a study plan as iCalendar (ICS) files. Every study and
+revision session gets a UID derived from its subject, topic and ordinal
+(the n-th session of that topic), so a session keeps its UID across
+replans and regenerated plans. Each export is compared with the state
+saved by the previous export of the same calendar:
+
+- ``<calendar>.ics`` holds every current session, for subscriptions and
+  first imports
+- ``<calendar>.delta.ics`` holds only what changed: new sessions, sessions
+  that moved (same UID, higher SEQUENCE) and cancelled ones
+  (STATUS:CANCELLED)
+
+Events are written as they are generated, so a multi-month plan is never
+built up as a whole calendar in memory; only one small state entry per
+session is kept. Times are converted from the student's timezone to UTC.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import tempfile
+from datetime import date, datetime, timedelta, timezone, tzinfo
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, Optional, TextIO, Tuple
+
+from config import Config
+from tools.datetime_tools import get_timezone, local_to_utc
+from tools.scheduler import get_plan_days
+
+logger = logging.getLogger(__name__)
+
+PRODID = "-//Taskify Agent//Study Plan//EN"
+
+_UID_DOMAIN = "taskify-agent"
+
+# Calendar IDs become file names
+_UNSAFE_ID_CHARS = re.compile(r"[^A-Za-z0-9_.-]+")
+
+_CLOCK = re.compile(r"^(\d{1,2}):([0-5]\d)$")
+
+# RFC 5545 limit for content lines, in octets, before folding
+_MAX_LINE_OCTETS = 75
+
+
+def _escape(text: str) -> str:
+    """Escape a TEXT property value."""
+    return (
+        text.replace("\\", "\\\\")
+        .replace(";", "\\;")
+        .replace(",", "\\,")
+        .replace("\n", "\\n")
+    )
+
+
+def _fold(line: str) -> str:
+    """Fold a content line at 75 octets without splitting UTF-8 characters."""
+    data = line.encode("utf-8")
+    if len(data) <= _MAX_LINE_OCTETS:
+        return line + "\r\n"
+    parts = []
+    start = 0
+    limit = _MAX_LINE_OCTETS
+    while start < len(data):
+        end = min(start + limit, len(data))
+        while end < len(data) and data[end] & 0xC0 == 0x80:
+            end -= 1
+        parts.append(data[start:end].decode("utf-8"))
+        start = end
+        # Continuation lines begin with a space, which counts toward the limit
+        limit = _MAX_LINE_OCTETS - 1
+    return "\r\n ".join(parts) + "\r\n"
+
+
+def _utc_stamp(moment: datetime) -> str:
+    return moment.astimezone(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+
+
+def _session_uid(calendar_id: str, key: Tuple[str, str, str], ordinal: int) -> str:
+    """Stable UID for the ``ordinal``-th session of a (subject, topic, kind)."""
+    digest = hashlib.sha1(
+        "\x1f".join((calendar_id, *key, str(ordinal))).encode("utf-8")
+    ).hexdigest()[:24]
+    return f"{digest}@{_UID_DOMAIN}"
+
+
+def _session_start(day: date, clock: str, tz: tzinfo) -> datetime:
+    """
+    UTC start of a session at ``clock`` on ``day``.
+    
+    Times at or past 24:00 (from plans whose day ran past midnight) roll
+    over to the following day.
+    
+    Raises:
+        ValueError: If ``clock`` is not an HH:MM time
+    """
+    match = _CLOCK.match(clock)
+    if match is None:
+        raise ValueError(
+            f"Plan session on {day.isoformat()} has an invalid start time: "
+            f"{clock!r} (expected HH:MM)"
+        )
+    hours, minutes = int(match.group(1)), int(match.group(2))
+    day += timedelta(days=hours // 24)
+    return local_to_utc(day, f"{hours % 24:02d}:{minutes:02d}", tz)
+
+
+def iter_plan_events(
+    days: Iterable[dict], calendar_id: str, tz: tzinfo
+) -> Iterator[dict]:
+    """
+    Turn plan days into calendar events, one session at a time.
+    
+    Breaks and sessions flagged as missed are skipped; a missed session's
+    ordinal passes to its replacement, so rescheduled work shows up as a
+    moved event rather than a cancellation plus an addition.
+    
+    Args:
+        days: Plan days as returned by the scheduler, in date order
+        calendar_id: Calendar the UIDs belong to
+        tz: Timezone of the plan's dates and clock times
+        
+    Yields:
+        Dictionaries with 'uid', 'start' and 'end' (UTC stamps), 'summary'
+        and 'description' keys
+    """
+    ordinals: Dict[Tuple[str, str, str], int] = {}
+    for day in days:
+        day_date = date.fromisoformat(day["date"])
+        for session in day["sessions"]:
+            if session["kind"] == "break" or session.get("missed"):
+                continue
+            subject, topic, kind = session["subject"], session["topic"], session["kind"]
+            key = (subject.lower(), topic.lower(), kind)
+            ordinals[key] = ordinals.get(key, 0) + 1
+            
+            start = _session_start(day_date, session["start"], tz)
+            end = start + timedelta(minutes=session["minutes"])
+            if kind == "revision":
+                summary = f"Revision: {subject}"
+            else:
+                summary = f"{subject}: {topic}"
+            yield {
+                "uid": _session_uid(calendar_id, key, ordinals[key]),
+                "start": _utc_stamp(start),
+                "end": _utc_stamp(end),
+                "summary": summary,
+                "description": (
+                    f"{kind.capitalize()} session, {session['minutes']} minutes "
+                    f"({session['start']} local)"
+                ),
+            }
+
+
+def _write_header(out: TextIO, calendar_id: str, tz_name: str) -> None:
+    for line in (
+        "BEGIN:VCALENDAR",
+        "VERSION:2.0",
+        f"PRODID:{PRODID}",
+        "CALSCALE:GREGORIAN",
+        "METHOD:PUBLISH",
+        f"X-WR-CALNAME:{_escape(calendar_id)}",
+        f"X-WR-TIMEZONE:{tz_name}",
+    ):
+        out.write(_fold(line))
+
+
+def _write_event(
+    out: TextIO, event: dict, sequence: int, stamp: str, cancelled: bool = False
+) -> None:
+    lines = [
+        "BEGIN:VEVENT",
+        f"UID:{event['uid']}",
+        f"DTSTAMP:{stamp}",
+        f"DTSTART:{event['start']}",
+        f"DTEND:{event['end']}",
+        f"SEQUENCE:{sequence}",
+        f"SUMMARY:{_escape(event['summary'])}",
+    ]
+    if event.get("description"):
+        lines.append(f"DESCRIPTION:{_escape(event['description'])}")
+    lines.append("STATUS:CANCELLED" if cancelled else "STATUS:CONFIRMED")
+    lines.append("END:VEVENT")
+    for line in lines:
+        out.write(_fold(line))
+
+
+def write_plan_calendar(
+    days: Iterable[dict],
+    calendar_id: str,
+    state: Dict[str, dict],
+    full_out: TextIO,
+    delta_out: TextIO,
+    tz_name: Optional[str] = None,
+) -> Dict[str, int]:
+    """
+    Stream a plan's events to a full and a delta calendar.
+    
+    Args:
+        days: Plan days as returned by the scheduler
+        calendar_id: Calendar the events belong to
+        state: Previous export's events by UID ('start', 'end', 'summary',
+            'sequence', 'cancelled'); updated in place to this export
+        full_out: Receives every current event
+        delta_out: Receives only added, moved and cancelled events
+        tz_name: Timezone of the plan's times; defaults to
+            Config.STUDENT_TIMEZONE
+            
+    Returns:
+        Counts of 'events', 'added', 'moved', 'cancelled' and 'unchanged'
+    """
+    tz_name = tz_name or Config.STUDENT_TIMEZONE
+    tz = get_timezone(tz_name)
+    stamp = _utc_stamp(datetime.now(timezone.utc))
+    counts = {"events": 0, "added": 0, "moved": 0, "cancelled": 0, "unchanged": 0}
+    seen = set()
+    
+    _write_header(full_out, calendar_id, tz_name)
+    _write_header(delta_out, calendar_id, tz_name)
+    
+    for event in iter_plan_events(days, calendar_id, tz):
+        uid = event["uid"]
+        seen.add(uid)
+        counts["events"] += 1
+        previous = state.get(uid)
+        current = (event["start"], event["end"], event["summary"])
+        
+        if previous is None:
+            sequence = 0
+            counts["added"] += 1
+        elif previous["cancelled"]:
+            # A cancelled session's UID is back: revive it with a new sequence
+            sequence = previous["sequence"] + 1
+            counts["added"] += 1
+        elif (previous["start"], previous["end"], previous["summary"]) != current:
+            sequence = previous["sequence"] + 1
+            counts["moved"] += 1
+        else:
+            sequence = previous["sequence"]
+            counts["unchanged"] += 1
+        
+        _write_event(full_out, event, sequence, stamp)
+        if previous is None or sequence != previous["sequence"]:
+            _write_event(delta_out, event, sequence, stamp)
+        state[uid] = {
+            "start": event["start"],
+            "end": event["end"],
+            "summary": event["summary"],
+            "sequence": sequence,
+            "cancelled": False,
+        }
+    
+    for uid, previous in state.items():
+        if uid in seen or previous["cancelled"]:
+            continue
+        # Kept as a tombstone so a later revival gets a higher sequence
+        previous["sequence"] += 1
+        previous["cancelled"] = True
+        counts["cancelled"] += 1
+        _write_event(
+            delta_out, {"uid": uid, **previous}, previous["sequence"], stamp,
+            cancelled=True,
+        )
+    
+    full_out.write(_fold("END:VCALENDAR"))
+    delta_out.write(_fold("END:VCALENDAR"))
+    return counts
+
+
+def _load_state(path: Path) -> Dict[str, dict]:
+    if not path.exists():
+        return {}
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))["events"]
+    except (OSError, ValueError, KeyError) as e:
+        logger.warning(f"Ignoring unreadable calendar state {path}: {e}")
+        return {}
+
+
+def _temp_path(path: Path) -> Path:
+    """Create an empty, uniquely named temp file next to ``path``."""
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=path.name, suffix=".tmp")
+    os.close(fd)
+    return Path(tmp_path)
+
+
+def export_plan_calendar(
+    plan_id: str,
+    calendar_id: Optional[str] = None,
+    time_zone: Optional[str] = None,
+) -> dict:
+    """
+    Export a study plan to ICS, with a delta against the last export.
+    
+    Pass the same ``calendar_id`` on every export for a student (also after
+    generating a new plan) so only changed sessions are re-imported.
+    
+    Args:
+        plan_id: Identifier returned by ``generate_study_plan``; replans
+            are included
+        calendar_id: Name of the student's calendar; defaults to the plan ID
+        time_zone: IANA timezone of the plan's times; defaults to
+            Config.STUDENT_TIMEZONE
+            
+    Returns:
+        Dictionary with 'calendar_id', 'calendar_file' (all events),
+        'delta_file' (changes only), 'timezone', 'events', 'added', 'moved',
+        'cancelled' and 'unchanged' keys
+        
+    Raises:
+        ValueError: If the plan or timezone is unknown, or a session time
+            is invalid
+    """
+    days = get_plan_days(plan_id)
+    calendar_id = _UNSAFE_ID_CHARS.sub("-", calendar_id or plan_id).strip("-.")
+    if not calendar_id:
+        raise ValueError("calendar_id must contain letters or digits")
+    tz_name = time_zone or Config.STUDENT_TIMEZONE
+    get_timezone(tz_name)
+    
+    export_dir = Path(Config.CALENDAR_EXPORT_DIR)
+    export_dir.mkdir(parents=True, exist_ok=True)
+    full_path = export_dir / f"{calendar_id}.ics"
+    delta_path = export_dir / f"{calendar_id}.delta.ics"
+    state_path = export_dir / f"{calendar_id}.state.json"
+    
+    state = _load_state(state_path)
+    # Unique temp files, so concurrent exports of one calendar never share one
+    full_tmp, delta_tmp, state_tmp = (
+        _temp_path(path) for path in (full_path, delta_path, state_path)
+    )
+    try:
+        with (
+            open(full_tmp, "w", encoding="utf-8", newline="") as full_out,
+            open(delta_tmp, "w", encoding="utf-8", newline="") as delta_out,
+        ):
+            counts = write_plan_calendar(
+                days, calendar_id, state, full_out, delta_out, tz_name
+            )
+        state_tmp.write_text(
+            json.dumps({"calendar_id": calendar_id, "events": state}),
+            encoding="utf-8",
+        )
+        os.replace(full_tmp, full_path)
+        os.replace(delta_tmp, delta_path)
+        # The state moves last: a failed export leaves the old baseline
+        os.replace(state_tmp, state_path)
+    finally:
+        for tmp in (full_tmp, delta_tmp, state_tmp):
+            tmp.unlink(missing_ok=True)
+    
+    logger.info(
+        f"Exported calendar {calendar_id}: {counts['events']} events, "
+        f"{counts['added']} added, {counts['moved']} moved, "
+        f"{counts['cancelled']} cancelled"
+    )
+    return {
+        "calendar_id": calendar_id,
+        "calendar_file": str(full_path),
+        "delta_file": str(delta_path),
+        "timezone": tz_name,
+        **counts,
+    }
@@ -0,0 +1,386 @@
+"""
+Cohort planning for Taskify Agent.
+
+Plans a whole class that shares one exam timetable and syllabus without a
+model session per student. The shared documents are extracted, classified
+and weighted once (:func:`analyze_cohort`); the resulting exams and
+weighted topics are published to worker processes through shared memory,
+and each student's plan is then built by the deterministic scheduler from
+only their availability and progress, a batch of students per task across
+all cores.
+
+Usage:
+    python -m tools.cohort cohort.json [--students students.jsonl]
+        [--out plans.jsonl] [--workers 8] [--batch-size 25]
+
+The cohort file is JSON::
+
+    {
+      "timetable_file": "exam_timetable.pdf",
+      "subjects": [
+        {"subject": "Mathematics", "syllabus_file": "maths_syllabus.pdf",
+         "pyq_files": ["maths_2023.pdf", "maths_2024.pdf"],
+         "hours_per_topic": 2}
+      ],
+      "start_date": "2026-11-01",
+      "students": [
+        {"student_id": "s001",
+         "availability": {"hours_per_day": 5, "days_off": ["sunday"]},
+         "progress": [{"subject": "Mathematics", "topic": "Fourier series",
+                       "hours_done": 1.5}]}
+      ]
+    }
+
+``exams`` ({"subject", "date"} entries) may replace ``timetable_file``, and
+``topics`` may replace ``syllabus_file``. Plans are written as JSON lines,
+one per student, in input order.
+"""
+
+import argparse
+import json
+import logging
+import os
+import pickle
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from config import Config
+from tools.pdf_tools import extract_pdf_text
+from tools.pyq_index import PyqIndex, _index_paper
+from tools.scheduler import _build_plan
+from tools.timetable_tools import extract_exam_timetable
+from tools.topic_matcher import _match_syllabus, split_syllabus_topics
+
+logger = logging.getLogger(__name__)
+
+# Shared analysis in this process: set by the pool initializer in workers
+_analysis: Optional[Dict[str, Any]] = None
+
+
+def _subject_topics(spec: dict, index: PyqIndex) -> List[dict]:
+    """Weighted topics for one subject, from its PYQs when any are given."""
+    subject = str(spec.get("subject", "")).strip()
+    if not subject:
+        raise ValueError(f"Cohort subject is missing a name: {spec}")
+    hours = float(spec.get("hours_per_topic", Config.COHORT_TOPIC_HOURS))
+    topics = spec.get("topics")
+    syllabus_file = spec.get("syllabus_file")
+    
+    for pyq_file in spec.get("pyq_files", []):
+        _index_paper(index, pyq_file, subject, None)
+    
+    try:
+        indexed = bool(index.years(subject))
+    except ValueError:
+        indexed = False
+    
+    if indexed:
+        matched = _match_syllabus(index, subject, topics, syllabus_file)
+        weighted = [(t["topic"], t["weight"]) for t in matched["topics"]]
+    elif topics:
+        weighted = [(str(t).strip(), 1.0) for t in topics if str(t).strip()]
+    elif syllabus_file:
+        weighted = [
+            (topic, 1.0) for _, topic in split_syllabus_topics(
+                extract_pdf_text(syllabus_file)
+            )
+        ]
+    else:
+        raise ValueError(f"Give topics or a syllabus_file for {subject}")
+    
+    return [
+        {"subject": subject, "topic": topic, "hours": hours, "weight": weight}
+        for topic, weight in weighted
+    ]
+
+
+def analyze_cohort(
+    subjects: List[dict],
+    timetable_file: Optional[str] = None,
+    exams: Optional[List[dict]] = None,
+) -> dict:
+    """
+    Analyze a cohort's shared documents once.
+    
+    Args:
+        subjects: One entry per subject with 'subject' and either 'topics'
+            or 'syllabus_file', plus optional 'pyq_files' (indexed, apart
+            from the shared PYQ index, for topic weights) and
+            'hours_per_topic'
+        timetable_file: Exam timetable PDF shared by the cohort
+        exams: {"subject", "date"} entries, instead of ``timetable_file``
+        
+    Returns:
+        Dictionary with 'exams', 'topics' (each with 'subject', 'topic',
+        'hours' and 'weight') and 'warnings' keys
+        
+    Raises:
+        ValueError: If no exams are found or a subject has no topics
+    """
+    began = time.perf_counter()
+    
+    if exams is None:
+        if not timetable_file:
+            raise ValueError("Give a timetable_file or exams")
+        timetable = extract_exam_timetable(timetable_file)
+        exams = [
+            {"subject": row["subject"], "date": row["date"]}
+            for row in timetable["rows"]
+        ]
+        if not exams:
+            raise ValueError(
+                timetable.get("message", "No exams found in the timetable")
+            )
+    
+    topics: List[dict] = []
+    # The cohort's own papers only: the shared PYQ index may hold other
+    # papers for the same subject, and must not be changed by a batch run
+    with tempfile.TemporaryDirectory(prefix="cohort_pyq_") as tmp:
+        index = PyqIndex(Path(tmp) / "pyq_index.json")
+        for spec in subjects:
+            topics.extend(_subject_topics(spec, index))
+    
+    examined = {str(exam["subject"]).strip().lower() for exam in exams}
+    warnings = [
+        f"No exam found for {spec['subject']}; its topics are planned up to "
+        f"the last exam"
+        for spec in subjects
+        if str(spec["subject"]).strip().lower() not in examined
+    ]
+    
+    elapsed_ms = (time.perf_counter() - began) * 1000
+    logger.info(
+        f"Analyzed cohort documents: {len(exams)} exams, {len(topics)} topics "
+        f"in {elapsed_ms:.1f}ms"
+    )
+    return {"exams": exams, "topics": topics, "warnings": warnings}
+
+
+def _apply_progress(topics: List[dict], progress: List[dict]) -> List[dict]:
+    """Subtract a student's completed hours from the cohort topics."""
+    done: Dict[Tuple[str, str], float] = {}
+    for entry in progress:
+        key = (
+            str(entry.get("subject", "")).strip().lower(),
+            str(entry.get("topic", "")).strip().lower(),
+        )
+        # An entry without hours_done marks the topic as finished
+        hours = float(entry.get("hours_done", float("inf")))
+        done[key] = done.get(key, 0.0) + hours
+    if not done:
+        return topics
+    
+    remaining = []
+    for topic in topics:
+        key = (topic["subject"].lower(), topic["topic"].lower())
+        hours = topic["hours"] - done.get(key, 0.0)
+        if hours > 0:
+            remaining.append(dict(topic, hours=hours))
+    return remaining
+
+
+def _shared_analysis() -> Dict[str, Any]:
+    """Return this process's analysis, set by plan_cohort or the initializer."""
+    if _analysis is None:
+        raise RuntimeError("No cohort analysis attached to this process")
+    return _analysis
+
+
+def _shared_buffer(shm: shared_memory.SharedMemory) -> memoryview:
+    """Return a shared memory segment's buffer, which is None once closed."""
+    if shm.buf is None:
+        raise RuntimeError(f"Shared memory segment {shm.name} is closed")
+    return shm.buf
+
+
+def _check_student(student: Any) -> None:
+    """Raise ValueError unless a student entry has the documented shape."""
+    if not isinstance(student, dict):
+        raise ValueError(f"Student entry must be an object, got: {student!r}")
+    availability = student.get("availability")
+    if availability is not None and not isinstance(availability, dict):
+        raise ValueError(f"availability must be an object, got: {availability!r}")
+    progress = student.get("progress", [])
+    if not isinstance(progress, list) or not all(
+        isinstance(entry, dict) for entry in progress
+    ):
+        raise ValueError(
+            f"progress must be a list of {{subject, topic, hours_done}} "
+            f"objects, got: {progress!r}"
+        )
+
+
+def _plan_student(student: dict, start_date: Optional[str]) -> dict:
+    """Plan one student against the shared analysis."""
+    student_id = student.get("student_id") if isinstance(student, dict) else None
+    analysis = _shared_analysis()
+    try:
+        _check_student(student)
+        student_start: Optional[str] = student.get("start_date") or start_date
+        _, plan = _build_plan(
+            analysis["exams"],
+            _apply_progress(analysis["topics"], student.get("progress", [])),
+            student.get("availability"),
+            student_start,
+        )
+    except (ValueError, TypeError) as e:
+        return {"student_id": student_id, "error": str(e)}
+    return {"student_id": student_id, **plan}
+
+
+def _plan_batch(batch: List[dict], start_date: Optional[str]) -> List[dict]:
+    return [_plan_student(student, start_date) for student in batch]
+
+
+def _attach_analysis(name: str, size: int) -> None:
+    """
+    Pool initializer: load the shared analysis once per worker process.
+    
+    Tasks then carry only their students, not the cohort's exams and topics.
+    """
+    global _analysis
+    shm = shared_memory.SharedMemory(name=name)
+    try:
+        with _shared_buffer(shm)[:size] as view:
+            _analysis = pickle.loads(view)
+    finally:
+        shm.close()
+
+
+def plan_cohort(
+    analysis: dict,
+    students: List[dict],
+    start_date: Optional[str] = None,
+    workers: Optional[int] = None,
+    batch_size: Optional[int] = None,
+) -> Iterator[dict]:
+    """
+    Plan every student in a cohort from a shared analysis.
+    
+    Students are split into batches; with more than one batch, batches run
+    on a process pool whose workers read the analysis from shared memory.
+    Plans are not kept for ``replan_study_plan``; a student replans by
+    generating their own plan in an agent session.
+    
+    Args:
+        analysis: Result of :func:`analyze_cohort`
+        students: Entries with 'student_id', optional 'availability' (as
+            for ``generate_study_plan``), 'progress' ({"subject", "topic",
+            "hours_done"} entries; no hours_done means finished) and
+            'start_date'
+        start_date: Default first day of each plan; defaults to today
+        workers: Worker processes; defaults to Config.COHORT_WORKERS
+        batch_size: Students per task; defaults to Config.COHORT_BATCH_SIZE
+        
+    Yields:
+        One plan per student in input order, with 'student_id' added, or
+        {"student_id", "error"} when that student's input is invalid
+    """
+    global _analysis
+    began = time.perf_counter()
+    batch_size = batch_size or Config.COHORT_BATCH_SIZE
+    workers = workers or Config.COHORT_WORKERS or os.cpu_count() or 1
+    batches = [
+        students[i:i + batch_size] for i in range(0, len(students), batch_size)
+    ]
+    workers = min(workers, len(batches))
+    
+    planned = failed = 0
+    if workers <= 1:
+        _analysis = analysis
+        results = (
+            plan for batch in batches for plan in _plan_batch(batch, start_date)
+        )
+        for plan in results:
+            failed += "error" in plan
+            planned += 1
+            yield plan
+    else:
+        payload = pickle.dumps(analysis, protocol=pickle.HIGHEST_PROTOCOL)
+        shm = shared_memory.SharedMemory(create=True, size=len(payload))
+        try:
+            _shared_buffer(shm)[:len(payload)] = payload
+            with ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=_attach_analysis,
+                initargs=(shm.name, len(payload)),
+            ) as pool:
+                for plans in pool.map(
+                    _plan_batch, batches, [start_date] * len(batches)
+                ):
+                    for plan in plans:
+                        failed += "error" in plan
+                        planned += 1
+                        yield plan
+        finally:
+            shm.close()
+            shm.unlink()
+    
+    elapsed = time.perf_counter() - began
+    logger.info(
+        f"Planned {planned} students ({failed} failed) in {elapsed:.2f}s "
+        f"with {max(workers, 1)} worker(s), "
+        f"{planned / elapsed if elapsed else 0:.0f} students/s"
+    )
+
+
+def _load_students(path: Path) -> List[dict]:
+    """Read students from a JSON list or a JSON-lines file."""
+    text = path.read_text(encoding="utf-8")
+    if text.lstrip().startswith("["):
+        return json.loads(text)
+    return [json.loads(line) for line in text.splitlines() if line.strip()]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Plan a whole cohort from shared documents"
+    )
+    parser.add_argument("cohort", type=Path, help="Cohort JSON file")
+    parser.add_argument(
+        "--students", type=Path, help="Students as JSON or JSON lines"
+    )
+    parser.add_argument(
+        "--out", type=Path, help="Plans as JSON lines (default: stdout)"
+    )
+    parser.add_argument("--workers", type=int)
+    parser.add_argument("--batch-size", type=int)
+    parser.add_argument("--start-date", help="First day of every plan")
+    args = parser.parse_args()
+    
+    Config.setup_logging()
+    spec = json.loads(args.cohort.read_text(encoding="utf-8"))
+    students = (
+        _load_students(args.students) if args.students else spec.get("students", [])
+    )
+    
+    analysis = analyze_cohort(
+        spec.get("subjects", []),
+        timetable_file=spec.get("timetable_file"),
+        exams=spec.get("exams"),
+    )
+    for warning in analysis["warnings"]:
+        logger.warning(warning)
+    
+    out = args.out.open("w", encoding="utf-8") if args.out else sys.stdout
+    try:
+        for plan in plan_cohort(
+            analysis,
+            students,
+            start_date=args.start_date or spec.get("start_date"),
+            workers=args.workers,
+            batch_size=args.batch_size,
+        ):
+            out.write(json.dumps(plan) + "\n")
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,266 @@
+"""
+Context compaction for extracted documents in Taskify Agent.
+
+This module shrinks extracted PDF text before it reaches the model: page
+headers and footers repeated across pages, page numbers and duplicated
+boilerplate are removed, whitespace is collapsed, and the result is trimmed
+to a token budget chosen by document type.
+"""
+
+import logging
+import re
+from collections import Counter
+from typing import List, Optional, Set
+
+from config import Config
+from tools.pdf_tools import classify_document, extract_pdf_pages
+
+logger = logging.getLogger(__name__)
+
+# Rough token estimate used for budgets and reporting (4 characters/token)
+CHARS_PER_TOKEN = 4
+
+# Lines this close to the top or bottom of a page can be headers/footers
+_EDGE_LINES = 3
+
+# A header/footer must repeat on at least this share of pages (and 2 pages)
+_REPEAT_PAGE_SHARE = 0.5
+
+# Repeated body lines at least this long are boilerplate worth deduplicating
+_MIN_DEDUP_CHARS = 40
+
+# Document types whose repeated lines are content: a PYQ bundle repeats a
+# question across years, and that repetition is what topic weights count
+_REPEATS_ARE_CONTENT = frozenset({"pyq"})
+
+# Explicit page labels: "Page 3", "Page 3 of 10", "3 of 10", "- 3 -"
+_PAGE_LABEL = re.compile(
+    r"^(page\s*\d+(\s*(of|/)\s*\d+)?|\d+\s+of\s+\d+|[-–]\s*\d{1,4}\s*[-–])$",
+    re.IGNORECASE,
+)
+
+# A bare number is only a page number if every page has one in that place,
+# counting up with the pages; otherwise it is content such as marks
+_BARE_NUMBER = re.compile(r"^\d{1,4}$")
+
+# "Q3.", "Question 3", "3)" at the start of a PYQ question
+_QUESTION_LINE = re.compile(
+    r"^(q(uestion)?\s*\.?\s*\d{1,2}|\d{1,2}\s*[.)])", re.IGNORECASE
+)
+
+# Tabs or runs of 3+ spaces separate table columns in extracted text; two
+# spaces are common inside prose (after a full stop) and are not columns
+_COLUMN_GAP = re.compile(r"\t+| {3,}")
+_SPACES = re.compile(r"\s+")
+_WORD = re.compile(r"\w")
+
+# "Page 3", "Page 3/10", "3 of 10" inside a header or footer line; a bare
+# "3/10" is left alone since it is also how dates start
+_PAGE_COUNTER = re.compile(
+    r"\bpage\s*\d+(\s*(of|/)\s*\d+)?\b|\b\d+\s+of\s+\d+\b", re.IGNORECASE
+)
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the model tokens in ``text`` (about 4 characters per token)."""
+    return -(-len(text) // CHARS_PER_TOKEN)
+
+
+def _clean_line(line: str) -> str:
+    """Collapse whitespace, keeping table column gaps as ' | '."""
+    line = line.strip()
+    if len(_COLUMN_GAP.findall(line)) >= 2:
+        cells = [_SPACES.sub(" ", cell) for cell in _COLUMN_GAP.split(line)]
+        return " | ".join(cell for cell in cells if _WORD.search(cell))
+    return _SPACES.sub(" ", line)
+
+
+def _edge_key(line: str) -> str:
+    """
+    Key headers/footers so ones differing only in a page counter match.
+    
+    Other numbers are kept: "Q1. ..." and "Q2. ..." or two timetable date
+    headings are content, not furniture.
+    """
+    return _PAGE_COUNTER.sub("#", line.lower())
+
+
+def _repeated_edges(pages: List[List[str]]) -> set:
+    """Find header/footer lines repeated near the edges of many pages."""
+    pages = [lines for lines in pages if lines]
+    if len(pages) < 2:
+        return set()
+    counts: Counter = Counter()
+    for lines in pages:
+        edges = lines[:_EDGE_LINES] + lines[-_EDGE_LINES:]
+        counts.update({_edge_key(line) for line in edges})
+    threshold = max(2, len(pages) * _REPEAT_PAGE_SHARE)
+    return {key for key, count in counts.items() if count >= threshold}
+
+
+def _numbered_edges(pages: List[List[str]]) -> Set[int]:
+    """
+    Line positions (0 first, -1 last) holding a page counter.
+    
+    A position counts when every page with text has a bare number there
+    that goes up by one per page; numbers that do not follow the page
+    order are content.
+    """
+    numbered = [(index, lines) for index, lines in enumerate(pages) if lines]
+    if len(numbered) < 2:
+        return set()
+    slots = set()
+    for position in (0, -1):
+        offsets = {
+            int(lines[position]) - index
+            if _BARE_NUMBER.match(lines[position]) else None
+            for index, lines in numbered
+        }
+        if len(offsets) == 1 and None not in offsets:
+            slots.add(position)
+    return slots
+
+
+def _budget_for(doc_type: str) -> int:
+    budgets = Config.CONTEXT_TOKEN_BUDGETS
+    return budgets.get(doc_type, budgets["unknown"])
+
+
+def compact_pages(
+    pages: List[str], doc_type: str = "unknown", budget_tokens: Optional[int] = None
+) -> dict:
+    """
+    Compact extracted pages for the model context.
+    
+    Removes page numbers and headers/footers that repeat near the edges of
+    at least half the pages (keeping their first occurrence), repeated long
+    boilerplate lines, and extra whitespace. In PYQs, repeated questions
+    are kept, since a question asked again is content. A bare number is
+    only taken for a page number when every page has one as its first or
+    last line, counting up with the pages. Table rows keep their columns
+    as ``a | b | c``. The remaining text is cut at a line boundary once it
+    reaches the token budget for the document type.
+    
+    Args:
+        pages: Text of each page, in order ("" for pages without text)
+        doc_type: Document type from :func:`classify_document`
+        budget_tokens: Token budget; defaults to the configured budget for
+            ``doc_type``
+            
+    Returns:
+        Dictionary with 'text', 'tokens_before', 'tokens_after',
+        'budget_tokens', 'lines_removed', 'pages_included' and 'truncated'
+        keys
+    """
+    budget = budget_tokens if budget_tokens is not None else _budget_for(doc_type)
+    tokens_before = estimate_tokens("\n".join(pages))
+    
+    cleaned = [
+        [line for line in (_clean_line(raw) for raw in page.splitlines()) if line]
+        for page in pages
+    ]
+    edges = _repeated_edges(cleaned)
+    numbered = _numbered_edges(cleaned)
+    keep_repeats = doc_type in _REPEATS_ARE_CONTENT
+    
+    seen_edges = set()
+    seen_lines = set()
+    kept_pages: List[List[str]] = []
+    removed = 0
+    for lines in cleaned:
+        kept = []
+        for position, line in enumerate(lines):
+            at_edge = position < _EDGE_LINES or position >= len(lines) - _EDGE_LINES
+            slot = 0 if position == 0 else -1 if position == len(lines) - 1 else None
+            if (at_edge and _PAGE_LABEL.match(line)) or (
+                slot in numbered and _BARE_NUMBER.match(line)
+            ):
+                removed += 1
+                continue
+            key = _edge_key(line)
+            if key in edges and not (keep_repeats and _QUESTION_LINE.match(line)):
+                if key in seen_edges:
+                    removed += 1
+                    continue
+                seen_edges.add(key)
+            elif not keep_repeats and len(line) >= _MIN_DEDUP_CHARS:
+                if line in seen_lines:
+                    removed += 1
+                    continue
+                seen_lines.add(line)
+            kept.append(line)
+        kept_pages.append(kept)
+    
+    budget_chars = budget * CHARS_PER_TOKEN
+    output: List[str] = []
+    used = 0
+    pages_included = 0
+    truncated = False
+    for lines in kept_pages:
+        for line in lines:
+            if used + len(line) + 1 > budget_chars:
+                truncated = True
+                break
+            output.append(line)
+            used += len(line) + 1
+        if truncated:
+            break
+        pages_included += 1
+    
+    if truncated:
+        omitted = len(kept_pages) - pages_included
+        output.append(
+            f"[... truncated to ~{budget} tokens; {omitted} of "
+            f"{len(kept_pages)} pages not fully shown]"
+        )
+    
+    text = "\n".join(output)
+    return {
+        "text": text,
+        "tokens_before": tokens_before,
+        "tokens_after": estimate_tokens(text),
+        "budget_tokens": budget,
+        "lines_removed": removed,
+        "pages_included": pages_included,
+        "truncated": truncated,
+    }
+
+
+def extract_compact_text(file_path: str) -> dict:
+    """
+    Extract a PDF's text and compact it to the budget for its document type.
+    
+    Extraction goes through :func:`~tools.pdf_tools.extract_pdf_pages`, so
+    it shares the extraction cache, process pool, OCR fallback and page
+    budgets with the other PDF tools.
+    
+    Args:
+        file_path: Path to the PDF file
+        
+    Returns:
+        Dictionary with 'document_type', 'confidence', 'page_count',
+        'pages_extracted' ('extraction_note' when a page budget stopped
+        extraction early) and the keys of :func:`compact_pages` ('text',
+        'tokens_before', 'tokens_after', ...)
+        
+    Raises:
+        FileNotFoundError: If file doesn't exist
+        ValueError: If file is invalid, too large, or has no readable text
+    """
+    extraction = extract_pdf_pages(file_path)
+    classification = classify_document(extraction.text)
+    
+    result = compact_pages(extraction.pages, classification["type"])
+    saved = result["tokens_before"] - result["tokens_after"]
+    logger.info(
+        f"Compacted {classification['type']} text from "
+        f"{result['tokens_before']} to {result['tokens_after']} tokens "
+        f"({saved} saved, truncated={result['truncated']})"
+    )
+    
+    return {
+        "document_type": classification["type"],
+        "confidence": classification["confidence"],
+        **extraction.report(),
+        **result,
+    }
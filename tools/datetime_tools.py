@@ -2,23 +2,40 @@
 Date and time utilities for Taskify Agent.
 
 This module provides timezone-aware datetime functions for study planning.
+
+"Now" is read once per agent turn: :func:`begin_turn` (called from the
+agent's before-model callback) or :func:`time_context` stores a snapshot
+taken in the student's timezone, and every date tool in that turn uses it,
+so all days-left figures and urgency levels in one reply agree.
 """
 
+import calendar
 import logging
-from datetime import datetime, timezone
-from typing import Optional
+import re
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from datetime import date, datetime, time, timezone, tzinfo
+from functools import lru_cache
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from config import Config
 
 logger = logging.getLogger(__name__)
 
 
 def get_current_datetime(format_str: Optional[str] = None) -> str:
     """
-    Get current UTC datetime with optional custom formatting.
+    Get the current date and time in the student's timezone.
+    
+    Within an agent turn this is the turn's snapshot, so repeated calls
+    agree (see :func:`current_time_context`).
     
     Args:
         format_str: Optional strftime format string. 
                    Defaults to ISO 8601 format.
-    
+                   
     Returns:
         Formatted datetime string
         
@@ -28,7 +45,7 @@ def get_current_datetime(format_str: Optional[str] = None) -> str:
         >>> get_current_datetime("%Y-%m-%d")
         '2026-01-12'
     """
-    now = datetime.now(timezone.utc)
+    now = current_time_context().now
     
     if format_str is None:
         format_str = "%Y-%m-%d %H:%M:%S"
@@ -43,10 +60,310 @@ def get_current_datetime(format_str: Optional[str] = None) -> str:
         return now.strftime("%Y-%m-%d %H:%M:%S")
 
 
+def get_timezone(name: Optional[str] = None) -> tzinfo:
+    """
+    Resolve an IANA timezone name such as "Asia/Kolkata".
+    
+    Args:
+        name: Timezone name; defaults to Config.STUDENT_TIMEZONE
+        
+    Returns:
+        The timezone
+        
+    Raises:
+        ValueError: If the name is not a known timezone
+    """
+    name = name or Config.STUDENT_TIMEZONE
+    if name.upper() == "UTC":
+        return timezone.utc
+    try:
+        return ZoneInfo(name)
+    except (ZoneInfoNotFoundError, ValueError):
+        raise ValueError(f"Unknown timezone: {name}")
+
+
+def local_to_utc(day: date, clock: str, tz: Optional[tzinfo] = None) -> datetime:
+    """
+    Convert a wall-clock time on a given day in a timezone to UTC.
+    
+    Times skipped by a daylight-saving change resolve to the instant after
+    the gap; repeated times resolve to their first occurrence.
+    
+    Args:
+        day: Local date
+        clock: Local time as HH:MM
+        tz: Timezone of ``day`` and ``clock``; defaults to the student's
+        
+    Returns:
+        Timezone-aware datetime in UTC
+    """
+    hour, minute = (int(part) for part in clock.split(":"))
+    local = datetime.combine(day, time(hour, minute), tzinfo=tz or get_timezone())
+    return local.astimezone(timezone.utc)
+
+
+@dataclass(frozen=True)
+class TimeContext:
+    """A snapshot of "now" in the student's timezone, shared by one turn."""
+    
+    now: datetime
+    # Identifies the turn the snapshot belongs to (the ADK invocation ID)
+    key: Optional[str] = None
+    
+    @property
+    def today(self) -> date:
+        return self.now.date()
+    
+    def days_until(self, target: Union[date, datetime]) -> int:
+        """
+        Count calendar days from today to ``target``.
+        
+        This is a difference of dates, not of elapsed 24-hour periods: an
+        exam tomorrow morning is 1 day away at 11 PM tonight. Naive
+        datetimes are read as wall time in the snapshot's timezone; aware
+        ones are converted to it first.
+        
+        Args:
+            target: Date or datetime
+            
+        Returns:
+            Days until ``target``, negative if it has passed
+        """
+        if isinstance(target, datetime):
+            if target.tzinfo is not None:
+                target = target.astimezone(self.now.tzinfo)
+            target = target.date()
+        return (target - self.today).days
+
+
+_time_context: ContextVar[Optional[TimeContext]] = ContextVar(
+    "taskify_time_context", default=None
+)
+
+
+def snapshot_time(
+    tz_name: Optional[str] = None, key: Optional[str] = None
+) -> TimeContext:
+    """Read the clock once in a timezone (default Config.STUDENT_TIMEZONE)."""
+    return TimeContext(now=datetime.now(get_timezone(tz_name)), key=key)
+
+
+def current_time_context() -> TimeContext:
+    """
+    Return the current turn's time snapshot.
+    
+    Outside a turn (scripts, tests) a fresh snapshot is taken per call.
+    """
+    context = _time_context.get()
+    return context if context is not None else snapshot_time()
+
+
+def begin_turn(key: str, tz_name: Optional[str] = None) -> TimeContext:
+    """
+    Take the time snapshot for an agent turn, once per turn.
+    
+    Meant for ADK callbacks, which run in the turn's task: the snapshot is
+    set in the current context and kept for the tools that follow. Calls
+    with the same ``key`` (later model calls of the same turn) reuse it.
+    
+    Args:
+        key: Turn identifier, such as the ADK invocation ID
+        tz_name: Timezone; defaults to Config.STUDENT_TIMEZONE
+        
+    Returns:
+        The turn's snapshot
+    """
+    context = _time_context.get()
+    if context is None or context.key != key:
+        context = snapshot_time(tz_name, key)
+        _time_context.set(context)
+    return context
+
+
+@contextmanager
+def time_context(tz_name: Optional[str] = None) -> Iterator[TimeContext]:
+    """
+    Use one time snapshot for everything inside the ``with`` block.
+    
+    Args:
+        tz_name: Timezone; defaults to Config.STUDENT_TIMEZONE
+        
+    Yields:
+        The snapshot
+    """
+    context = snapshot_time(tz_name)
+    token = _time_context.set(context)
+    try:
+        yield context
+    finally:
+        _time_context.reset(token)
+
+
+# Month names as strptime's %b/%B accept them (current locale, any case)
+_MONTHS = {
+    name.lower(): number
+    for names in (calendar.month_abbr, calendar.month_name)
+    for number, name in enumerate(names)
+    if name
+}
+
+# One alternation per supported layout; a single match picks the format.
+# Field widths mirror strptime: %d/%m/%H/%M/%S take 1-2 digits, %Y takes 4.
+_DATE_DISPATCH = re.compile(
+    r"(?P<iso>(?P<iso_y>\d{4})-(?P<iso_m>\d{1,2})-(?P<iso_d>\d{1,2}))"
+    r"(?:\s+(?P<iso_H>\d{1,2}):(?P<iso_M>\d{1,2}):(?P<iso_S>\d{1,2}))?$"
+    r"|(?P<slash>(?P<slash_a>\d{1,2})/(?P<slash_b>\d{1,2})/(?P<slash_y>\d{4}))$"
+    r"|(?P<dash>(?P<dash_d>\d{1,2})-(?P<dash_m>\d{1,2})-(?P<dash_y>\d{4}))$"
+    r"|(?P<named>(?P<named_mon>[^\W\d_]+)\.?\s+(?P<named_d>\d{1,2}),\s+"
+    r"(?P<named_y>\d{4}))$"
+    r"|(?P<dmy>(?P<dmy_d>\d{1,2})\s+(?P<dmy_mon>[^\W\d_]+)\.?,?\s+"
+    r"(?P<dmy_y>\d{4}))$"
+)
+
+_DATE_KINDS = ("iso", "slash", "dash", "named", "dmy")
+
+# Day-first is the default for ambiguous slash dates such as 03/04/2026
+DAY_FIRST = "%d/%m/%Y"
+MONTH_FIRST = "%m/%d/%Y"
+
+
+def _build_date(year: str, month: str, day: str) -> Optional[datetime]:
+    """Construct a date from string fields, or None if out of range."""
+    try:
+        return datetime(int(year), int(month), int(day))
+    except ValueError:
+        return None
+
+
+class DateParser:
+    """
+    Date parser that remembers the slash-date order used by a document.
+    
+    ``dd/mm/yyyy`` and ``mm/dd/yyyy`` dates are ambiguous when both numbers
+    are 12 or less. The parser tries the order that last worked first: it
+    starts day-first (``03/04/2026`` is 3 April) and switches to month-first
+    after a date that only parses that way (``12/25/2026``), so the rest of
+    that document is read consistently. Use one parser per document.
+    """
+    
+    def __init__(self, slash_order: str = DAY_FIRST):
+        """
+        Create a parser.
+        
+        Args:
+            slash_order: Order tried first for slash dates, DAY_FIRST or
+                MONTH_FIRST
+        """
+        self.slash_order = slash_order
+        self._memo: Dict[Tuple[str, str], Optional[datetime]] = {}
+    
+    def parse(self, date_str: str) -> Optional[datetime]:
+        """
+        Parse a date string in any supported format.
+        
+        Args:
+            date_str: Date string in various formats
+            
+        Returns:
+            datetime object or None if parsing fails
+        """
+        key = (date_str, self.slash_order)
+        if key in self._memo:
+            parsed = self._memo[key]
+        else:
+            parsed = self._parse(date_str.strip())
+            self._memo[key] = parsed
+        return parsed
+    
+    def _parse(self, text: str) -> Optional[datetime]:
+        match = _DATE_DISPATCH.match(text)
+        if match is None:
+            return None
+        
+        kind = next(k for k in _DATE_KINDS if match.group(k) is not None)
+        if kind == "iso":
+            parsed = _build_date(
+                match.group("iso_y"), match.group("iso_m"), match.group("iso_d")
+            )
+            if parsed is None or match.group("iso_H") is None:
+                return parsed
+            try:
+                return parsed.replace(
+                    hour=int(match.group("iso_H")),
+                    minute=int(match.group("iso_M")),
+                    second=int(match.group("iso_S")),
+                )
+            except ValueError:
+                return None
+        
+        if kind == "slash":
+            a, b, year = match.group("slash_a", "slash_b", "slash_y")
+            first, second = (b, a) if self.slash_order == DAY_FIRST else (a, b)
+            parsed = _build_date(year, first, second)
+            if parsed is None:
+                # Only the other order is valid: remember it for this document
+                parsed = _build_date(year, second, first)
+                if parsed is not None:
+                    self.slash_order = (
+                        MONTH_FIRST if self.slash_order == DAY_FIRST else DAY_FIRST
+                    )
+            return parsed
+        
+        if kind == "dash":
+            return _build_date(
+                match.group("dash_y"), match.group("dash_m"), match.group("dash_d")
+            )
+        
+        # "Jan. 15, 2026" or "15 Jan. 2026"
+        month_name, day, year = match.group(f"{kind}_mon", f"{kind}_d", f"{kind}_y")
+        month = _MONTHS.get(month_name.lower())
+        if month is None:
+            return None
+        return _build_date(year, str(month), day)
+
+
+def infer_slash_order(date_strs: List[str]) -> str:
+    """
+    Infer whether a document writes slash dates day-first or month-first.
+    
+    Only unambiguous dates vote: ``25/12/2026`` can only be day-first and
+    ``12/25/2026`` only month-first. Ties (including no evidence) resolve
+    to day-first.
+    
+    Args:
+        date_strs: Date strings from one document
+        
+    Returns:
+        DAY_FIRST or MONTH_FIRST
+    """
+    day_first = month_first = 0
+    for date_str in date_strs:
+        match = _DATE_DISPATCH.match(date_str.strip())
+        if match is None or match.group("slash") is None:
+            continue
+        a, b = int(match.group("slash_a")), int(match.group("slash_b"))
+        if a > 12 >= b:
+            day_first += 1
+        elif b > 12 >= a:
+            month_first += 1
+    return MONTH_FIRST if month_first > day_first else DAY_FIRST
+
+
+@lru_cache(maxsize=4096)
+def _parse_date_cached(date_str: str) -> Optional[datetime]:
+    return DateParser()._parse(date_str.strip())
+
+
 def parse_date(date_str: str) -> Optional[datetime]:
     """
     Parse various date string formats into datetime object.
     
+    The format is chosen by a single precompiled regex match rather than
+    trying each strptime format in turn, and results are memoized.
+    Ambiguous slash dates are read day-first (``03/04/2026`` is 3 April);
+    use :class:`DateParser` or :func:`parse_dates` to follow a document's
+    own order.
+    
     Args:
         date_str: Date string in various formats
         
@@ -57,31 +374,44 @@ def parse_date(date_str: str) -> Optional[datetime]:
         Supports formats like:
         - "2026-01-15"
         - "15/01/2026"
-        - "Jan 15, 2026"
-    """
-    formats = [
-        "%Y-%m-%d",
-        "%d/%m/%Y",
-        "%m/%d/%Y",
-        "%d-%m-%Y",
-        "%b %d, %Y",
-        "%B %d, %Y",
-        "%Y-%m-%d %H:%M:%S",
-    ]
+        - "Jan 15, 2026" or "Jan. 15, 2026"
+        - "15 Jan 2026" or "15 Jan. 2026"
+    """
+    parsed = _parse_date_cached(date_str)
+    if parsed is None:
+        logger.warning(f"Could not parse date: {date_str}")
+    return parsed
+
+
+def parse_dates(date_strs: List[str]) -> List[Optional[datetime]]:
+    """
+    Parse a batch of date strings from one document.
     
-    for fmt in formats:
-        try:
-            return datetime.strptime(date_str.strip(), fmt)
-        except ValueError:
-            continue
+    The slash-date order is inferred from the batch's unambiguous dates
+    before parsing (see :func:`infer_slash_order`), so ``03/04/2026`` in a
+    batch that also contains ``12/25/2026`` is read as 4 March.
+    
+    Args:
+        date_strs: Date strings, e.g. every date cell of a timetable
+        
+    Returns:
+        Parsed datetimes (None where parsing fails), in input order
+    """
+    parser = DateParser(slash_order=infer_slash_order(date_strs))
+    results = [parser.parse(date_str) for date_str in date_strs]
     
-    logger.warning(f"Could not parse date: {date_str}")
-    return None
+    failed = sum(1 for parsed in results if parsed is None)
+    if failed:
+        logger.warning(f"Could not parse {failed} of {len(date_strs)} dates")
+    return results
 
 
 def calculate_days_until(target_date: str) -> Optional[int]:
     """
-    Calculate number of days from now until target date.
+    Calculate number of calendar days from today until target date.
+    
+    Today is taken from the turn's time snapshot in the student's timezone
+    (see :meth:`TimeContext.days_until`).
     
     Args:
         target_date: Target date string
@@ -94,8 +424,28 @@ def calculate_days_until(target_date: str) -> Optional[int]:
     if parsed is None:
         return None
     
-    now = datetime.now(timezone.utc).replace(tzinfo=None)
-    delta = (parsed - now).days
+    delta = current_time_context().days_until(parsed)
     
     logger.debug(f"Days until {target_date}: {delta}")
     return delta
+
+
+def days_until(target_dates: List[str]) -> List[Optional[int]]:
+    """
+    Calculate days until many dates from one document against one "today".
+    
+    Dates are parsed as a batch with :func:`parse_dates` (so the document's
+    slash-date order is respected) and compared with a single time
+    snapshot, so every result uses the same day boundary.
+    
+    Args:
+        target_dates: Date strings, e.g. every exam date of a timetable
+        
+    Returns:
+        Days until each date (None where parsing fails), in input order
+    """
+    context = current_time_context()
+    return [
+        None if parsed is None else context.days_until(parsed)
+        for parsed in parse_dates(target_dates)
+    ]
@@ -0,0 +1,471 @@
+"""
+Session document store for Taskify Agent.
+
+This module gives each opened PDF a short document ID so the agent can
+fetch pages, sections or search hits on demand instead of pulling the full
+text into the conversation again on every turn. Handles live in the ADK
+session state; page text lives in a bounded in-process cache and is
+re-extracted from the file if another worker or an eviction lost it.
+"""
+
+import hashlib
+import logging
+import os
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+
+from config import Config
+from tools.compaction import compact_pages, estimate_tokens
+from tools.pdf_tools import classify_document, iter_pdf_pages
+
+if TYPE_CHECKING:
+    from google.adk.tools import ToolContext
+
+logger = logging.getLogger(__name__)
+
+# Session state key holding {doc_id: handle} for the session's documents
+STATE_KEY = "taskify:documents"
+
+# Section titles returned with a handle; the rest are still searchable
+_MAX_LISTED_SECTIONS = 30
+
+_MAX_SNIPPET_CHARS = 300
+
+# "Unit 2: Integral Calculus", "Module III", "Chapter 4", "Part B"
+_NAMED_HEADING = re.compile(
+    r"^(unit|module|chapter|section|part)\s*[-–:.]?\s*([ivx]+|\d+|[a-d])\b",
+    re.IGNORECASE,
+)
+
+# Short all-caps lines such as "COURSE OBJECTIVES" or "SECTION A"
+_CAPS_HEADING = re.compile(r"^[A-Z][A-Z0-9 &,:/()'-]{3,59}$")
+
+_QUERY_WORD = re.compile(r"\w{2,}")
+
+
+@dataclass
+class _Document:
+    """Extracted pages of one document and its section outline."""
+    
+    pages: List[str]
+    # (title, page index, line index) for each detected heading
+    sections: List[Tuple[str, int, int]]
+
+
+def _find_sections(pages: List[str]) -> List[Tuple[str, int, int]]:
+    """Detect unit/chapter headings and all-caps titles in page order."""
+    sections = []
+    seen = set()
+    for page_index, page in enumerate(pages):
+        for line_index, raw in enumerate(page.splitlines()):
+            line = " ".join(raw.split())
+            if not line or len(line) > 80:
+                continue
+            if _NAMED_HEADING.match(line) or (
+                _CAPS_HEADING.match(line) and sum(c.isalpha() for c in line) >= 4
+            ):
+                # Running headers repeat on every page; keep the first one
+                if line.lower() in seen:
+                    continue
+                seen.add(line.lower())
+                sections.append((line, page_index, line_index))
+    return sections
+
+
+class DocumentStore:
+    """
+    Bounded in-process cache of extracted documents, keyed by content hash.
+    
+    Several sessions opening the same file share one entry. Least recently
+    used entries are dropped beyond ``max_documents``; a dropped document
+    is re-extracted from its file the next time it is needed.
+    """
+    
+    def __init__(self, max_documents: int):
+        """
+        Create an empty store.
+        
+        Args:
+            max_documents: Maximum number of documents kept in memory
+        """
+        self.max_documents = max_documents
+        self._documents: "OrderedDict[str, _Document]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def load(self, file_path: str) -> Tuple[str, _Document]:
+        """
+        Extract a file and add it to the store.
+        
+        Args:
+            file_path: Path to the PDF file
+            
+        Returns:
+            Content hash and the stored document
+        """
+        # Blank and scanned pages stay as "" so page numbers match the PDF
+        pages = list(iter_pdf_pages(file_path, include_empty=True))
+        content_hash = hashlib.sha256("\f".join(pages).encode("utf-8")).hexdigest()
+        document = _Document(pages=pages, sections=_find_sections(pages))
+        with self._lock:
+            self._documents[content_hash] = document
+            self._documents.move_to_end(content_hash)
+            while len(self._documents) > self.max_documents:
+                self._documents.popitem(last=False)
+        return content_hash, document
+    
+    def get(self, handle: dict) -> _Document:
+        """
+        Return the document for a session handle, reloading it if needed.
+        
+        Args:
+            handle: Handle stored in the session state
+            
+        Returns:
+            The stored document
+            
+        Raises:
+            ValueError: If the document is gone and its file changed or
+                disappeared
+        """
+        content_hash = handle["content_hash"]
+        with self._lock:
+            document = self._documents.get(content_hash)
+            if document is not None:
+                self._documents.move_to_end(content_hash)
+                return document
+        
+        logger.info(f"Reloading {handle['file_name']} into the document store")
+        try:
+            reloaded_hash, document = self.load(handle["file_path"])
+        except FileNotFoundError:
+            raise ValueError(
+                f"{handle['file_name']} is no longer available; upload it again"
+            )
+        if reloaded_hash != content_hash:
+            raise ValueError(
+                f"{handle['file_name']} changed since it was opened; "
+                f"open it again"
+            )
+        return document
+
+
+_store: Optional[DocumentStore] = None
+_store_lock = threading.Lock()
+
+
+def get_document_store() -> DocumentStore:
+    """
+    Return the process-wide document store, creating it on first use.
+    
+    Returns:
+        The shared DocumentStore
+    """
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = DocumentStore(max_documents=Config.DOCUMENT_STORE_MAX_DOCS)
+        return _store
+
+
+def _session_documents(tool_context: "ToolContext") -> Dict[str, dict]:
+    return dict(tool_context.state.get(STATE_KEY) or {})
+
+
+def _handle(doc_id: str, tool_context: "ToolContext") -> dict:
+    handle = _session_documents(tool_context).get(doc_id)
+    if handle is None:
+        raise ValueError(
+            f"Unknown document ID: {doc_id} (call open_document first)"
+        )
+    return handle
+
+
+def _page_range(
+    document: _Document, start_page: int, end_page: Optional[int]
+) -> Tuple[int, int]:
+    """Validate a 1-based inclusive page range."""
+    page_count = len(document.pages)
+    end_page = page_count if end_page is None else min(end_page, page_count)
+    if start_page < 1 or start_page > end_page:
+        raise ValueError(
+            f"Invalid page range {start_page}-{end_page} "
+            f"(document has {page_count} pages)"
+        )
+    return start_page, end_page
+
+
+def _describe(doc_id: str, handle: dict, document: _Document) -> dict:
+    """Build the compact summary returned when a document is opened."""
+    preview = compact_pages(
+        document.pages[:2],
+        handle["document_type"],
+        budget_tokens=Config.DOCUMENT_PREVIEW_TOKENS,
+    )
+    return {
+        "doc_id": doc_id,
+        "file_name": handle["file_name"],
+        "document_type": handle["document_type"],
+        "confidence": handle["confidence"],
+        "page_count": len(document.pages),
+        "tokens": handle["tokens"],
+        "sections": [
+            {"title": title, "page": page + 1}
+            for title, page, _ in document.sections[:_MAX_LISTED_SECTIONS]
+        ],
+        "preview": preview["text"],
+    }
+
+
+def open_document(file_path: str, tool_context: "ToolContext") -> dict:
+    """
+    Open a PDF for this session and return a short handle instead of its text.
+    
+    Opening a file that is already open in the session (and unchanged)
+    returns the existing handle without extracting it again.
+    
+    Args:
+        file_path: Path to the PDF file
+        tool_context: ADK tool context (injected)
+        
+    Returns:
+        Dictionary with 'doc_id', 'file_name', 'document_type',
+        'confidence', 'page_count', 'tokens' (full text estimate),
+        'sections' (title and page), 'preview' and 'already_open' keys
+        
+    Raises:
+        FileNotFoundError: If file doesn't exist
+        ValueError: If file is invalid, too large, or has no readable text
+    """
+    store = get_document_store()
+    resolved = str(Path(file_path).resolve())
+    try:
+        stat = os.stat(resolved)
+    except OSError:
+        raise FileNotFoundError(f"PDF file not found: {file_path}")
+    
+    documents = _session_documents(tool_context)
+    for doc_id, handle in documents.items():
+        if (
+            handle["file_path"] == resolved
+            and handle["file_size"] == stat.st_size
+            and handle["mtime"] == stat.st_mtime
+        ):
+            result = _describe(doc_id, handle, store.get(handle))
+            result["already_open"] = True
+            return result
+    
+    content_hash, document = store.load(resolved)
+    classification = classify_document("\n".join(document.pages))
+    doc_id = f"doc_{content_hash[:8]}"
+    handle = {
+        "file_path": resolved,
+        "file_name": Path(resolved).name,
+        "file_size": stat.st_size,
+        "mtime": stat.st_mtime,
+        "content_hash": content_hash,
+        "document_type": classification["type"],
+        "confidence": classification["confidence"],
+        "tokens": estimate_tokens("\n".join(document.pages)),
+    }
+    documents[doc_id] = handle
+    # Reassign so the session records the change
+    tool_context.state[STATE_KEY] = documents
+    
+    logger.info(
+        f"Opened {handle['file_name']} as {doc_id} "
+        f"({len(document.pages)} pages, {len(document.sections)} sections)"
+    )
+    result = _describe(doc_id, handle, document)
+    result["already_open"] = False
+    return result
+
+
+def list_documents(tool_context: "ToolContext") -> List[dict]:
+    """
+    List the documents opened in this session.
+    
+    Args:
+        tool_context: ADK tool context (injected)
+        
+    Returns:
+        One entry per document with 'doc_id', 'file_name', 'document_type'
+        and 'tokens' keys
+    """
+    return [
+        {
+            "doc_id": doc_id,
+            "file_name": handle["file_name"],
+            "document_type": handle["document_type"],
+            "tokens": handle["tokens"],
+        }
+        for doc_id, handle in _session_documents(tool_context).items()
+    ]
+
+
+def get_document_pages(
+    doc_id: str,
+    start_page: int,
+    tool_context: "ToolContext",
+    end_page: Optional[int] = None,
+) -> dict:
+    """
+    Fetch compacted text for a range of pages of an open document.
+    
+    Args:
+        doc_id: Document ID from :func:`open_document`
+        start_page: First page (1-based)
+        tool_context: ADK tool context (injected)
+        end_page: Last page (inclusive); defaults to the last page
+        
+    Returns:
+        Dictionary with 'doc_id', 'start_page', 'end_page', 'text',
+        'tokens' and 'truncated' keys
+        
+    Raises:
+        ValueError: If the document ID or page range is invalid
+    """
+    handle = _handle(doc_id, tool_context)
+    document = get_document_store().get(handle)
+    start_page, end_page = _page_range(document, start_page, end_page)
+    
+    compacted = compact_pages(
+        document.pages[start_page - 1:end_page], handle["document_type"]
+    )
+    return {
+        "doc_id": doc_id,
+        "start_page": start_page,
+        "end_page": end_page,
+        "text": compacted["text"],
+        "tokens": compacted["tokens_after"],
+        "truncated": compacted["truncated"],
+    }
+
+
+def get_document_section(
+    doc_id: str, section: str, tool_context: "ToolContext"
+) -> dict:
+    """
+    Fetch the text of one section (e.g. "Unit 3") of an open document.
+    
+    The section runs from its heading to the next detected heading.
+    
+    Args:
+        doc_id: Document ID from :func:`open_document`
+        section: Section title or a distinctive part of it
+        tool_context: ADK tool context (injected)
+        
+    Returns:
+        Dictionary with 'doc_id', 'section', 'start_page', 'end_page',
+        'text' and 'truncated' keys. If no heading matches, 'section' is
+        None and 'sections' lists the available titles.
+        
+    Raises:
+        ValueError: If the document ID is invalid
+    """
+    handle = _handle(doc_id, tool_context)
+    document = get_document_store().get(handle)
+    
+    wanted = " ".join(section.lower().split())
+    match = next(
+        (
+            index
+            for index, (title, _, _) in enumerate(document.sections)
+            if wanted in title.lower()
+        ),
+        None,
+    )
+    if match is None:
+        return {
+            "doc_id": doc_id,
+            "section": None,
+            "message": f"No section matching '{section}'",
+            "sections": [title for title, _, _ in document.sections],
+        }
+    
+    title, first_page, first_line = document.sections[match]
+    # None reads to the end of the last page
+    last_line: Optional[int]
+    if match + 1 < len(document.sections):
+        _, last_page, last_line = document.sections[match + 1]
+        if last_line == 0 and last_page > first_page:
+            # The next heading opens its page; stop at the previous page
+            last_page, last_line = last_page - 1, None
+    else:
+        last_page, last_line = len(document.pages) - 1, None
+    
+    pages = []
+    for page_index in range(first_page, last_page + 1):
+        lines = document.pages[page_index].splitlines()
+        start = first_line if page_index == first_page else 0
+        end = last_line if page_index == last_page else None
+        pages.append("\n".join(lines[start:end]))
+    
+    compacted = compact_pages(pages, handle["document_type"])
+    return {
+        "doc_id": doc_id,
+        "section": title,
+        "start_page": first_page + 1,
+        "end_page": last_page + 1,
+        "text": compacted["text"],
+        "truncated": compacted["truncated"],
+    }
+
+
+def search_document(
+    doc_id: str, query: str, tool_context: "ToolContext", max_results: int = 5
+) -> dict:
+    """
+    Find the lines of an open document that best match a query.
+    
+    Lines are ranked by how many distinct query words they contain, with
+    exact phrase matches first; each hit includes its neighbouring lines.
+    
+    Args:
+        doc_id: Document ID from :func:`open_document`
+        query: Words or phrase to look for
+        tool_context: ADK tool context (injected)
+        max_results: Maximum number of hits to return
+        
+    Returns:
+        Dictionary with 'doc_id', 'query' and 'hits' (each with 'page',
+        'score' and 'snippet') keys
+        
+    Raises:
+        ValueError: If the document ID is invalid or the query is empty
+    """
+    handle = _handle(doc_id, tool_context)
+    document = get_document_store().get(handle)
+    
+    words = {word.lower() for word in _QUERY_WORD.findall(query)}
+    if not words:
+        raise ValueError("Search query has no words")
+    phrase = " ".join(query.lower().split())
+    
+    scored = []
+    for page_index, page in enumerate(document.pages):
+        lines = page.splitlines()
+        for line_index, line in enumerate(lines):
+            lowered = line.lower()
+            score = sum(1 for word in words if word in lowered)
+            if not score:
+                continue
+            if len(words) > 1 and phrase in " ".join(lowered.split()):
+                score += len(words)
+            scored.append((-score, page_index, line_index, lines))
+    
+    scored.sort(key=lambda item: item[:3])
+    hits = []
+    for neg_score, page_index, line_index, lines in scored[:max_results]:
+        context = lines[max(line_index - 1, 0):line_index + 2]
+        snippet = " ".join(" ".join(line.split()) for line in context)
+        hits.append({
+            "page": page_index + 1,
+            "score": -neg_score,
+            "snippet": snippet[:_MAX_SNIPPET_CHARS],
+        })
+    
+    return {"doc_id": doc_id, "query": query, "hits": hits}
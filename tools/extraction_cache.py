@@ -0,0 +1,227 @@
+"""
+Persistent extraction cache for Taskify Agent.
+
+This module stores extracted PDF text on disk, keyed by the SHA-256 of the
+file content plus the extraction settings, so repeated uploads of the same
+document skip PDF parsing entirely.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+from pathlib import Path
+from typing import Optional
+
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+_CACHE_SUFFIX = ".json"
+
+
+class ExtractionCache:
+    """
+    On-disk, size-bounded cache of extracted PDF text with LRU eviction.
+    
+    Each entry is a small JSON file named after its cache key. Recency is
+    tracked through file modification times, so the cache survives restarts
+    and can be shared by several agent processes on the same host.
+    """
+    
+    def __init__(self, cache_dir: Path, max_bytes: int):
+        """
+        Create a cache rooted at ``cache_dir``.
+        
+        Args:
+            cache_dir: Directory holding cache entries (created if missing)
+            max_bytes: Maximum total size of all entries before eviction
+        """
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._bytes_saved = 0
+        self._seconds_saved = 0.0
+        self._evictions = 0
+        
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+    
+    @staticmethod
+    def make_key(content_hash: str, max_pages: int, variant: str = "") -> str:
+        """
+        Build a cache key from the document hash and extraction settings.
+        
+        Args:
+            content_hash: Hex SHA-256 digest of the PDF bytes
+            max_pages: Page limit the text was extracted with
+            variant: Other settings that change the text (e.g. OCR), if any
+            
+        Returns:
+            Hex digest identifying the cache entry
+        """
+        raw = f"{content_hash}:max_pages={max_pages}"
+        if variant:
+            raw += f":{variant}"
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+    
+    def _entry_path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}{_CACHE_SUFFIX}"
+    
+    def get(self, key: str, pdf_bytes: int = 0) -> Optional[str]:
+        """
+        Look up extracted text for a cache key.
+        
+        Args:
+            key: Cache key from :meth:`make_key`
+            pdf_bytes: Size of the source PDF, counted as saved on a hit
+            
+        Returns:
+            Cached text, or None on a miss
+        """
+        path = self._entry_path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+            # Refresh recency for LRU eviction
+            os.utime(path, None)
+        except FileNotFoundError:
+            with self._lock:
+                self._misses += 1
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Discarding unreadable cache entry {path.name}: {e}")
+            path.unlink(missing_ok=True)
+            with self._lock:
+                self._misses += 1
+            return None
+        
+        with self._lock:
+            self._hits += 1
+            self._bytes_saved += pdf_bytes
+            self._seconds_saved += float(entry.get("extract_seconds", 0.0))
+        return entry["text"]
+    
+    def put(self, key: str, text: str, extract_seconds: float = 0.0) -> None:
+        """
+        Store extracted text and evict least recently used entries.
+        
+        Args:
+            key: Cache key from :meth:`make_key`
+            text: Extracted document text
+            extract_seconds: Time the extraction took, reported on later hits
+        """
+        entry = {"text": text, "extract_seconds": round(extract_seconds, 4)}
+        try:
+            # Write atomically so concurrent readers never see partial entries
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(entry, f, ensure_ascii=False)
+            os.replace(tmp_path, self._entry_path(key))
+        except OSError as e:
+            logger.warning(f"Failed to write extraction cache entry: {e}")
+            return
+        
+        self._evict()
+    
+    def _evict(self) -> None:
+        """Remove least recently used entries until under the size limit."""
+        entries = []
+        total = 0
+        for path in self.cache_dir.glob(f"*{_CACHE_SUFFIX}"):
+            try:
+                st = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((st.st_mtime, st.st_size, path))
+            total += st.st_size
+        
+        if total <= self.max_bytes:
+            return
+        
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+            with self._lock:
+                self._evictions += 1
+            logger.debug(f"Evicted extraction cache entry {path.name}")
+    
+    def size_bytes(self) -> int:
+        """Return the total size of all cache entries on disk."""
+        total = 0
+        for path in self.cache_dir.glob(f"*{_CACHE_SUFFIX}"):
+            try:
+                total += path.stat().st_size
+            except FileNotFoundError:
+                continue
+        return total
+    
+    def stats(self) -> dict:
+        """
+        Return cache effectiveness counters.
+        
+        Returns:
+            Dictionary with hits, misses, hit rate, PDF bytes and extraction
+            seconds saved, evictions and current on-disk size
+        """
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": round(self._hits / lookups, 4) if lookups else 0.0,
+                "bytes_saved": self._bytes_saved,
+                "extract_seconds_saved": round(self._seconds_saved, 4),
+                "evictions": self._evictions,
+                "size_bytes": self.size_bytes(),
+                "max_bytes": self.max_bytes,
+            }
+
+
+_cache: Optional[ExtractionCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_extraction_cache() -> Optional[ExtractionCache]:
+    """
+    Return the process-wide extraction cache, creating it on first use.
+    
+    Returns:
+        The shared ExtractionCache, or None if caching is disabled
+    """
+    global _cache
+    if not Config.PDF_CACHE_ENABLED:
+        return None
+    
+    with _cache_lock:
+        if _cache is None:
+            cache_dir = Path(Config.PDF_CACHE_DIR)
+            if not cache_dir.is_absolute():
+                cache_dir = Config.get_project_root() / cache_dir
+            _cache = ExtractionCache(
+                cache_dir, max_bytes=Config.PDF_CACHE_MAX_MB * 1024 * 1024
+            )
+            logger.info(f"Extraction cache enabled at {cache_dir}")
+        return _cache
+
+
+def hash_buffer(buffer) -> str:
+    """
+    Compute the SHA-256 digest of a bytes-like object or memory map.
+    
+    The buffer is hashed in place through the buffer protocol, so mapped
+    files are never copied into Python bytes.
+    
+    Args:
+        buffer: Any object supporting the buffer protocol
+        
+    Returns:
+        Hex digest string
+    """
+    return hashlib.sha256(buffer).hexdigest()
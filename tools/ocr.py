@@ -0,0 +1,218 @@
+"""
+OCR fallback for scanned PDFs.
+
+Pages whose text layer comes back empty (scanned timetables and PYQ
+papers) are read with Tesseract instead. Scanned pages are embedded
+images, so the images are taken from the PDF as stored rather than
+rendered. Recognition runs on a small process pool, so a slow scan never
+holds the agent worker's threads, with a per-page timeout enforced both by
+Tesseract and by a deadline the caller sets when each image is submitted.
+Results are cached by the SHA-256 of each page image, so a page scanned
+into several bundles is recognized once.
+
+OCR is optional: it needs ``pytesseract`` and ``Pillow`` plus the
+``tesseract`` binary, and is only used with ENABLE_OCR=true.
+"""
+
+import hashlib
+import io
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import TYPE_CHECKING, Deque, Dict, List, Optional, Set, Tuple
+
+from config import Config
+from tools.extraction_cache import get_extraction_cache
+
+if TYPE_CHECKING:
+    from concurrent.futures import Future, ProcessPoolExecutor
+    from pypdf import PdfReader
+
+logger = logging.getLogger(__name__)
+
+# Extra seconds the caller waits beyond Tesseract's own timeout
+_TIMEOUT_GRACE_SECONDS = 5
+
+_pool: Optional["ProcessPoolExecutor"] = None
+_pool_lock = threading.Lock()
+_available: Optional[bool] = None
+
+
+def ocr_available() -> bool:
+    """Return whether pytesseract, Pillow and the tesseract binary are usable."""
+    global _available
+    if _available is None:
+        try:
+            import pytesseract
+            import PIL  # noqa: F401
+            
+            version = pytesseract.get_tesseract_version()
+            logger.info(f"OCR fallback available (Tesseract {version})")
+            _available = True
+        except Exception as e:
+            logger.warning(
+                f"ENABLE_OCR is set but OCR is unavailable ({e}); install "
+                f"pytesseract, Pillow and the tesseract binary"
+            )
+            _available = False
+    return _available
+
+
+def enabled() -> bool:
+    """Return whether empty pages should be OCRed."""
+    return Config.ENABLE_OCR and ocr_available()
+
+
+def settings_tag() -> str:
+    """Describe the OCR settings for extraction cache keys ('' when off)."""
+    return f"ocr={Config.OCR_LANGUAGE}" if enabled() else ""
+
+
+def _get_pool() -> "ProcessPoolExecutor":
+    """Return the shared OCR pool, creating it on first use."""
+    global _pool
+    from concurrent.futures import ProcessPoolExecutor
+    
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers=Config.OCR_WORKERS)
+            logger.info(f"Started OCR pool with {Config.OCR_WORKERS} workers")
+        return _pool
+
+
+def _reset_pool() -> None:
+    """Drop a broken pool so the next call starts a fresh one."""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
+
+
+def _recognize(data: bytes, language: str, timeout: float) -> str:
+    """Recognize the text of one encoded image (runs in a pool worker)."""
+    import pytesseract
+    from PIL import Image
+    
+    with Image.open(io.BytesIO(data)) as image:
+        try:
+            return pytesseract.image_to_string(
+                image, lang=language, timeout=timeout
+            )
+        except RuntimeError as e:
+            # pytesseract reports its own timeout as a RuntimeError
+            if "timeout" in str(e).lower():
+                raise TimeoutError(str(e)) from None
+            raise
+
+
+def _cache_key(image_hash: str) -> str:
+    raw = f"ocr:{image_hash}:lang={Config.OCR_LANGUAGE}"
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def _page_images(reader: "PdfReader", index: int) -> List[bytes]:
+    """Encoded images embedded in a page, or [] if they cannot be read."""
+    try:
+        return [image.data for image in reader.pages[index].images]
+    except Exception as e:
+        logger.warning(f"Could not read images on page {index + 1}: {e}")
+        return []
+
+
+def ocr_pages(reader: "PdfReader", page_indices: List[int]) -> Dict[int, str]:
+    """
+    Recognize the text of pages that have no text layer.
+    
+    At most Config.OCR_MAX_PAGES pages are processed per call and at most
+    Config.OCR_WORKERS images are in flight at once, so memory stays bounded
+    on large scanned bundles. Each image must finish within
+    Config.OCR_PAGE_TIMEOUT_SECONDS (plus a short grace) of being submitted,
+    however long it waited to be collected. A page whose recognition fails
+    or times out is skipped with a warning.
+    
+    Args:
+        reader: Open PDF reader
+        page_indices: Zero-based indices of the pages to recognize
+        
+    Returns:
+        Recognized text by page index, for pages where any text was found
+    """
+    if len(page_indices) > Config.OCR_MAX_PAGES:
+        logger.warning(
+            f"OCR limited to {Config.OCR_MAX_PAGES} of {len(page_indices)} "
+            f"pages without text (OCR_MAX_PAGES)"
+        )
+        page_indices = page_indices[:Config.OCR_MAX_PAGES]
+    
+    started = time.perf_counter()
+    cache = get_extraction_cache()
+    timeout = Config.OCR_PAGE_TIMEOUT_SECONDS
+    texts: Dict[int, List[str]] = {}
+    # (page index, cache key, submit time, deadline, future)
+    pending: Deque[Tuple[int, str, float, float, "Future"]] = deque()
+    recognized = cached = failed = 0
+    timed_out: Set[int] = set()
+    
+    def collect() -> None:
+        nonlocal recognized, failed
+        index, key, submitted, deadline, future = pending.popleft()
+        try:
+            text = future.result(timeout=max(0.0, deadline - time.perf_counter()))
+        except FutureTimeoutError:
+            # Raised both for a missed deadline and by Tesseract's own timeout
+            future.cancel()
+            timed_out.add(index)
+            logger.warning(f"OCR timed out on page {index + 1}")
+            return
+        except Exception as e:
+            failed += 1
+            logger.warning(f"OCR failed on page {index + 1}: {e}")
+            return
+        recognized += 1
+        if cache is not None:
+            cache.put(key, text, time.perf_counter() - submitted)
+        texts.setdefault(index, []).append(text)
+    
+    try:
+        for index in page_indices:
+            for data in _page_images(reader, index):
+                key = _cache_key(hashlib.sha256(data).hexdigest())
+                hit = cache.get(key, pdf_bytes=len(data)) if cache else None
+                if hit is not None:
+                    cached += 1
+                    texts.setdefault(index, []).append(hit)
+                    continue
+                if len(pending) >= Config.OCR_WORKERS:
+                    collect()
+                submitted = time.perf_counter()
+                pending.append((
+                    index,
+                    key,
+                    submitted,
+                    submitted + timeout + _TIMEOUT_GRACE_SECONDS,
+                    _get_pool().submit(
+                        _recognize, data, Config.OCR_LANGUAGE, timeout
+                    ),
+                ))
+        while pending:
+            collect()
+    except Exception as e:
+        # A crashed worker breaks the pool; start a fresh one next time
+        logger.error(f"OCR pool failed: {e}")
+        _reset_pool()
+    
+    results = {
+        index: "\n".join(part for part in parts if part.strip())
+        for index, parts in sorted(texts.items())
+    }
+    results = {index: text for index, text in results.items() if text.strip()}
+    logger.info(
+        f"OCR read {len(results)} of {len(page_indices)} pages "
+        f"({recognized} images recognized, {cached} cached, {failed} failed, "
+        f"{len(timed_out)} pages timed out) "
+        f"in {time.perf_counter() - started:.2f}s"
+    )
+    return results
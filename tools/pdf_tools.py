@@ -4,96 +4,384 @@ PDF processing tools for Taskify Agent.
 This module provides secure PDF text extraction with validation and error handling.
 """
 
+import io
+import itertools
+import json
 import logging
+import math
+import mmap
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Optional
-from pypdf import PdfReader
+from typing import (
+    TYPE_CHECKING,
+    Any, BinaryIO, Dict, FrozenSet, Generator, Iterable, Iterator, List, Optional,
+    Set, Tuple, Union, cast,
+)
 
 from config import Config
+from tools import ocr, telemetry
+from tools.extraction_cache import ExtractionCache, get_extraction_cache, hash_buffer
+
+# pypdf and the process pool machinery are imported on first use so that
+# importing the tools (agent cold start) does not pay for them
+if TYPE_CHECKING:
+    from concurrent.futures import ProcessPoolExecutor
+    from pypdf import PdfReader
 
 logger = logging.getLogger(__name__)
 
+# (page index, extracted text, error message) for a single page
+PageResult = Tuple[int, Optional[str], Optional[str]]
 
-def extract_pdf_text(file_path: str) -> str:
+# Raw buffers accepted for in-memory uploads
+BufferLike = Union[bytes, bytearray, memoryview]
+
+# PDF header must appear within the first 1024 bytes (PDF 1.7, Annex H)
+_PDF_MAGIC = b"%PDF-"
+_PDF_HEADER_WINDOW = 1024
+
+# Stored alongside the settings in extraction cache keys; bump when the
+# cached entry layout changes
+_CACHE_FORMAT = "pages"
+
+_page_pool: Optional["ProcessPoolExecutor"] = None
+_page_pool_lock = threading.Lock()
+
+
+def _get_page_pool(workers: int) -> "ProcessPoolExecutor":
+    """Return the shared page extraction pool, creating it on first use."""
+    global _page_pool
+    from concurrent.futures import ProcessPoolExecutor
+    
+    with _page_pool_lock:
+        if _page_pool is None:
+            _page_pool = ProcessPoolExecutor(max_workers=workers)
+            logger.info(f"Started PDF page extraction pool with {workers} workers")
+        return _page_pool
+
+
+def _extract_page_range(
+    source: Union["PdfReader", str], start: int, end: int
+) -> List[PageResult]:
     """
-    Extract text from a PDF file with security validations.
+    Extract text from pages ``start`` to ``end`` (exclusive).
+    
+    Per-page failures are captured rather than raised so that one bad page
+    never discards the rest of the document.
     
     Args:
-        file_path: Path to the PDF file
+        source: Open PdfReader, or a file path to open (in pool workers)
+        start: Index of the first page
+        end: Index one past the last page
         
     Returns:
-        Extracted text from all pages
-        
-    Raises:
-        FileNotFoundError: If file doesn't exist
-        ValueError: If file is invalid or too large
-        Exception: For other PDF processing errors
+        List of (page index, text, error message) tuples in page order
     """
-    try:
-        # Convert to Path object for better path handling
-        pdf_path = Path(file_path).resolve()
+    if isinstance(source, str):
+        from pypdf import PdfReader
         
-        # Security: Prevent path traversal
-        project_root = Config.get_project_root()
+        with open(source, "rb") as f, mmap.mmap(
+            f.fileno(), 0, access=mmap.ACCESS_READ
+        ) as mapped:
+            return _extract_page_range(PdfReader(_as_stream(mapped)), start, end)
+    
+    timed = telemetry.enabled()
+    results: List[PageResult] = []
+    for i in range(start, end):
+        started = time.perf_counter() if timed else 0.0
         try:
-            pdf_path.relative_to(project_root)
-        except ValueError:
-            # File is outside project directory - allow but log warning
-            logger.warning(f"Accessing file outside project: {pdf_path}")
-        
-        # Validation: Check file exists
-        if not pdf_path.exists():
-            raise FileNotFoundError(f"PDF file not found: {file_path}")
+            results.append((i, source.pages[i].extract_text(), None))
+        except Exception as e:
+            results.append((i, None, str(e)))
+        if timed:
+            telemetry.observe_page(time.perf_counter() - started)
+    return results
+
+
+def _as_stream(mapped: mmap.mmap) -> BinaryIO:
+    """
+    Present a memory map as the binary stream PdfReader expects.
+    
+    An mmap has the read/seek/tell methods pypdf uses but is not typed as
+    an IO, so it is narrowed here instead of being copied into a BytesIO.
+    """
+    return cast(BinaryIO, mapped)
+
+
+def _extract_pages_parallel(
+    pdf_path: Path, first_page: int, end_page: int, workers: int
+) -> List[PageResult]:
+    """
+    Extract pages across the process pool, preserving page order.
+    
+    The page range is split into contiguous chunks (two per worker, to even
+    out pages of uneven cost); each worker opens the PDF independently.
+    
+    Args:
+        pdf_path: Path to the validated PDF file
+        first_page: Index of the first page to extract
+        end_page: Index one past the last page to extract
+        workers: Pool size
         
-        # Validation: Check file extension
-        if pdf_path.suffix.lower() not in Config.ALLOWED_FILE_EXTENSIONS:
-            raise ValueError(
-                f"Invalid file type: {pdf_path.suffix}. "
-                f"Allowed: {Config.ALLOWED_FILE_EXTENSIONS}"
-            )
+    Returns:
+        List of (page index, text, error message) tuples in page order
+    """
+    pool = _get_page_pool(workers)
+    chunk_size = max(1, math.ceil((end_page - first_page) / (workers * 2)))
+    futures = [
+        pool.submit(
+            _extract_page_range,
+            str(pdf_path),
+            start,
+            min(start + chunk_size, end_page),
+        )
+        for start in range(first_page, end_page, chunk_size)
+    ]
+    
+    results: List[PageResult] = []
+    for future in futures:
+        results.extend(future.result())
+    return results
+
+
+class _PdfSource:
+    """
+    A validated PDF held in memory without an intermediate copy.
+    
+    Files are memory-mapped read-only, so the OS page cache backs the bytes
+    that pypdf parses and that the extraction cache hashes. In-memory upload
+    buffers are wrapped as-is.
+    """
+    
+    def __init__(
+        self,
+        name: str,
+        buffer: Union[mmap.mmap, BufferLike],
+        path: Optional[Path] = None,
+    ):
+        self.name = name
+        self.buffer = buffer
+        self.path = path
+        self.size = len(buffer)
+    
+    def stream(self) -> BinaryIO:
+        """Return a seekable stream over the buffer for PdfReader."""
+        if isinstance(self.buffer, mmap.mmap):
+            return _as_stream(self.buffer)
+        # BytesIO shares an immutable bytes object rather than copying it
+        return io.BytesIO(self.buffer)
+    
+    def close(self) -> None:
+        """Release the mapping, if any."""
+        if isinstance(self.buffer, mmap.mmap):
+            self.buffer.close()
+
+
+@dataclass
+class PdfExtraction:
+    """
+    Text of a PDF's pages, as far as extraction went.
+    
+    Attributes:
+        pages: Text of each page read, in page order ("" for a page without
+            text), so list positions are page indices
+        page_count: Pages in the document, up to Config.MAX_PDF_PAGES
+        budget_type: Document type whose page/text budget stopped
+            extraction, or None when every page was read
+    """
+    
+    pages: List[str]
+    page_count: int
+    budget_type: Optional[str] = None
+    
+    @property
+    def text(self) -> str:
+        """Text of the non-empty pages, joined by newlines."""
+        return "\n".join(page for page in self.pages if page)
+    
+    @property
+    def pages_skipped(self) -> int:
+        return self.page_count - len(self.pages)
+    
+    def report(self) -> dict:
+        """
+        Describe how much of the document was read, for tool results.
         
-        # Security: Check file size
-        file_size_mb = pdf_path.stat().st_size / (1024 * 1024)
-        if file_size_mb > Config.MAX_PDF_SIZE_MB:
-            raise ValueError(
-                f"PDF file too large: {file_size_mb:.2f}MB. "
-                f"Maximum allowed: {Config.MAX_PDF_SIZE_MB}MB"
+        Returns:
+            Dictionary with 'page_count' and 'pages_extracted' keys, plus an
+            'extraction_note' when a budget cut the document short
+        """
+        report: Dict[str, Any] = {
+            "page_count": self.page_count,
+            "pages_extracted": len(self.pages),
+        }
+        if self.budget_type and self.pages_skipped:
+            report["extraction_note"] = (
+                f"Only pages 1-{len(self.pages)} of {self.page_count} were read: "
+                f"the document looked like a {self.budget_type} and extraction "
+                f"stopped at that type's budget (PAGE_POLICY_ENABLED)"
             )
+        return report
+    
+    def to_json(self) -> str:
+        return json.dumps({
+            "pages": self.pages,
+            "page_count": self.page_count,
+            "budget_type": self.budget_type,
+        }, ensure_ascii=False)
+    
+    @classmethod
+    def from_json(cls, data: str) -> "PdfExtraction":
+        entry = json.loads(data)
+        return cls(entry["pages"], entry["page_count"], entry["budget_type"])
+
+
+def _validate_extension(name: str) -> None:
+    """Raise ValueError unless ``name`` has an allowed PDF extension."""
+    suffix = Path(name).suffix
+    if suffix.lower() not in Config.ALLOWED_FILE_EXTENSIONS:
+        raise ValueError(
+            f"Invalid file type: {suffix}. "
+            f"Allowed: {Config.ALLOWED_FILE_EXTENSIONS}"
+        )
+
+
+def _validate_size(size: int) -> None:
+    """Raise ValueError if a PDF of ``size`` bytes exceeds the size limit."""
+    file_size_mb = size / (1024 * 1024)
+    if file_size_mb > Config.MAX_PDF_SIZE_MB:
+        raise ValueError(
+            f"PDF file too large: {file_size_mb:.2f}MB. "
+            f"Maximum allowed: {Config.MAX_PDF_SIZE_MB}MB"
+        )
+
+
+def _validate_header(name: str, buffer: Union[mmap.mmap, BufferLike]) -> None:
+    """Raise ValueError unless the buffer starts like a PDF document."""
+    if bytes(buffer[:_PDF_HEADER_WINDOW]).find(_PDF_MAGIC) == -1:
+        raise ValueError(f"Not a valid PDF file: {name}")
+
+
+@contextmanager
+def _open_pdf_path(file_path: str) -> Iterator[_PdfSource]:
+    """
+    Resolve, memory-map and validate a PDF file.
+    
+    The file is opened once and sized with ``fstat`` on the open descriptor
+    instead of separate ``exists``/``stat`` calls on the path.
+    
+    Args:
+        file_path: Path to the PDF file
         
-        logger.info(f"Processing PDF: {pdf_path.name} ({file_size_mb:.2f}MB)")
+    Yields:
+        Validated PDF source, unmapped when the block exits
         
-        # Extract text from PDF
-        reader = PdfReader(str(pdf_path))
+    Raises:
+        FileNotFoundError: If file doesn't exist
+        ValueError: If file has the wrong extension, size or header
+    """
+    # Convert to Path object for better path handling
+    pdf_path = Path(file_path).resolve()
+    
+    # Security: Prevent path traversal
+    project_root = Config.get_project_root()
+    try:
+        pdf_path.relative_to(project_root)
+    except ValueError:
+        # File is outside project directory - allow but log warning
+        logger.warning(f"Accessing file outside project: {pdf_path}")
+    
+    # Validation: Check file exists (a single open instead of exists + stat)
+    try:
+        f = open(pdf_path, "rb")
+    except (FileNotFoundError, IsADirectoryError):
+        raise FileNotFoundError(f"PDF file not found: {file_path}")
+    
+    with f:
+        # Validation: Check file extension
+        _validate_extension(pdf_path.name)
         
-        # Check page count
-        num_pages = len(reader.pages)
-        if num_pages > Config.MAX_PDF_PAGES:
-            logger.warning(
-                f"PDF has {num_pages} pages, limiting to {Config.MAX_PDF_PAGES}"
-            )
-            num_pages = Config.MAX_PDF_PAGES
-        
-        extracted_pages = []
-        for i, page in enumerate(reader.pages[:num_pages]):
-            try:
-                text = page.extract_text()
-                if text and text.strip():
-                    extracted_pages.append(text)
-            except Exception as e:
-                logger.warning(f"Failed to extract text from page {i+1}: {e}")
-                continue
-        
-        if not extracted_pages:
-            raise ValueError("No readable text found in PDF")
-        
-        full_text = "\n".join(extracted_pages)
+        # Security: Check file size before mapping it
+        size = os.fstat(f.fileno()).st_size
+        _validate_size(size)
+        if size == 0:
+            raise ValueError(f"Not a valid PDF file: {pdf_path.name}")
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    
+    source = _PdfSource(pdf_path.name, mapped, path=pdf_path)
+    try:
+        _validate_header(source.name, mapped)
         logger.info(
-            f"Successfully extracted {len(full_text)} characters "
-            f"from {len(extracted_pages)} pages"
+            f"Processing PDF: {source.name} ({source.size / (1024 * 1024):.2f}MB)"
         )
+        yield source
+    finally:
+        source.close()
+
+
+@contextmanager
+def _open_pdf_buffer(data: BufferLike, filename: str) -> Iterator[_PdfSource]:
+    """
+    Validate an in-memory PDF upload.
+    
+    Args:
+        data: PDF content
+        filename: Original upload name, used for the extension check
         
-        return full_text
+    Yields:
+        Validated PDF source
         
+    Raises:
+        ValueError: If the upload has the wrong extension, size or header
+    """
+    if isinstance(data, memoryview):
+        data = data.cast("B")
+    _validate_extension(filename)
+    _validate_size(len(data))
+    _validate_header(filename, data)
+    source = _PdfSource(filename, data)
+    logger.info(
+        f"Processing PDF upload: {source.name} "
+        f"({source.size / (1024 * 1024):.2f}MB)"
+    )
+    yield source
+
+
+def _open_reader(source: _PdfSource) -> Tuple["PdfReader", int]:
+    """
+    Open a PDF and apply the configured page limit.
+    
+    Args:
+        source: Validated PDF source
+        
+    Returns:
+        Tuple of (reader, number of pages to extract)
+    """
+    from pypdf import PdfReader
+    
+    reader = PdfReader(source.stream())
+    
+    # Check page count
+    num_pages = len(reader.pages)
+    if num_pages > Config.MAX_PDF_PAGES:
+        logger.warning(
+            f"PDF has {num_pages} pages, limiting to {Config.MAX_PDF_PAGES}"
+        )
+        num_pages = Config.MAX_PDF_PAGES
+    
+    return reader, num_pages
+
+
+@contextmanager
+def _pdf_errors(file_path: str) -> Iterator[None]:
+    """Log PDF processing failures and normalize unexpected errors."""
+    try:
+        yield
     except FileNotFoundError:
         logger.error(f"File not found: {file_path}")
         raise
@@ -105,76 +393,579 @@ def extract_pdf_text(file_path: str) -> str:
         raise Exception(f"PDF processing error: {str(e)}")
 
 
-def classify_document(text: str) -> dict:
+def _policy_tag() -> str:
+    """Describe the per-type budgets for extraction cache keys ('' when off)."""
+    if not Config.PAGE_POLICY_ENABLED:
+        return ""
+    budgets = ",".join(
+        f"{doc_type}={pages}/{Config.PDF_TEXT_KB_BUDGETS[doc_type]}"
+        for doc_type, pages in sorted(Config.PDF_PAGE_BUDGETS.items())
+    )
+    return (
+        f"policy={Config.PAGE_POLICY_SNIFF_PAGES}"
+        f"@{Config.PAGE_POLICY_MIN_CONFIDENCE}:{budgets}"
+    )
+
+
+def _sniff_budget(
+    reader: "PdfReader", num_pages: int
+) -> Tuple[List[PageResult], Optional[str], int, Optional[int]]:
     """
-    Classify document type based on content with confidence scoring.
+    Classify the first pages and look up the type's extraction budget.
+    
+    The budget only applies when the classification reaches
+    Config.PAGE_POLICY_MIN_CONFIDENCE: a PYQ bundle whose cover page reads
+    like a timetable ("Examination", "Date", "Time") must not be cut to a
+    timetable's few pages.
     
     Args:
-        text: Document text content
+        reader: Open PDF reader
+        num_pages: Pages the document would otherwise be extracted to
         
     Returns:
-        Dictionary with 'type' and 'confidence' keys
+        Tuple of (sniffed page results, document type or None when the
+        policy does not apply, page limit, text byte limit or None)
     """
-    if not text or not text.strip():
-        return {"type": "unknown", "confidence": 0.0}
+    sniff_pages = Config.PAGE_POLICY_SNIFF_PAGES
+    if not Config.PAGE_POLICY_ENABLED or num_pages <= sniff_pages:
+        return [], None, num_pages, None
+    
+    sniffed = _extract_page_range(reader, 0, sniff_pages)
+    classification = classify_document(
+        "\n".join(text for _, text, _ in sniffed if text)
+    )
+    doc_type = classification["type"]
+    if classification["confidence"] < Config.PAGE_POLICY_MIN_CONFIDENCE:
+        logger.info(
+            f"Not applying a page budget: first {sniff_pages} pages look like "
+            f"{doc_type} with only {classification['confidence']:.0%} confidence"
+        )
+        return sniffed, None, num_pages, None
+    page_limit = min(num_pages, Config.PDF_PAGE_BUDGETS[doc_type])
+    byte_limit = Config.PDF_TEXT_KB_BUDGETS[doc_type] * 1024
+    return sniffed, doc_type, max(page_limit, sniff_pages), byte_limit
+
+
+def _within_byte_budget(
+    page_results: Iterable[PageResult], byte_limit: Optional[int]
+) -> Iterator[PageResult]:
+    """Pass pages through until their text reaches ``byte_limit``."""
+    text_bytes = 0
+    for result in page_results:
+        yield result
+        if result[1]:
+            text_bytes += len(result[1].encode("utf-8"))
+        if byte_limit is not None and text_bytes >= byte_limit:
+            return
+
+
+def _no_text_message() -> str:
+    if Config.ENABLE_OCR:
+        return "No readable text found in PDF"
+    return (
+        "No readable text found in PDF; if it is a scanned document, "
+        "set ENABLE_OCR=true to read it with OCR"
+    )
+
+
+def _extract_source_pages(
+    source: _PdfSource, parallel_min_pages: Optional[int] = None
+) -> PdfExtraction:
+    """
+    Extract the pages of a validated PDF, consulting the extraction cache.
     
-    text_lower = text.lower()
-    
-    # Define classification patterns with weights
-    patterns = {
-        "exam_timetable": [
-            ("exam", 3),
-            ("date", 2),
-            ("time", 2),
-            ("schedule", 2),
-            ("timetable", 3),
-        ],
-        "syllabus": [
-            ("syllabus", 4),
-            ("unit", 3),
-            ("chapter", 2),
-            ("topics", 2),
-            ("course", 2),
-            ("curriculum", 3),
-        ],
-        "pyq": [
-            ("previous year", 4),
-            ("question paper", 4),
-            ("pyq", 5),
-            ("solved", 2),
-            ("marks", 2),
-        ],
-        "assignment": [
-            ("assignment", 4),
-            ("submit", 3),
-            ("deadline", 3),
-            ("due date", 3),
-            ("homework", 3),
-        ],
+    With Config.PAGE_POLICY_ENABLED, the first pages are classified and
+    extraction stops at that document type's page or text budget. With
+    Config.ENABLE_OCR, pages without a text layer are read with OCR.
+    
+    Args:
+        source: Validated PDF source
+        parallel_min_pages: Page count from which to use the process pool;
+            defaults to Config.PDF_PARALLEL_MIN_PAGES
+            
+    Returns:
+        Extracted pages, with the budget cutoff if any
+        
+    Raises:
+        ValueError: If no page contains readable text
+    """
+    # Serve repeated uploads of the same document from the cache
+    cache = get_extraction_cache()
+    cache_key: Optional[str] = None
+    if cache is not None:
+        cache_key = ExtractionCache.make_key(
+            hash_buffer(source.buffer),
+            Config.MAX_PDF_PAGES,
+            ";".join(
+                tag
+                for tag in (_CACHE_FORMAT, ocr.settings_tag(), _policy_tag())
+                if tag
+            ),
+        )
+        cached = cache.get(cache_key, pdf_bytes=source.size)
+        if cached is not None:
+            extraction = PdfExtraction.from_json(cached)
+            logger.info(
+                f"Extraction cache hit for {source.name} "
+                f"({len(extraction.pages)} pages)"
+            )
+            return extraction
+    
+    # Extract text from PDF
+    start_time = time.perf_counter()
+    reader, num_pages = _open_reader(source)
+    
+    # Short-form documents (timetables, assignments) stop at their budget
+    extract_started = time.perf_counter()
+    sniffed, doc_type, page_limit, byte_limit = _sniff_budget(reader, num_pages)
+    first_page = len(sniffed)
+    remaining: Iterable[PageResult]
+    in_pool = False
+    
+    # Pool workers map the file themselves; uploads are extracted in-process
+    workers = Config.PDF_EXTRACT_WORKERS
+    if parallel_min_pages is None:
+        parallel_min_pages = Config.PDF_PARALLEL_MIN_PAGES
+    if (
+        source.path is not None
+        and workers > 1
+        and page_limit - first_page >= parallel_min_pages
+    ):
+        remaining = _extract_pages_parallel(
+            source.path, first_page, page_limit, workers
+        )
+        in_pool = True
+    else:
+        # Lazily, one page at a time, so the byte budget stops extraction
+        remaining = (
+            result
+            for i in range(first_page, page_limit)
+            for result in _extract_page_range(reader, i, i + 1)
+        )
+    
+    texts: Dict[int, str] = {}
+    pages_extracted = 0
+    for i, text, error in _within_byte_budget(
+        itertools.chain(sniffed, remaining), byte_limit
+    ):
+        pages_extracted += 1
+        if error is not None:
+            logger.warning(f"Failed to extract text from page {i+1}: {error}")
+            continue
+        if text and text.strip():
+            texts[i] = text
+    
+    # The pool extracts its whole range; only the page budget saves work there
+    pages_read = page_limit if in_pool else pages_extracted
+    pages_skipped = num_pages - pages_read
+    if doc_type is not None and pages_skipped:
+        elapsed = time.perf_counter() - extract_started
+        seconds_saved = elapsed / pages_read * pages_skipped
+        logger.info(
+            f"Stopped {source.name} early as {doc_type}: extracted "
+            f"{pages_read} of {num_pages} pages, skipped {pages_skipped} "
+            f"(~{seconds_saved:.2f}s saved)"
+        )
+        if telemetry.enabled():
+            telemetry.observe_budget_cutoff(doc_type, pages_skipped, seconds_saved)
+    
+    # Scanned pages have no text layer; read them with OCR when enabled
+    empty_pages = [i for i in range(pages_extracted) if i not in texts]
+    if empty_pages and ocr.enabled():
+        texts.update(ocr.ocr_pages(reader, empty_pages))
+    
+    if not texts:
+        raise ValueError(_no_text_message())
+    extraction = PdfExtraction(
+        pages=[texts.get(i, "") for i in range(pages_extracted)],
+        page_count=num_pages,
+        budget_type=doc_type if pages_extracted < num_pages else None,
+    )
+    
+    logger.info(
+        f"Successfully extracted {len(extraction.text)} characters "
+        f"from {len(texts)} pages"
+    )
+    
+    if cache is not None and cache_key is not None:
+        cache.put(
+            cache_key, extraction.to_json(), time.perf_counter() - start_time
+        )
+    
+    return extraction
+
+
+def _extract_source_text(
+    source: _PdfSource, parallel_min_pages: Optional[int] = None
+) -> str:
+    """Extract the text of a validated PDF (see :func:`_extract_source_pages`)."""
+    return _extract_source_pages(source, parallel_min_pages).text
+
+
+def extract_pdf_text(file_path: str) -> str:
+    """
+    Extract text from a PDF file with security validations.
+    
+    Args:
+        file_path: Path to the PDF file
+        
+    Returns:
+        Extracted text from all pages
+        
+    Raises:
+        FileNotFoundError: If file doesn't exist
+        ValueError: If file is invalid or too large
+        Exception: For other PDF processing errors
+    """
+    with _pdf_errors(file_path):
+        with _open_pdf_path(file_path) as source:
+            return _extract_source_text(source)
+
+
+def extract_pdf_pages(file_path: str) -> PdfExtraction:
+    """
+    Extract a PDF's text page by page.
+    
+    Uses the same validation, cache, process pool, OCR fallback and page
+    budgets as :func:`extract_pdf_text`, but keeps page boundaries and
+    reports where a budget stopped extraction.
+    
+    Args:
+        file_path: Path to the PDF file
+        
+    Returns:
+        Extracted pages ("" for pages without text) and page counts
+        
+    Raises:
+        FileNotFoundError: If file doesn't exist
+        ValueError: If file is invalid, too large, or has no readable text
+        Exception: For other PDF processing errors
+    """
+    with _pdf_errors(file_path):
+        with _open_pdf_path(file_path) as source:
+            return _extract_source_pages(source)
+
+
+def extract_pdf_bytes(data: BufferLike, filename: str = "upload.pdf") -> str:
+    """
+    Extract text from an in-memory PDF upload.
+    
+    Lets the web layer hand over the request body directly instead of
+    writing it to a temporary file first. ``bytes`` input is read without
+    copying; validation, caching and page limits match
+    :func:`extract_pdf_text`.
+    
+    Args:
+        data: PDF file content
+        filename: Original upload name, used for the extension check
+        
+    Returns:
+        Extracted text from all pages
+        
+    Raises:
+        ValueError: If the upload is invalid or too large
+        Exception: For other PDF processing errors
+    """
+    with _pdf_errors(filename):
+        with _open_pdf_buffer(data, filename) as source:
+            return _extract_source_text(source)
+
+
+def _extract_and_classify(file_path: str) -> dict:
+    """Extract and classify one document of a batch, capturing errors."""
+    # compaction imports this module, so import it when first needed
+    from tools.compaction import estimate_tokens
+    
+    try:
+        with _pdf_errors(file_path), _open_pdf_path(file_path) as source:
+            # Hand every document's pages to the pool so that small files in
+            # a batch overlap on CPU, not just large ones
+            extraction = _extract_source_pages(source, parallel_min_pages=1)
+    except Exception as e:
+        return {"file_path": file_path, "error": str(e)}
+    
+    text = extraction.text
+    classification = classify_document(text)
+    return {
+        "file_path": file_path,
+        "file_name": Path(file_path).name,
+        "type": classification["type"],
+        "confidence": classification["confidence"],
+        "tokens": estimate_tokens(text),
+        **extraction.report(),
     }
+
+
+def extract_and_classify_pdfs(file_paths: List[str]) -> List[dict]:
+    """
+    Extract and classify several PDF files in one call.
+    
+    Documents are processed concurrently and a failure in one file is
+    reported in its own result instead of failing the whole batch. Only
+    the classification and extraction report are returned, never the text:
+    read a document's content with ``open_document`` and the page, section
+    and search tools, which keep each read within its token budget.
+    
+    Args:
+        file_paths: Paths to the PDF files
+        
+    Returns:
+        One dictionary per file, in input order, with 'file_path',
+        'file_name', 'type', 'confidence', 'tokens' (full text estimate),
+        'page_count' and 'pages_extracted' keys (and 'extraction_note' when
+        a page budget stopped extraction early), or 'file_path' and 'error'
+        on failure
+        
+    Raises:
+        ValueError: If more than Config.PDF_BATCH_MAX_FILES files are given
+    """
+    if len(file_paths) > Config.PDF_BATCH_MAX_FILES:
+        raise ValueError(
+            f"Too many files in batch: {len(file_paths)}. "
+            f"Maximum allowed: {Config.PDF_BATCH_MAX_FILES}"
+        )
+    if not file_paths:
+        return []
     
+    start_time = time.perf_counter()
+    workers = min(Config.PDF_BATCH_WORKERS, len(file_paths))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        results = list(executor.map(_extract_and_classify, file_paths))
+    
+    failed = sum(1 for result in results if "error" in result)
+    logger.info(
+        f"Processed batch of {len(results)} PDFs ({failed} failed) "
+        f"in {time.perf_counter() - start_time:.2f}s"
+    )
+    return results
+
+
+def iter_pdf_pages(file_path: str, include_empty: bool = False) -> Iterator[str]:
+    """
+    Lazily extract text from a PDF, one page at a time.
+    
+    Pages are only parsed when the caller asks for the next one, so a
+    consumer that stops early never pays for the rest of the document and
+    only one page of text is held in memory at a time. Pages without
+    readable text are OCRed or skipped, as in :func:`extract_pdf_text`.
+    
+    Args:
+        file_path: Path to the PDF file
+        include_empty: Yield "" for pages without text instead of skipping
+            them, so the n-th page yielded is page n of the document
+            
+    Yields:
+        Text of each page, in page order
+        
+    Raises:
+        FileNotFoundError: If file doesn't exist
+        ValueError: If file is invalid, too large, or has no readable text
+        Exception: For other PDF processing errors
+    """
+    with _pdf_errors(file_path), _open_pdf_path(file_path) as source:
+        reader, num_pages = _open_reader(source)
+        yield from _iter_reader_pages(reader, num_pages, include_empty)
+
+
+def _iter_reader_pages(
+    reader: "PdfReader", num_pages: int, include_empty: bool
+) -> Generator[str, None, None]:
+    """Yield page texts for :func:`iter_pdf_pages` from an open reader."""
+    use_ocr = ocr.enabled()
+    pages_with_text = 0
+    for i in range(num_pages):
+        [(_, text, error)] = _extract_page_range(reader, i, i + 1)
+        if error is not None:
+            logger.warning(f"Failed to extract text from page {i+1}: {error}")
+        if not (text and text.strip()) and use_ocr:
+            text = ocr.ocr_pages(reader, [i]).get(i)
+        if text and text.strip():
+            pages_with_text += 1
+            yield text
+        elif include_empty:
+            yield ""
+    
+    if not pages_with_text:
+        raise ValueError(_no_text_message())
+
+
+def get_extraction_cache_stats() -> dict:
+    """
+    Report how much extraction work the PDF text cache has saved.
+    
+    Returns:
+        Dictionary with hits, misses, hit rate, bytes and seconds saved,
+        or {"enabled": False} if the cache is disabled
+    """
+    cache = get_extraction_cache()
+    if cache is None:
+        return {"enabled": False}
+    return {"enabled": True, **cache.stats()}
+
+
+# Classification patterns with weights per document type
+_CLASSIFICATION_PATTERNS = {
+    "exam_timetable": [
+        ("exam", 3),
+        ("date", 2),
+        ("time", 2),
+        ("schedule", 2),
+        ("timetable", 3),
+    ],
+    "syllabus": [
+        ("syllabus", 4),
+        ("unit", 3),
+        ("chapter", 2),
+        ("topics", 2),
+        ("course", 2),
+        ("curriculum", 3),
+    ],
+    "pyq": [
+        ("previous year", 4),
+        ("question paper", 4),
+        ("pyq", 5),
+        ("solved", 2),
+        ("marks", 2),
+    ],
+    "assignment": [
+        ("assignment", 4),
+        ("submit", 3),
+        ("deadline", 3),
+        ("due date", 3),
+        ("homework", 3),
+    ],
+}
+
+
+# Keyword scan plan, compiled once at import. Keywords are checked longest
+# first, and a hit also marks every keyword it contains ("timetable" implies
+# "time", "due date" implies "date"), which skips those scans entirely.
+_KEYWORD_SCAN_ORDER: Tuple[str, ...] = tuple(sorted(
+    {
+        keyword
+        for keywords in _CLASSIFICATION_PATTERNS.values()
+        for keyword, _ in keywords
+    },
+    key=lambda keyword: (-len(keyword), keyword),
+))
+_IMPLIED_KEYWORDS: Dict[str, FrozenSet[str]] = {
+    keyword: frozenset(other for other in _KEYWORD_SCAN_ORDER if other in keyword)
+    for keyword in _KEYWORD_SCAN_ORDER
+}
+_MAX_POSSIBLE_SCORE: int = max(
+    sum(weight for _, weight in keywords)
+    for keywords in _CLASSIFICATION_PATTERNS.values()
+)
+
+
+def _find_keywords(text_lower: str) -> Set[str]:
+    """Return the classification keywords present in lowercased text."""
+    found: Set[str] = set()
+    for keyword in _KEYWORD_SCAN_ORDER:
+        if keyword not in found and keyword in text_lower:
+            found |= _IMPLIED_KEYWORDS[keyword]
+    return found
+
+
+def _classify_keywords(found: Set[str]) -> dict:
+    """
+    Score document types from the set of keywords found in a document.
+    
+    Args:
+        found: Keywords present in the document text
+        
+    Returns:
+        Dictionary with 'type', 'confidence' and 'scores' keys
+    """
     # Calculate scores for each document type
-    scores = {}
-    for doc_type, keywords in patterns.items():
-        score = sum(weight for keyword, weight in keywords if keyword in text_lower)
-        scores[doc_type] = score
+    scores: Dict[str, int] = {}
+    for doc_type, keywords in _CLASSIFICATION_PATTERNS.items():
+        scores[doc_type] = sum(
+            weight for keyword, weight in keywords if keyword in found
+        )
     
     # Find the highest scoring type
     if not any(scores.values()):
         return {"type": "unknown", "confidence": 0.0}
     
-    max_type = max(scores, key=scores.get)
+    max_type = max(scores, key=scores.__getitem__)
     max_score = scores[max_type]
     
     # Calculate confidence (normalize to 0-1 range)
-    # Maximum possible score for any category
-    max_possible = max(sum(w for _, w in patterns[dt]) for dt in patterns)
-    confidence = min(max_score / max_possible, 1.0)
-    
-    logger.info(f"Classified as '{max_type}' with {confidence:.2%} confidence")
+    confidence = min(max_score / _MAX_POSSIBLE_SCORE, 1.0)
     
     return {
         "type": max_type,
         "confidence": round(confidence, 2),
         "scores": scores  # Include all scores for debugging
     }
+
+
+def classify_document(text: str) -> dict:
+    """
+    Classify document type based on content with confidence scoring.
+    
+    Args:
+        text: Document text content
+        
+    Returns:
+        Dictionary with 'type' and 'confidence' keys
+    """
+    if not text or not text.strip():
+        return {"type": "unknown", "confidence": 0.0}
+    
+    result = _classify_keywords(_find_keywords(text.lower()))
+    
+    if result["type"] != "unknown":
+        logger.info(
+            f"Classified as '{result['type']}' with "
+            f"{result['confidence']:.2%} confidence"
+        )
+    
+    return result
+
+
+def classify_pdf(file_path: str, confidence_threshold: float = 0.6) -> dict:
+    """
+    Classify a PDF by streaming its pages, stopping once confident.
+    
+    Keywords found on each page are accumulated, so the result over the
+    pages read is identical to :func:`classify_document` on their joined
+    text. Extraction stops as soon as the confidence reaches the threshold
+    (or no further keyword could raise it), which usually means reading only
+    the first page or two. Pages without text count as read.
+    
+    Args:
+        file_path: Path to the PDF file
+        confidence_threshold: Confidence (0-1) at which to stop reading
+        
+    Returns:
+        Dictionary with 'type', 'confidence', 'scores', 'pages_read' and
+        'stopped_early' keys; 'stopped_early' is True only when pages were
+        left unread
+    """
+    found: Set[str] = set()
+    result: Dict[str, Any] = {"type": "unknown", "confidence": 0.0}
+    pages_read = 0
+    
+    with _pdf_errors(file_path), _open_pdf_path(file_path) as source:
+        reader, num_pages = _open_reader(source)
+        pages = _iter_reader_pages(reader, num_pages, include_empty=True)
+        try:
+            for page_text in pages:
+                pages_read += 1
+                found |= _find_keywords(page_text.lower())
+                result = _classify_keywords(found)
+                all_found = len(found) == len(_KEYWORD_SCAN_ORDER)
+                if result["confidence"] >= confidence_threshold or all_found:
+                    break
+        finally:
+            pages.close()
+    stopped_early = pages_read < num_pages
+    
+    logger.info(
+        f"Classified {Path(file_path).name} as '{result['type']}' with "
+        f"{result['confidence']:.2%} confidence after {pages_read} pages"
+    )
+    
+    return {**result, "pages_read": pages_read, "stopped_early": stopped_early}
@@ -0,0 +1,572 @@
+"""
+Previous year question (PYQ) topic index for Taskify Agent.
+
+This module splits PYQ papers into questions and keeps a persistent inverted
+index of topic terms to (year, question, marks) per subject, so topic
+frequency across years is a lookup instead of a re-read of every paper.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import tempfile
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Set, Tuple, TypedDict
+
+try:
+    import fcntl
+except ImportError:  # Windows: writers are only serialized within a process
+    fcntl = None  # type: ignore[assignment]
+
+from config import Config
+from tools.pdf_tools import extract_pdf_text
+
+logger = logging.getLogger(__name__)
+
+_INDEX_VERSION = 1
+
+# "Q1.", "Q.1", "Question 1:", "1.", "1)" at the start of a line
+_QUESTION_START = re.compile(
+    r"^\s*(?:Q(?:uestion)?\s*\.?\s*(\d{1,2})\s*[.):-]?|(\d{1,2})\s*[.)])\s*"
+    r"(?:\(?([a-h])\))?\s*",
+    re.IGNORECASE,
+)
+
+# "(a)", "b)", "(ii)" sub-parts on their own line
+_SUBPART_START = re.compile(r"^\s*\(?([a-h]|i{1,3}|iv|vi{0,3}|ix|x)\)\s+")
+
+# "[5]", "(10 marks)", "(5M)", "5 marks" at the end of a question
+_MARKS_PATTERN = re.compile(
+    r"[\[(]\s*(\d{1,2})\s*(?:marks?|m)?\s*[\])]\s*$|\b(\d{1,2})\s*marks?\b",
+    re.IGNORECASE,
+)
+
+_YEAR_PATTERN = re.compile(r"\b(19[89]\d|20\d{2})\b")
+
+_WORD_PATTERN = re.compile(r"[a-z][a-z0-9+#-]*[a-z0-9+#]|[a-z]")
+
+# Common English words and question verbs that never name a topic
+_STOPWORDS = frozenset("""
+a about above after all also an and any are as at be been between both but by
+can could do does each either for from give given has have how if in into is
+it its may more most must not of on one or other our over same shall should
+so some such than that the their them then there these they this those to two
+under up upon using very was we were what when where whether which while who
+why will with within without would you your
+answer answers attempt below briefly brief calculate choose compare compulsory
+consider deduce define definition derive describe detail details determine
+differentiate discuss distinguish draw each evaluate example examples explain
+figure find following illustrate justify list marks mention neat note notes
+obtain outline part parts prove question questions short show sketch solve
+state suitable taking total various write
+""".split())
+
+# Singular words ending in "s" that plural folding must leave alone
+_NOT_PLURAL = frozenset(("series", "species", "means", "lens", "gas"))
+
+_MIN_WORD_LENGTH = 3
+
+
+class Question(TypedDict):
+    """One question split out of a PYQ paper."""
+    
+    number: str
+    marks: Optional[int]
+    text: str
+
+
+def _normalize_word(word: str) -> str:
+    """Fold simple plurals so 'theorems' and 'theorem' share postings."""
+    if len(word) > 4 and word.endswith("ies") and not word.endswith("eries"):
+        return word[:-3] + "y"
+    if (
+        len(word) > 4
+        and word.endswith("s")
+        and not word.endswith(("ss", "us", "is", "ics"))
+        and word not in _NOT_PLURAL
+    ):
+        return word[:-1]
+    return word
+
+
+def _topic_terms(text: str) -> Set[str]:
+    """Return the unigram and bigram topic terms of a question."""
+    words: List[Optional[str]] = []
+    terms: Set[str] = set()
+    for raw in _WORD_PATTERN.findall(text.lower()):
+        if raw in _STOPWORDS or len(raw) < _MIN_WORD_LENGTH or raw.isdigit():
+            # Stopwords break phrases: "laws of motion" gives no bigram
+            words.append(None)
+            continue
+        word = _normalize_word(raw)
+        words.append(word)
+        terms.add(word)
+    for first, second in zip(words, words[1:]):
+        if first and second:
+            terms.add(f"{first} {second}")
+    return terms
+
+
+def _query_terms(topic: str) -> List[str]:
+    """Normalize a topic query the same way questions are indexed."""
+    return [
+        _normalize_word(word)
+        for word in _WORD_PATTERN.findall(topic.lower())
+        if word not in _STOPWORDS and len(word) >= _MIN_WORD_LENGTH
+    ]
+
+
+def split_questions(text: str) -> List[Question]:
+    """
+    Split PYQ paper text into numbered questions.
+    
+    Lines starting with a question number open a new question; sub-parts
+    such as "(a)" become their own entries (e.g. "3(a)"), and other lines
+    continue the current question. Marks are read from a trailing "[5]",
+    "(10 marks)" or "5 marks".
+    
+    Args:
+        text: Extracted PYQ text
+        
+    Returns:
+        List of questions with 'number', 'marks' (None if not printed) and
+        'text' keys, in document order
+    """
+    questions: List[Question] = []
+    number: Optional[str] = None
+    
+    for raw_line in text.splitlines():
+        line = raw_line.strip()
+        if not line:
+            continue
+        
+        start = _QUESTION_START.match(line)
+        subpart = None if start else _SUBPART_START.match(line)
+        if start:
+            number = start.group(1) or start.group(2)
+            label = number
+            if start.group(3):
+                label += f"({start.group(3).lower()})"
+            body = line[start.end():]
+        elif subpart and number is not None:
+            label = f"{number}({subpart.group(1).lower()})"
+            body = line[subpart.end():]
+        elif questions:
+            questions[-1]["text"] = f"{questions[-1]['text']} {line}"
+            continue
+        else:
+            # Instructions and headers before the first question
+            continue
+        
+        questions.append({"number": label, "marks": None, "text": body})
+    
+    for question in questions:
+        question["text"] = re.sub(r"\s{2,}", " ", question["text"]).strip()
+        marks = _MARKS_PATTERN.search(question["text"])
+        if marks:
+            question["marks"] = int(marks.group(1) or marks.group(2))
+            question["text"] = question["text"][:marks.start()].rstrip(" -–:;,")
+    return [q for q in questions if q["text"]]
+
+
+def detect_year(text: str, source: str = "") -> Optional[int]:
+    """
+    Guess the exam year of a paper from its header or file name.
+    
+    Args:
+        text: Extracted PYQ text
+        source: File name, checked when the header has no year
+        
+    Returns:
+        The year, or None if no plausible year was found
+    """
+    # The year is printed in the paper header, before the first question
+    match = _YEAR_PATTERN.search(text[:1500]) or _YEAR_PATTERN.search(
+        Path(source).name
+    )
+    return int(match.group(1)) if match else None
+
+
+class PyqIndex:
+    """
+    Persistent inverted index of PYQ topic terms, kept per subject.
+    
+    The whole index lives in one JSON file that is loaded on first use and
+    rewritten atomically after each added paper. Papers are identified by a
+    hash of their text, so adding the same paper twice is a no-op.
+    
+    Several processes (server workers, cohort runs) may share the file:
+    writers take an exclusive lock on a sidecar ``.lock`` file and re-read
+    the index before adding to it, and readers reload it when another
+    process has replaced it, so no process overwrites papers it never saw.
+    """
+    
+    def __init__(self, path: Path):
+        """
+        Create an index backed by the JSON file at ``path``.
+        
+        Args:
+            path: Index file location (created on first write)
+        """
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._stamp: Optional[Tuple[int, int, int]] = None
+        self._subjects: Dict[str, dict] = self._load()
+    
+    def _file_stamp(self) -> Optional[Tuple[int, int, int]]:
+        try:
+            stat = self.path.stat()
+        except OSError:
+            return None
+        return (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+    
+    def _refresh(self) -> None:
+        """Reload the index if another process has rewritten the file."""
+        if self._file_stamp() != self._stamp:
+            self._subjects = self._load()
+    
+    @contextmanager
+    def _file_lock(self) -> Iterator[None]:
+        """Hold the inter-process write lock for this index file."""
+        if fcntl is None:
+            yield
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        lock_path = self.path.with_name(self.path.name + ".lock")
+        with open(lock_path, "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+    
+    def _load(self) -> Dict[str, dict]:
+        # Stamp before reading: a write that lands in between only costs
+        # one extra reload on the next refresh
+        self._stamp = self._file_stamp()
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable PYQ index {self.path}: {e}")
+            return {}
+        if data.get("version") != _INDEX_VERSION:
+            logger.warning(f"Ignoring PYQ index with unknown version: {self.path}")
+            return {}
+        return data.get("subjects", {})
+    
+    def _save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        payload = {"version": _INDEX_VERSION, "subjects": self._subjects}
+        # Write atomically so a crash never leaves a truncated index
+        fd, tmp_path = tempfile.mkstemp(dir=self.path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(payload, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+        self._stamp = self._file_stamp()
+    
+    @staticmethod
+    def _subject_key(subject: str) -> str:
+        key = " ".join(subject.lower().split())
+        if not key:
+            raise ValueError("subject is required")
+        return key
+    
+    def add_paper(
+        self, subject: str, year: int, text: str, source: str = ""
+    ) -> dict:
+        """
+        Index one PYQ paper for a subject.
+        
+        Args:
+            subject: Subject the paper belongs to
+            year: Exam year of the paper
+            text: Extracted paper text
+            source: File name recorded with the paper
+            
+        Returns:
+            Dictionary with 'subject', 'year', 'questions_indexed',
+            'already_indexed' and 'years' keys
+        """
+        key = self._subject_key(subject)
+        paper_id = hashlib.sha256(text.encode("utf-8")).hexdigest()[:16]
+        
+        with self._lock, self._file_lock():
+            # Merge with papers other processes added since our last read
+            self._refresh()
+            entry = self._subjects.setdefault(
+                key,
+                {"name": subject, "papers": {}, "questions": [], "postings": {}},
+            )
+            if paper_id in entry["papers"]:
+                return {
+                    "subject": entry["name"],
+                    "year": entry["papers"][paper_id]["year"],
+                    "questions_indexed": 0,
+                    "already_indexed": True,
+                    "years": self._years(entry),
+                }
+            
+            questions = split_questions(text)
+            postings = entry["postings"]
+            for question in questions:
+                question_id = len(entry["questions"])
+                # [year, number, marks, text] keeps the file compact
+                entry["questions"].append(
+                    [year, question["number"], question["marks"], question["text"]]
+                )
+                for term in _topic_terms(question["text"]):
+                    postings.setdefault(term, []).append(question_id)
+            
+            entry["papers"][paper_id] = {
+                "year": year,
+                "source": Path(source).name,
+                "questions": len(questions),
+            }
+            self._save()
+            years = self._years(entry)
+        
+        logger.info(
+            f"Indexed {len(questions)} questions from {subject} {year} paper"
+        )
+        return {
+            "subject": entry["name"],
+            "year": year,
+            "questions_indexed": len(questions),
+            "already_indexed": False,
+            "years": years,
+        }
+    
+    @staticmethod
+    def _years(entry: dict) -> List[int]:
+        return sorted({paper["year"] for paper in entry["papers"].values()})
+    
+    def years(self, subject: str) -> List[int]:
+        """Return the years with indexed papers for a subject."""
+        with self._lock:
+            return self._years(self._entry(subject))
+    
+    def questions(self, subject: str) -> List[dict]:
+        """Return a subject's indexed questions with year, number and marks."""
+        with self._lock:
+            return [
+                {"year": year, "number": number, "marks": marks, "text": text}
+                for year, number, marks, text in self._entry(subject)["questions"]
+            ]
+    
+    def _entry(self, subject: str) -> dict:
+        self._refresh()
+        entry = self._subjects.get(self._subject_key(subject))
+        if entry is None:
+            raise ValueError(f"No PYQ papers indexed for subject: {subject}")
+        return entry
+    
+    @staticmethod
+    def _summarize(
+        term: str, question_ids: List[int], questions: List[list], total_years: int
+    ) -> dict:
+        years = sorted({questions[i][0] for i in question_ids})
+        return {
+            "topic": term,
+            "years": years,
+            "year_count": len(years),
+            "total_years": total_years,
+            "question_count": len(question_ids),
+            "total_marks": sum(questions[i][2] or 0 for i in question_ids),
+        }
+    
+    def frequency_table(self, subject: str, top_n: int = 20) -> List[dict]:
+        """
+        Rank a subject's topic terms by how many years they appeared in.
+        
+        Ties are broken by question count, then total marks. A single word
+        is left out when a two-word phrase containing it covers exactly the
+        same questions, so "fourier transform" is not repeated as "fourier".
+        
+        Args:
+            subject: Subject to rank
+            top_n: Number of rows to return
+            
+        Returns:
+            Rows with 'topic', 'years', 'year_count', 'total_years',
+            'question_count' and 'total_marks' keys
+        """
+        with self._lock:
+            entry = self._entry(subject)
+            postings = entry["postings"]
+            questions = entry["questions"]
+            total_years = len(self._years(entry))
+            
+            subsumed = set()
+            for term, ids in postings.items():
+                if " " in term:
+                    for word in term.split(" "):
+                        if postings.get(word) == ids:
+                            subsumed.add(word)
+            
+            ranked = sorted(
+                (
+                    (
+                        -len({questions[i][0] for i in ids}),
+                        -len(ids),
+                        -sum(questions[i][2] or 0 for i in ids),
+                        term,
+                    ),
+                    term,
+                )
+                for term, ids in postings.items()
+                if term not in subsumed
+            )
+            return [
+                self._summarize(term, postings[term], questions, total_years)
+                for _, term in ranked[:top_n]
+            ]
+    
+    def lookup(self, subject: str, topic: str) -> dict:
+        """
+        Find the questions that mention a topic.
+        
+        Multi-word topics match questions containing every word, ignoring
+        stopwords and plurals, so "integration by parts" also finds
+        "parts, integration of".
+        
+        Args:
+            subject: Subject to search
+            topic: Topic name, e.g. "Calculus" or "Fourier transform"
+            
+        Returns:
+            Frequency summary for the topic plus 'questions' (each with
+            'year', 'number', 'marks' and 'text'), newest year first
+        """
+        terms = _query_terms(topic)
+        if not terms:
+            raise ValueError(f"Topic has no searchable words: {topic}")
+        
+        with self._lock:
+            entry = self._entry(subject)
+            postings = entry["postings"]
+            questions = entry["questions"]
+            total_years = len(self._years(entry))
+            
+            matches = [set(postings.get(term, ())) for term in terms]
+            ids = sorted(set.intersection(*matches))
+            
+            result = self._summarize(topic, ids, questions, total_years)
+            result["questions"] = [
+                {
+                    "year": questions[i][0],
+                    "number": questions[i][1],
+                    "marks": questions[i][2],
+                    "text": questions[i][3],
+                }
+                for i in sorted(ids, key=lambda i: -questions[i][0])
+            ]
+            return result
+
+
+_index: Optional[PyqIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_pyq_index() -> PyqIndex:
+    """
+    Return the process-wide PYQ index, loading it on first use.
+    
+    Returns:
+        The shared PyqIndex
+    """
+    global _index
+    with _index_lock:
+        if _index is None:
+            path = Path(Config.PYQ_INDEX_PATH)
+            if not path.is_absolute():
+                path = Config.get_project_root() / path
+            _index = PyqIndex(path)
+            logger.info(f"Loaded PYQ index from {path}")
+        return _index
+
+
+def index_pyq_document(
+    file_path: str, subject: str, year: Optional[int] = None
+) -> dict:
+    """
+    Add a PYQ paper to the persistent topic index.
+    
+    Indexing is incremental: a new year's paper only adds its own questions,
+    and a paper that was already indexed is skipped.
+    
+    Args:
+        file_path: Path to the PYQ PDF
+        subject: Subject the paper belongs to
+        year: Exam year; detected from the paper header or file name if
+            omitted
+            
+    Returns:
+        Dictionary with 'subject', 'year', 'questions_indexed',
+        'already_indexed' and 'years' (all indexed years) keys
+        
+    Raises:
+        ValueError: If the year cannot be detected
+    """
+    return _index_paper(get_pyq_index(), file_path, subject, year)
+
+
+def _index_paper(
+    index: PyqIndex, file_path: str, subject: str, year: Optional[int]
+) -> dict:
+    """Extract a PYQ paper and add it to the given index."""
+    text = extract_pdf_text(file_path)
+    if year is None:
+        year = detect_year(text, file_path)
+        if year is None:
+            raise ValueError(
+                f"Could not detect the exam year of {Path(file_path).name}; "
+                f"pass the year explicitly"
+            )
+    return index.add_paper(subject, int(year), text, source=file_path)
+
+
+def get_pyq_topic_frequency(subject: str, top_n: int = 20) -> dict:
+    """
+    Rank a subject's PYQ topics by how many years they appeared in.
+    
+    Args:
+        subject: Subject whose indexed papers to rank
+        top_n: Number of topics to return
+        
+    Returns:
+        Dictionary with 'subject', 'years' (indexed years) and 'topics'
+        (each with 'topic', 'years', 'year_count', 'total_years',
+        'question_count' and 'total_marks') keys
+    """
+    index = get_pyq_index()
+    return {
+        "subject": subject,
+        "years": index.years(subject),
+        "topics": index.frequency_table(subject, top_n=top_n),
+    }
+
+
+def lookup_pyq_topic(subject: str, topic: str) -> dict:
+    """
+    Report how often a topic appeared in a subject's indexed PYQ papers.
+    
+    Args:
+        subject: Subject whose indexed papers to search
+        topic: Topic to look up, e.g. "Calculus"
+        
+    Returns:
+        Dictionary with 'topic', 'years', 'year_count', 'total_years',
+        'question_count', 'total_marks' and 'questions' keys
+    """
+    return get_pyq_index().lookup(subject, topic)
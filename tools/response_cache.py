@@ -0,0 +1,499 @@
+"""
+Model response cache for Taskify Agent.
+
+During exam week many students upload the same official documents and ask
+near-identical questions. This module caches final model replies keyed on
+the normalized conversation, the content hashes of the session's open
+documents (not their upload paths), and the current date, so an identical
+request on the same day is answered without calling the model. Entries
+expire after a TTL and are evicted least recently used, either in process
+memory or in a SQLite file shared by all workers on a host.
+"""
+
+import hashlib
+import json
+import logging
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    FrozenSet,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
+
+from config import Config
+from tools.datetime_tools import get_current_datetime
+from tools.document_store import STATE_KEY as DOCUMENTS_STATE_KEY
+
+if TYPE_CHECKING:
+    from google.adk.agents.callback_context import CallbackContext
+    from google.adk.models import LlmRequest, LlmResponse
+
+logger = logging.getLogger(__name__)
+
+# Bumped whenever the key recipe changes so old entries are never reused
+_KEY_VERSION = 1
+
+# Tool result fields that differ between students for the same documents
+# and the same plan, and so must not split the cache; replies that quote
+# one of their values are never stored
+_VOLATILE_KEYS = frozenset({"file_name", "mtime", "plan_id", "already_open"})
+
+# Most model calls awaiting their after-callback at once (per process)
+_MAX_PENDING = 4096
+
+_SPACES = re.compile(r"\s+")
+
+
+class MemoryBackend:
+    """In-process LRU store with per-entry expiry."""
+    
+    name = "memory"
+    
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key: str, now: float) -> Tuple[Optional[str], bool]:
+        """
+        Return ``(value, expired)`` for ``key``; value is None on a miss.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None, False
+            expires_at, value = entry
+            if expires_at <= now:
+                del self._entries[key]
+                return None, True
+            self._entries.move_to_end(key)
+            return value, False
+    
+    def put(self, key: str, value: str, expires_at: float) -> int:
+        """Store ``value`` and return the number of entries evicted."""
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            evicted = 0
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                evicted += 1
+            return evicted
+    
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+
+class SQLiteBackend:
+    """
+    SQLite-file LRU store with per-entry expiry.
+    
+    One file can be shared by every worker process on a host, so a reply
+    cached by one worker is reused by the others.
+    """
+    
+    name = "sqlite"
+    
+    def __init__(self, path: Path, max_entries: int):
+        self.path = Path(path)
+        self.max_entries = max_entries
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            str(self.path), timeout=5.0, check_same_thread=False
+        )
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+                "expires_at REAL NOT NULL, last_used REAL NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS responses_last_used "
+                "ON responses (last_used)"
+            )
+    
+    def get(self, key: str, now: float) -> Tuple[Optional[str], bool]:
+        """
+        Return ``(value, expired)`` for ``key``; value is None on a miss.
+        """
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None, False
+            value, expires_at = row
+            if expires_at <= now:
+                self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                return None, True
+            self._conn.execute(
+                "UPDATE responses SET last_used = ? WHERE key = ?", (now, key)
+            )
+            return value, False
+    
+    def put(self, key: str, value: str, expires_at: float) -> int:
+        """Store ``value`` and return the number of entries evicted."""
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?)",
+                (key, value, expires_at, now),
+            )
+            self._conn.execute("DELETE FROM responses WHERE expires_at <= ?", (now,))
+            (count,) = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()
+            excess = count - self.max_entries
+            if excess <= 0:
+                return 0
+            self._conn.execute(
+                "DELETE FROM responses WHERE key IN (SELECT key FROM responses "
+                "ORDER BY last_used LIMIT ?)",
+                (excess,),
+            )
+            return excess
+    
+    def __len__(self) -> int:
+        with self._lock:
+            (count,) = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()
+            return count
+
+
+Backend = Union[MemoryBackend, SQLiteBackend]
+
+
+def _normalize(value: Any, paths: Dict[str, str]) -> Any:
+    """
+    Canonicalize conversation data for keying.
+    
+    Text is case-folded with whitespace collapsed, uploaded file paths are
+    replaced by their document's content hash, and volatile tool-result
+    fields are dropped.
+    """
+    if isinstance(value, str):
+        for path, token in paths.items():
+            value = value.replace(path, token)
+        return _SPACES.sub(" ", value).strip().casefold()
+    if isinstance(value, dict):
+        return {
+            key: _normalize(item, paths)
+            for key, item in value.items()
+            if key not in _VOLATILE_KEYS
+        }
+    if isinstance(value, (list, tuple)):
+        return [_normalize(item, paths) for item in value]
+    return value
+
+
+def _collect_volatile(value: Any, found: Set[str]) -> None:
+    if isinstance(value, dict):
+        for key, item in value.items():
+            if key in _VOLATILE_KEYS and isinstance(item, str) and item:
+                found.add(item)
+            else:
+                _collect_volatile(item, found)
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            _collect_volatile(item, found)
+
+
+def volatile_values(llm_request: "LlmRequest") -> FrozenSet[str]:
+    """
+    Collect the per-student values (file names, plan IDs) in tool results.
+    
+    These fields are left out of the cache key, so a reply that quotes one
+    of them must not be replayed to another student.
+    
+    Args:
+        llm_request: Request about to be sent to the model
+        
+    Returns:
+        The string values of volatile tool-result fields
+    """
+    found: Set[str] = set()
+    for content in llm_request.contents:
+        for part in content.parts or []:
+            if part.function_response:
+                _collect_volatile(part.function_response.response, found)
+    return frozenset(found)
+
+
+def make_key(
+    llm_request: "LlmRequest", documents: Dict[str, dict], date: str
+) -> str:
+    """
+    Build the cache key for a model request.
+    
+    Args:
+        llm_request: Request about to be sent to the model
+        documents: Session document handles (doc_id -> handle) from
+            :mod:`tools.document_store`
+        date: Date bucket (YYYY-MM-DD) the reply is valid for
+        
+    Returns:
+        Hex SHA-256 digest identifying the request
+    """
+    paths = {
+        handle["file_path"]: f"doc:{handle['content_hash']}"
+        for handle in documents.values()
+    }
+    contents = []
+    for content in llm_request.contents:
+        parts = []
+        for part in content.parts or []:
+            if part.text:
+                parts.append(part.text)
+            elif part.function_call:
+                call = part.function_call
+                parts.append({"call": call.name, "args": call.args or {}})
+            elif part.function_response:
+                result = part.function_response
+                response = result.response or {}
+                if result.name == "get_current_datetime":
+                    # The time of day is below the date bucket's resolution
+                    response = date
+                parts.append({"result": result.name, "response": response})
+        contents.append({"role": content.role, "parts": parts})
+    
+    config = llm_request.config
+    system = str(config.system_instruction) if config else ""
+    payload = {
+        "version": _KEY_VERSION,
+        "model": llm_request.model or Config.AGENT_MODEL,
+        "system": hashlib.sha256(system.encode("utf-8")).hexdigest(),
+        "date": date,
+        "documents": sorted(handle["content_hash"] for handle in documents.values()),
+        "contents": _normalize(contents, paths),
+    }
+    raw = json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def _cacheable(llm_response: "LlmResponse", volatile: FrozenSet[str]) -> bool:
+    """Only complete, error-free text replies are shared between students."""
+    content = llm_response.content
+    if llm_response.partial or llm_response.error_code or not content:
+        return False
+    parts = content.parts or []
+    # Function calls carry per-student arguments (paths, plan IDs); replaying
+    # them for another student would run tools against the wrong inputs
+    if not parts or not all(part.text and not part.function_call for part in parts):
+        return False
+    text = "".join(part.text or "" for part in parts)
+    return not any(value in text for value in volatile)
+
+
+class ResponseCache:
+    """Model reply cache with TTL, LRU eviction, and hit-rate counters."""
+    
+    def __init__(
+        self,
+        backend: "Backend",
+        ttl_seconds: int,
+        parse: Callable[[str], "LlmResponse"],
+    ):
+        """
+        Create a cache over a storage backend.
+        
+        Args:
+            backend: Where replies are kept (:class:`MemoryBackend` or
+                :class:`SQLiteBackend`)
+            ttl_seconds: How long a stored reply stays valid
+            parse: Rebuilds a reply from the JSON written by :meth:`store`,
+                e.g. ``LlmResponse.model_validate_json``
+        """
+        self.backend = backend
+        self.ttl_seconds = ttl_seconds
+        self.parse = parse
+        self._lock = threading.Lock()
+        self._pending: "OrderedDict[str, Tuple[str, FrozenSet[str]]]" = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+        self._stores = 0
+        self._evictions = 0
+        self._expirations = 0
+    
+    def lookup(
+        self, invocation_id: str, key: str, volatile: FrozenSet[str] = frozenset()
+    ) -> Optional["LlmResponse"]:
+        """
+        Return the cached reply for ``key``, or remember the key so the
+        model's reply to this invocation can be stored.
+        
+        Args:
+            invocation_id: Invocation whose reply :meth:`store` will receive
+            key: Cache key from :func:`make_key`
+            volatile: Values from :func:`volatile_values`; a reply quoting
+                any of them is not stored
+        """
+        value, expired = self.backend.get(key, time.time())
+        with self._lock:
+            if expired:
+                self._expirations += 1
+            if value is not None:
+                self._hits += 1
+            else:
+                self._misses += 1
+                self._pending[invocation_id] = (key, volatile)
+                self._pending.move_to_end(invocation_id)
+                while len(self._pending) > _MAX_PENDING:
+                    self._pending.popitem(last=False)
+        if value is None:
+            return None
+        try:
+            return self.parse(value)
+        except ValueError as e:
+            logger.warning(f"Discarding unreadable response cache entry: {e}")
+            return None
+    
+    def store(self, invocation_id: str, llm_response: "LlmResponse") -> None:
+        """Store the model's reply for the key remembered by :meth:`lookup`."""
+        if llm_response.partial:
+            # Streamed chunks precede the complete reply; wait for that
+            return
+        with self._lock:
+            pending = self._pending.pop(invocation_id, None)
+        if pending is None:
+            return
+        key, volatile = pending
+        if not _cacheable(llm_response, volatile):
+            return
+        value = llm_response.model_dump_json(exclude_none=True)
+        evicted = self.backend.put(key, value, time.time() + self.ttl_seconds)
+        with self._lock:
+            self._stores += 1
+            self._evictions += evicted
+    
+    def stats(self) -> dict:
+        """
+        Return cache effectiveness counters.
+        
+        Returns:
+            Dictionary with backend, hits, misses, hit rate, stores,
+            evictions, expirations and current entry count
+        """
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "backend": self.backend.name,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": round(self._hits / lookups, 4) if lookups else 0.0,
+                "stores": self._stores,
+                "evictions": self._evictions,
+                "expirations": self._expirations,
+                "entries": len(self.backend),
+                "max_entries": self.backend.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+            }
+
+
+_cache: Optional[ResponseCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_response_cache() -> Optional[ResponseCache]:
+    """
+    Return the process-wide response cache, creating it on first use.
+    
+    Returns:
+        The shared ResponseCache, or None if caching is disabled
+        
+    Raises:
+        ValueError: If RESPONSE_CACHE_BACKEND is not 'memory' or 'sqlite'
+    """
+    global _cache
+    if not Config.RESPONSE_CACHE_ENABLED:
+        return None
+    
+    with _cache_lock:
+        if _cache is None:
+            backend_name = Config.RESPONSE_CACHE_BACKEND
+            max_entries = Config.RESPONSE_CACHE_MAX_ENTRIES
+            backend: Backend
+            if backend_name == "memory":
+                backend = MemoryBackend(max_entries)
+            elif backend_name == "sqlite":
+                path = Path(Config.RESPONSE_CACHE_PATH)
+                if not path.is_absolute():
+                    path = Config.get_project_root() / path
+                backend = SQLiteBackend(path, max_entries)
+            else:
+                raise ValueError(
+                    f"Unknown RESPONSE_CACHE_BACKEND: {backend_name!r} "
+                    f"(expected 'memory' or 'sqlite')"
+                )
+            # ADK is only needed once a cache exists, so the key and
+            # storage logic above import without it
+            from google.adk.models import LlmResponse
+            
+            _cache = ResponseCache(
+                backend,
+                Config.RESPONSE_CACHE_TTL_SECONDS,
+                LlmResponse.model_validate_json,
+            )
+            logger.info(f"Response cache enabled ({backend_name} backend)")
+        return _cache
+
+
+def before_model_callback(
+    callback_context: "CallbackContext", llm_request: "LlmRequest"
+) -> Optional["LlmResponse"]:
+    """
+    ADK before-model callback: answer from the cache when possible.
+    
+    Returns:
+        The cached reply, which makes ADK skip the model call, or None
+    """
+    cache = get_response_cache()
+    if cache is None:
+        return None
+    documents = callback_context.state.get(DOCUMENTS_STATE_KEY) or {}
+    key = make_key(llm_request, documents, get_current_datetime("%Y-%m-%d"))
+    response = cache.lookup(
+        callback_context.invocation_id, key, volatile_values(llm_request)
+    )
+    if response is not None:
+        logger.info(f"Response cache hit ({key[:12]})")
+    return response
+
+
+def after_model_callback(
+    callback_context: "CallbackContext", llm_response: "LlmResponse"
+) -> Optional["LlmResponse"]:
+    """
+    ADK after-model callback: store cacheable model replies.
+    
+    Returns:
+        None, so ADK uses the model's reply unchanged
+    """
+    cache = get_response_cache()
+    if cache is not None:
+        cache.store(callback_context.invocation_id, llm_response)
+    return None
+
+
+def get_response_cache_stats() -> dict:
+    """
+    Report how many model calls the response cache has saved.
+    
+    Returns:
+        Dictionary with hits, misses, hit rate and eviction counters, or
+        {"enabled": False} if the cache is disabled
+    """
+    cache = get_response_cache()
+    if cache is None:
+        return {"enabled": False}
+    return {"enabled": True, **cache.stats()}
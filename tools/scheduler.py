@@ -0,0 +1,726 @@
+"""
+Study plan scheduling engine for Taskify Agent.
+
+This module turns exams, weighted topics and student availability into a
+day-by-day study plan, enforcing the planning rules (2-hour blocks with
+10-minute breaks, a daily study cap, revision the day before each exam)
+deterministically so the model only has to format the result. Generated
+plans are kept in memory so a missed session can be replanned incrementally.
+"""
+
+import heapq
+import logging
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field, replace
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional, Set, Tuple
+
+from config import Config
+from tools.datetime_tools import get_current_datetime, parse_date
+
+logger = logging.getLogger(__name__)
+
+# Planning rules from the agent instruction
+BLOCK_MINUTES = 120
+BREAK_MINUTES = 10
+MAX_STUDY_HOURS_PER_DAY = 8
+MINUTES_PER_DAY = 24 * 60
+EMERGENCY_DAYS = 3
+
+_WEEKDAYS = {
+    name: index
+    for index, names in enumerate((
+        ("monday", "mon"), ("tuesday", "tue"), ("wednesday", "wed"),
+        ("thursday", "thu"), ("friday", "fri"), ("saturday", "sat"),
+        ("sunday", "sun"),
+    ))
+    for name in names
+}
+
+
+@dataclass
+class _Demand:
+    """Remaining study time for one topic."""
+    
+    subject: str
+    topic: str
+    weight: float
+    minutes: int
+    deadline: date  # Last day the topic may be studied (inclusive)
+
+
+@dataclass
+class _Availability:
+    """Normalized daily availability."""
+    
+    daily_minutes: int
+    start_minute: int
+    weekdays_off: Set[int]
+    dates_off: Set[date]
+    
+    def minutes_on(self, day: date) -> int:
+        if day in self.dates_off or day.weekday() in self.weekdays_off:
+            return 0
+        return self.daily_minutes
+
+
+@dataclass
+class _PlanState:
+    """A generated plan plus the inputs needed to replan part of it."""
+    
+    start: date
+    end: date
+    exam_dates: Dict[str, date]
+    availability: _Availability
+    # Weight and deadline per (subject, topic); minutes are not used
+    topics: Dict[Tuple[str, str], _Demand]
+    days: List[dict]
+    unscheduled: Dict[Tuple[str, str], int] = field(default_factory=dict)
+
+
+_plans: "OrderedDict[str, _PlanState]" = OrderedDict()
+_plans_lock = threading.Lock()
+
+
+def _store_plan(state: _PlanState) -> str:
+    """Keep a plan for later replanning, evicting the oldest beyond the limit."""
+    plan_id = uuid.uuid4().hex[:12]
+    with _plans_lock:
+        _plans[plan_id] = state
+        while len(_plans) > Config.PLAN_STORE_MAX_PLANS:
+            _plans.popitem(last=False)
+    return plan_id
+
+
+def _load_plan(plan_id: str) -> _PlanState:
+    """Return a stored plan, marking it most recently used."""
+    with _plans_lock:
+        state = _plans.get(plan_id)
+        if state is None:
+            raise ValueError(
+                f"Unknown plan_id: {plan_id} (generate a new plan first)"
+            )
+        _plans.move_to_end(plan_id)
+        return state
+
+
+def get_plan_days(plan_id: str) -> List[dict]:
+    """
+    Return the days of a stored plan, including any replans.
+    
+    Args:
+        plan_id: Identifier returned by :func:`generate_study_plan`
+        
+    Returns:
+        Plan days in date order, each with 'date', 'sessions' and
+        'study_minutes' keys; treat them as read-only
+        
+    Raises:
+        ValueError: If the plan is unknown or was evicted
+    """
+    return list(_load_plan(plan_id).days)
+
+
+def _to_date(value: str, field: str) -> date:
+    """Parse a date string or raise ValueError naming the field."""
+    parsed = parse_date(value)
+    if parsed is None:
+        raise ValueError(f"Invalid date for {field}: {value}")
+    return parsed.date()
+
+
+def _round_to_slot(minutes: float) -> int:
+    """Round minutes up to the configured slot size."""
+    slot = Config.STUDY_SLOT_MINUTES
+    return int(-(-minutes // slot) * slot)
+
+
+def _parse_availability(availability: Optional[dict]) -> _Availability:
+    """Normalize the availability dictionary given to the tool."""
+    availability = availability or {}
+    
+    hours = float(availability.get("hours_per_day", Config.DEFAULT_STUDY_HOURS))
+    if hours <= 0:
+        raise ValueError("hours_per_day must be positive")
+    if hours > MAX_STUDY_HOURS_PER_DAY:
+        logger.warning(
+            f"Requested {hours}h/day exceeds the {MAX_STUDY_HOURS_PER_DAY}h cap"
+        )
+        hours = MAX_STUDY_HOURS_PER_DAY
+    
+    start = availability.get("start_time", "09:00")
+    try:
+        start_clock = datetime.strptime(start, "%H:%M")
+    except ValueError:
+        raise ValueError(f"Invalid start_time: {start} (expected HH:MM)")
+    
+    daily_minutes = (
+        int(hours * 60) // Config.STUDY_SLOT_MINUTES * Config.STUDY_SLOT_MINUTES
+    )
+    start_minute = start_clock.hour * 60 + start_clock.minute
+    # Sessions must finish by midnight: plan times are wall-clock times of
+    # one calendar day
+    day_end = start_minute + _day_span(daily_minutes)
+    if day_end > MINUTES_PER_DAY:
+        latest = _clock(MINUTES_PER_DAY - _day_span(daily_minutes))
+        raise ValueError(
+            f"start_time {start} with {hours:g}h of study runs past midnight "
+            f"(until {_clock(day_end)} with breaks); start by {latest} or "
+            f"study fewer hours_per_day"
+        )
+    
+    weekdays_off = set()
+    dates_off = set()
+    for day in availability.get("days_off", []):
+        weekday = _WEEKDAYS.get(str(day).strip().lower())
+        if weekday is not None:
+            weekdays_off.add(weekday)
+        else:
+            dates_off.add(_to_date(day, "days_off"))
+    
+    return _Availability(
+        daily_minutes=daily_minutes,
+        start_minute=start_minute,
+        weekdays_off=weekdays_off,
+        dates_off=dates_off,
+    )
+
+
+def _day_span(daily_minutes: int) -> int:
+    """Minutes from a day's first session to its last, breaks included."""
+    breaks = max(daily_minutes - 1, 0) // BLOCK_MINUTES
+    return daily_minutes + breaks * BREAK_MINUTES
+
+
+def _clock(minute: int) -> str:
+    """Format minutes after midnight as HH:MM."""
+    return f"{minute // 60:02d}:{minute % 60:02d}"
+
+
+# (priority key, index into the demand list)
+_HeapEntry = Tuple[Tuple[float, int, str, str], int]
+
+
+def _priority(demand: _Demand, day: date) -> Tuple[float, int, str, str]:
+    """Heap key: weighted urgency first, then earliest deadline."""
+    days_left = max((demand.deadline - day).days + 1, 1)
+    return (-demand.weight / days_left, days_left, demand.subject, demand.topic)
+
+
+class _DayBuilder:
+    """Lays out one day's blocks, inserting breaks every 2 hours of study."""
+    
+    def __init__(self, day: date, start_minute: int):
+        self.day = day
+        self.clock = start_minute
+        self.since_break = 0
+        self.sessions: List[dict] = []
+    
+    def room(self) -> int:
+        """Minutes that fit before the next break is due."""
+        if self.since_break >= BLOCK_MINUTES:
+            return BLOCK_MINUTES
+        return BLOCK_MINUTES - self.since_break
+    
+    def add(self, subject: str, topic: str, kind: str, minutes: int) -> None:
+        """Append a block of ``minutes`` (at most :meth:`room`)."""
+        if self.since_break >= BLOCK_MINUTES:
+            self._append("Break", "-", "break", BREAK_MINUTES)
+            self.since_break = 0
+        self._append(subject, topic, kind, minutes)
+        self.since_break += minutes
+    
+    def _append(self, subject: str, topic: str, kind: str, minutes: int) -> None:
+        self.sessions.append({
+            "start": _clock(self.clock),
+            "end": _clock(self.clock + minutes),
+            "kind": kind,
+            "subject": subject,
+            "topic": topic,
+            "minutes": minutes,
+        })
+        self.clock += minutes
+    
+    def to_dict(self) -> dict:
+        return {
+            "date": self.day.isoformat(),
+            "sessions": self.sessions,
+            "study_minutes": sum(
+                s["minutes"] for s in self.sessions if s["kind"] != "break"
+            ),
+        }
+
+
+def _revision_days(exam_dates: Dict[str, date]) -> Dict[date, List[str]]:
+    """Map each revision day (the day before an exam) to its subjects."""
+    revision: Dict[date, List[str]] = {}
+    for subject, exam_day in exam_dates.items():
+        revision.setdefault(exam_day - timedelta(days=1), []).append(subject)
+    return {day: sorted(subjects) for day, subjects in revision.items()}
+
+
+def _plan_revision(builder: _DayBuilder, subjects: List[str], budget: int) -> None:
+    """Split a revision day's budget evenly between the examined subjects."""
+    slot = Config.STUDY_SLOT_MINUTES
+    share = budget // len(subjects) // slot * slot
+    # The last subject also takes any rounding remainder
+    shares = [share] * (len(subjects) - 1) + [budget - share * (len(subjects) - 1)]
+    for subject, minutes in zip(subjects, shares):
+        while minutes > 0:
+            block = min(minutes, builder.room())
+            builder.add(subject, "Revision", "revision", block)
+            minutes -= block
+
+
+def _allocate(
+    start: date,
+    end: date,
+    demands: List[_Demand],
+    exam_dates: Dict[str, date],
+    availability: _Availability,
+) -> List[dict]:
+    """
+    Allocate topic demands to study blocks between two dates.
+    
+    Each day the open demands are ranked in a priority queue by weight
+    divided by days until their deadline. Blocks are taken from the top,
+    skipping the subject of the previous block when another is available
+    so subjects alternate. Days before an exam are reserved for revision of
+    that subject. Demands are updated in place with the minutes left over.
+    
+    Args:
+        start: First day to plan (inclusive)
+        end: Last day to plan (inclusive)
+        demands: Topic demands; ``minutes`` is decremented as allocated
+        exam_dates: Exam date per subject
+        availability: Daily availability
+        
+    Returns:
+        One day dictionary per date in the range
+    """
+    revision_days = _revision_days(exam_dates)
+    
+    days = []
+    day = start
+    while day <= end:
+        budget = availability.minutes_on(day)
+        builder = _DayBuilder(day, availability.start_minute)
+        
+        if budget and day in revision_days:
+            _plan_revision(builder, revision_days[day], budget)
+            budget = 0
+        
+        heap: List[_HeapEntry] = [
+            (_priority(d, day), index)
+            for index, d in enumerate(demands)
+            if d.minutes > 0 and d.deadline >= day
+        ]
+        heapq.heapify(heap)
+        last_subject = None
+        while budget > 0 and heap:
+            entry = heapq.heappop(heap)
+            # Vary subjects: take the best demand of another subject, setting
+            # aside same-subject ones; repeat only if no other subject is open
+            skipped: List[_HeapEntry] = []
+            while demands[entry[1]].subject == last_subject and heap:
+                skipped.append(entry)
+                entry = heapq.heappop(heap)
+            if demands[entry[1]].subject == last_subject and skipped:
+                skipped.append(entry)
+                entry = heapq.heappop(skipped)
+            for other in skipped:
+                heapq.heappush(heap, other)
+            index = entry[1]
+            demand = demands[index]
+            
+            minutes = min(demand.minutes, budget, builder.room())
+            builder.add(demand.subject, demand.topic, "study", minutes)
+            demand.minutes -= minutes
+            budget -= minutes
+            last_subject = demand.subject
+            if demand.minutes > 0:
+                heapq.heappush(heap, (_priority(demand, day), index))
+        
+        days.append(builder.to_dict())
+        day += timedelta(days=1)
+    
+    return days
+
+
+def _build_demands(
+    topics: List[dict], exam_dates: Dict[str, date], plan_end: date
+) -> List[_Demand]:
+    """Convert tool input topics into demands with per-subject deadlines."""
+    demands = []
+    for topic in topics:
+        subject = str(topic.get("subject", "")).strip()
+        name = str(topic.get("topic") or topic.get("name") or subject).strip()
+        if not subject:
+            raise ValueError(f"Topic is missing a subject: {topic}")
+        hours = float(topic.get("hours", 1))
+        if hours <= 0:
+            continue
+        
+        exam_day = exam_dates.get(subject.lower())
+        # New material stops before the revision day; no exam means plan end
+        deadline = exam_day - timedelta(days=2) if exam_day else plan_end
+        demands.append(_Demand(
+            subject=subject,
+            topic=name,
+            weight=float(topic.get("weight", 1.0)),
+            minutes=_round_to_slot(hours * 60),
+            deadline=deadline,
+        ))
+    return demands
+
+
+def _remaining_minutes(demands: List[_Demand]) -> Dict[Tuple[str, str], int]:
+    """Total minutes left over per (subject, topic)."""
+    remaining: Dict[Tuple[str, str], int] = {}
+    for d in demands:
+        if d.minutes > 0:
+            key = (d.subject, d.topic)
+            remaining[key] = remaining.get(key, 0) + d.minutes
+    return remaining
+
+
+def _summarize(
+    demands: List[_Demand], exam_dates: Dict[str, date], start: date
+) -> Tuple[List[dict], List[str]]:
+    """Report unscheduled work and planning warnings."""
+    unscheduled = [
+        {"subject": d.subject, "topic": d.topic, "hours": round(d.minutes / 60, 2)}
+        for d in demands
+        if d.minutes > 0
+    ]
+    
+    warnings = []
+    short: Dict[str, int] = {}
+    for d in demands:
+        if d.minutes > 0:
+            short[d.subject] = short.get(d.subject, 0) + d.minutes
+    for subject, minutes in sorted(short.items()):
+        warnings.append(
+            f"Not enough time for {subject}: {minutes / 60:.1f}h of topics "
+            f"could not be scheduled before the exam"
+        )
+    for subject, exam_day in sorted(exam_dates.items(), key=lambda item: item[1]):
+        days_left = (exam_day - start).days
+        if 0 <= days_left <= EMERGENCY_DAYS:
+            warnings.append(
+                f"Emergency mode: {subject} exam is in {days_left} days"
+            )
+    return unscheduled, warnings
+
+
+def generate_study_plan(
+    exams: List[dict],
+    topics: List[dict],
+    availability: Optional[dict] = None,
+    start_date: Optional[str] = None,
+) -> dict:
+    """
+    Generate a day-by-day study plan that follows the planning rules.
+    
+    Rules enforced: study blocks of at most 2 hours with a 10-minute break
+    after every 2 hours of study, at most 8 hours of study per day, the day
+    before each exam reserved for revision of that subject, and no new
+    material for a subject after its revision day. Higher-weight topics and
+    nearer exams are scheduled first, and subjects alternate between blocks.
+    
+    Args:
+        exams: List of {"subject": str, "date": str} exam entries
+        topics: List of {"subject": str, "topic": str, "hours": float,
+            "weight": float} entries; weight defaults to 1
+        availability: Optional {"hours_per_day": float, "start_time":
+            "HH:MM", "days_off": [weekday names or dates]}; the day's
+            sessions and breaks must end by midnight
+        start_date: First day of the plan; defaults to today
+        
+    Returns:
+        Dictionary with 'plan_id' (for :func:`replan_study_plan`),
+        'start_date', 'end_date', 'days' (each with 'date', 'sessions' and
+        'study_minutes'), 'unscheduled' and 'warnings' keys
+        
+    Raises:
+        ValueError: If an exam date, start date or availability is invalid
+    """
+    began = time.perf_counter()
+    state, plan = _build_plan(exams, topics, availability, start_date)
+    plan_id = _store_plan(state)
+    
+    elapsed_ms = (time.perf_counter() - began) * 1000
+    logger.info(
+        f"Generated study plan for {len(state.days)} days and "
+        f"{len(state.topics)} topics in {elapsed_ms:.1f}ms"
+    )
+    return {"plan_id": plan_id, **plan}
+
+
+def _build_plan(
+    exams: List[dict],
+    topics: List[dict],
+    availability: Optional[dict],
+    start_date: Optional[str],
+) -> Tuple[_PlanState, dict]:
+    """
+    Build a study plan without storing it.
+    
+    Takes the arguments of :func:`generate_study_plan`.
+    
+    Returns:
+        The plan state for replanning, and the plan dictionary without
+        'plan_id'
+    """
+    start = _to_date(
+        start_date or get_current_datetime("%Y-%m-%d"), "start_date"
+    )
+    avail = _parse_availability(availability)
+    
+    exam_dates: Dict[str, date] = {}
+    display_names: Dict[str, str] = {}
+    for exam in exams:
+        subject = str(exam.get("subject", "")).strip()
+        if not subject:
+            raise ValueError(f"Exam is missing a subject: {exam}")
+        exam_day = _to_date(str(exam.get("date", "")), f"exam '{subject}'")
+        if exam_day < start:
+            continue
+        key = subject.lower()
+        if key not in exam_dates or exam_day < exam_dates[key]:
+            exam_dates[key] = exam_day
+            display_names[key] = subject
+    
+    end = max(exam_dates.values(), default=start + timedelta(days=6))
+    demands = _build_demands(topics, exam_dates, end)
+    named_exams = {display_names[k]: d for k, d in exam_dates.items()}
+    topic_info: Dict[Tuple[str, str], _Demand] = {}
+    for d in demands:
+        topic_info.setdefault((d.subject, d.topic), replace(d))
+    
+    days = _allocate(start, end, demands, named_exams, avail)
+    unscheduled, warnings = _summarize(demands, named_exams, start)
+    
+    state = _PlanState(
+        start=start,
+        end=end,
+        exam_dates=named_exams,
+        availability=avail,
+        topics=topic_info,
+        days=days,
+        unscheduled=_remaining_minutes(demands),
+    )
+    
+    return state, {
+        "start_date": start.isoformat(),
+        "end_date": end.isoformat(),
+        "exams": [
+            {"subject": subject, "date": exam_day.isoformat()}
+            for subject, exam_day in sorted(named_exams.items(), key=lambda i: i[1])
+        ],
+        "days": days,
+        "unscheduled": unscheduled,
+        "warnings": warnings,
+    }
+
+
+def _window_demands(
+    state: _PlanState, days: List[dict], extra: Dict[Tuple[str, str], int]
+) -> List[_Demand]:
+    """Turn the study sessions in ``days`` plus extra minutes back into demands."""
+    minutes = dict(extra)
+    for day in days:
+        for session in day["sessions"]:
+            if session["kind"] == "study" and not session.get("missed"):
+                key = (session["subject"], session["topic"])
+                minutes[key] = minutes.get(key, 0) + session["minutes"]
+    return [
+        replace(state.topics[key], minutes=total)
+        for key, total in sorted(minutes.items())
+        if key in state.topics
+    ]
+
+
+def _mark_missed(
+    day: dict, subjects: Optional[Set[str]]
+) -> Tuple[dict, Dict[Tuple[str, str], int], List[str]]:
+    """
+    Flag a day's sessions as missed.
+    
+    Returns:
+        The updated day, study minutes to reschedule per (subject, topic),
+        and subjects whose revision was missed
+    """
+    sessions = []
+    moved: Dict[Tuple[str, str], int] = {}
+    lost_revision = []
+    for session in day["sessions"]:
+        if (
+            session["kind"] != "break"
+            and not session.get("missed")
+            and (subjects is None or session["subject"].lower() in subjects)
+        ):
+            session = dict(session, missed=True)
+            if session["kind"] == "study":
+                key = (session["subject"], session["topic"])
+                moved[key] = moved.get(key, 0) + session["minutes"]
+            elif session["subject"] not in lost_revision:
+                lost_revision.append(session["subject"])
+        sessions.append(session)
+    
+    updated = {
+        "date": day["date"],
+        "sessions": sessions,
+        "study_minutes": sum(
+            s["minutes"]
+            for s in sessions
+            if s["kind"] != "break" and not s.get("missed")
+        ),
+    }
+    return updated, moved, lost_revision
+
+
+def replan_study_plan(
+    plan_id: str,
+    missed_date: str,
+    missed_subjects: Optional[List[str]] = None,
+    availability: Optional[dict] = None,
+    resume_date: Optional[str] = None,
+) -> dict:
+    """
+    Replan a stored study plan after missed sessions, touching only affected days.
+    
+    Sessions on the missed day are flagged as missed and their study time is
+    returned to the topics it was for. Only the days from the resume date up
+    to the last deadline of the affected subjects are reallocated; the
+    window grows only if work displaced from it has a later deadline. Days
+    outside the window keep their sessions unchanged. Topic time left
+    unscheduled earlier is retried when the window covers its deadline, so
+    extra availability can absorb it.
+    
+    Args:
+        plan_id: Identifier returned by :func:`generate_study_plan`
+        missed_date: Day whose sessions were missed
+        missed_subjects: Only these subjects were missed; defaults to all
+            sessions of the day
+        availability: New availability from the resume date onward; when
+            given, every remaining day is replanned
+        resume_date: First day to reschedule into; defaults to the day after
+            the missed day
+            
+    Returns:
+        Dictionary with 'plan_id', 'replanned_from', 'replanned_to' (None
+        when no days needed reallocating), 'missed_minutes', 'days' (only
+        the days that changed), 'unchanged_days', 'unscheduled' and
+        'warnings' keys
+        
+    Raises:
+        ValueError: If the plan is unknown or a date is outside the plan
+    """
+    began = time.perf_counter()
+    state = _load_plan(plan_id)
+    
+    missed = _to_date(missed_date, "missed_date")
+    if not state.start <= missed <= state.end:
+        raise ValueError(
+            f"missed_date {missed} is outside the plan "
+            f"({state.start} to {state.end})"
+        )
+    resume = (
+        _to_date(resume_date, "resume_date")
+        if resume_date
+        else missed + timedelta(days=1)
+    )
+    if resume <= missed:
+        raise ValueError("resume_date must be after missed_date")
+    
+    subjects = (
+        {str(s).strip().lower() for s in missed_subjects}
+        if missed_subjects
+        else None
+    )
+    missed_index = (missed - state.start).days
+    missed_day, moved, lost_revision = _mark_missed(
+        state.days[missed_index], subjects
+    )
+    
+    avail = state.availability
+    if availability is not None:
+        avail = _parse_availability(availability)
+        window_end = state.end
+    elif moved:
+        window_end = min(
+            max(state.topics[key].deadline for key in moved), state.end
+        )
+    else:
+        window_end = resume - timedelta(days=1)
+    
+    # Displaced work with a later deadline pushes the window further out
+    while True:
+        lo = max((resume - state.start).days, 0)
+        hi = max((window_end - state.start).days + 1, lo)
+        old_days = state.days[lo:hi]
+        # Work left unscheduled earlier gets another chance when the window
+        # covers every remaining day before its deadline
+        retried = {
+            key: minutes
+            for key, minutes in state.unscheduled.items()
+            if key in state.topics
+            and resume <= state.topics[key].deadline <= window_end
+        }
+        extra = dict(moved)
+        for key, minutes in retried.items():
+            extra[key] = extra.get(key, 0) + minutes
+        demands = _window_demands(state, old_days, extra)
+        new_days = _allocate(resume, window_end, demands, state.exam_dates, avail)
+        spill = [
+            d.deadline for d in demands if d.minutes > 0 and d.deadline > window_end
+        ]
+        if not spill or window_end >= state.end:
+            break
+        window_end = min(max(spill), state.end)
+    
+    unscheduled = {
+        key: minutes
+        for key, minutes in state.unscheduled.items()
+        if key not in retried
+    }
+    for key, minutes in _remaining_minutes(demands).items():
+        unscheduled[key] = unscheduled.get(key, 0) + minutes
+    
+    days = list(state.days)
+    days[missed_index] = missed_day
+    days[lo:hi] = new_days
+    changed = [missed_day] if missed_day != state.days[missed_index] else []
+    changed.extend(new for old, new in zip(old_days, new_days) if new != old)
+    
+    state.days = days
+    state.unscheduled = unscheduled
+    state.availability = avail
+    
+    pending = [replace(state.topics[key], minutes=m) for key, m in unscheduled.items()]
+    unscheduled_list, warnings = _summarize(pending, state.exam_dates, resume)
+    for subject in lost_revision:
+        warnings.append(
+            f"Missed revision for {subject} cannot be moved before its exam"
+        )
+    
+    elapsed_ms = (time.perf_counter() - began) * 1000
+    logger.info(
+        f"Replanned {len(new_days)} of {len(days)} days for plan {plan_id} "
+        f"({len(changed)} changed) in {elapsed_ms:.1f}ms"
+    )
+    
+    return {
+        "plan_id": plan_id,
+        "replanned_from": resume.isoformat(),
+        "replanned_to": window_end.isoformat() if new_days else None,
+        "missed_minutes": sum(moved.values()),
+        "days": changed,
+        "unchanged_days": len(days) - len(changed),
+        "unscheduled": unscheduled_list,
+        "warnings": warnings,
+    }
@@ -0,0 +1,375 @@
+"""
+Tool and model telemetry for Taskify Agent.
+
+This module times every registered tool call, per-page PDF extraction and
+model round trips, keeping counters and latency histograms in process and
+rendering them in the Prometheus text format. Each tool call and model
+call is also logged as a structured record (JSON with LOG_JSON=true).
+
+With TELEMETRY_ENABLED=false nothing is wrapped and the page hook is a
+single flag check, so disabled telemetry costs effectively nothing.
+"""
+
+import functools
+import inspect
+import json
+import logging
+import os
+import threading
+import time
+from bisect import bisect_left
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+# Histogram bucket upper bounds, in seconds
+_TOOL_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+_PAGE_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1)
+_MODEL_BUCKETS = (0.1, 0.25, 0.5, 1, 2, 4, 8, 15, 30, 60)
+
+# Tool arguments holding paths whose file size counts as input bytes
+_PATH_ARGS = frozenset({"file_path", "file_paths", "syllabus_file"})
+
+# Most model calls awaiting their after-callback at once (per process)
+_MAX_PENDING = 4096
+
+Labels = Tuple[str, ...]
+
+
+def _format_labels(names: Tuple[str, ...], values: Labels, extra: str = "") -> str:
+    pairs = [f'{name}="{value}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class Counter:
+    """Monotonic counter with optional labels."""
+    
+    def __init__(self, name: str, help_text: str, label_names: Tuple[str, ...] = ()):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = label_names
+        self._values: Dict[Labels, float] = {}
+        self._lock = threading.Lock()
+        _REGISTRY.append(self)
+    
+    def inc(self, amount: float = 1, labels: Labels = ()) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+    
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for labels, value in sorted(self._values.items()):
+                lines.append(
+                    f"{self.name}{_format_labels(self.label_names, labels)} {value:g}"
+                )
+        return lines
+
+
+class Histogram:
+    """Cumulative-bucket histogram with optional labels."""
+    
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        buckets: Tuple[float, ...],
+        label_names: Tuple[str, ...] = (),
+    ):
+        self.name = name
+        self.help_text = help_text
+        self.buckets = buckets
+        self.label_names = label_names
+        # labels -> [per-bucket counts (+Inf last), sum, count]
+        self._series: Dict[Labels, list] = {}
+        self._lock = threading.Lock()
+        _REGISTRY.append(self)
+    
+    def observe(self, value: float, labels: Labels = ()) -> None:
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+    
+    def render(self) -> List[str]:
+        lines = [
+            f"# HELP {self.name} {self.help_text}",
+            f"# TYPE {self.name} histogram",
+        ]
+        with self._lock:
+            for labels, (counts, total, count) in sorted(self._series.items()):
+                cumulative = 0
+                bounds = [f"{bound:g}" for bound in self.buckets] + ["+Inf"]
+                for bound, bucket_count in zip(bounds, counts):
+                    cumulative += bucket_count
+                    bucket_labels = _format_labels(
+                        self.label_names, labels, f'le="{bound}"'
+                    )
+                    lines.append(f"{self.name}_bucket{bucket_labels} {cumulative}")
+                series_labels = _format_labels(self.label_names, labels)
+                lines.append(f"{self.name}_sum{series_labels} {total:.6f}")
+                lines.append(f"{self.name}_count{series_labels} {count}")
+        return lines
+
+
+_REGISTRY: List[Any] = []
+
+TOOL_SECONDS = Histogram(
+    "taskify_tool_duration_seconds", "Tool call latency.", _TOOL_BUCKETS, ("tool",)
+)
+TOOL_CALLS = Counter(
+    "taskify_tool_calls_total", "Tool calls by outcome.", ("tool", "status")
+)
+TOOL_BYTES_IN = Counter(
+    "taskify_tool_input_bytes_total",
+    "Tool input bytes (sizes of files named in arguments plus text arguments).",
+    ("tool",),
+)
+TOOL_BYTES_OUT = Counter(
+    "taskify_tool_output_bytes_total", "JSON-encoded tool result bytes.", ("tool",)
+)
+PAGE_SECONDS = Histogram(
+    "taskify_pdf_page_extract_seconds",
+    "Text extraction time per PDF page (in-process extraction).",
+    _PAGE_BUCKETS,
+)
+PAGES_SKIPPED = Counter(
+    "taskify_pdf_pages_skipped_total",
+    "PDF pages not extracted because of the per-type page/text budget.",
+    ("doc_type",),
+)
+SECONDS_SAVED = Counter(
+    "taskify_pdf_extract_seconds_saved_total",
+    "Estimated extraction time saved by per-type budgets.",
+    ("doc_type",),
+)
+MODEL_SECONDS = Histogram(
+    "taskify_model_round_trip_seconds",
+    "Model call round-trip time.",
+    _MODEL_BUCKETS,
+    ("model",),
+)
+MODEL_CALLS = Counter(
+    "taskify_model_calls_total", "Model calls by outcome.", ("model", "status")
+)
+
+_pending_lock = threading.Lock()
+_pending_model_calls: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+
+
+def enabled() -> bool:
+    """Return whether telemetry is being collected."""
+    return Config.TELEMETRY_ENABLED
+
+
+def observe_page(seconds: float) -> None:
+    """Record the extraction time of one PDF page."""
+    PAGE_SECONDS.observe(seconds)
+
+
+def observe_budget_cutoff(doc_type: str, pages: int, seconds: float) -> None:
+    """Record pages skipped by an extraction budget and the time saved."""
+    PAGES_SKIPPED.inc(pages, (doc_type,))
+    SECONDS_SAVED.inc(seconds, (doc_type,))
+
+
+def _input_bytes(arguments: Dict[str, Any]) -> int:
+    """Count file sizes of path arguments and the length of text arguments."""
+    total = 0
+    for name, value in arguments.items():
+        if name in _PATH_ARGS:
+            for path in value if isinstance(value, list) else [value]:
+                try:
+                    total += os.path.getsize(path)
+                except (OSError, TypeError):
+                    continue
+        elif isinstance(value, str):
+            total += len(value.encode("utf-8"))
+    return total
+
+
+def _output_bytes(result: Any) -> int:
+    if isinstance(result, str):
+        return len(result.encode("utf-8"))
+    return len(json.dumps(result, default=str, ensure_ascii=False).encode("utf-8"))
+
+
+def _record_tool_call(
+    name: str,
+    started: float,
+    arguments: Dict[str, Any],
+    result: Any,
+    error: Optional[BaseException],
+) -> None:
+    seconds = time.perf_counter() - started
+    status = "ok" if error is None else "error"
+    bytes_in = _input_bytes(arguments)
+    bytes_out = _output_bytes(result) if error is None else 0
+    
+    TOOL_SECONDS.observe(seconds, (name,))
+    TOOL_CALLS.inc(1, (name, status))
+    TOOL_BYTES_IN.inc(bytes_in, (name,))
+    TOOL_BYTES_OUT.inc(bytes_out, (name,))
+    
+    fields = {
+        "event": "tool_call",
+        "tool": name,
+        "status": status,
+        "duration_ms": round(seconds * 1000, 3),
+        "bytes_in": bytes_in,
+        "bytes_out": bytes_out,
+    }
+    if error is not None:
+        fields["error"] = f"{type(error).__name__}: {error}"
+    logger.info(
+        f"Tool {name} {status} in {seconds * 1000:.1f}ms "
+        f"({bytes_in} bytes in, {bytes_out} bytes out)",
+        extra=fields,
+    )
+
+
+def instrument_tool(func: Callable[..., Any], name: Optional[str] = None) -> Callable:
+    """
+    Wrap a tool function so each call is timed, counted and logged.
+    
+    The wrapper keeps the function's name, docstring and signature (ADK
+    builds the tool declaration from them) and stays a coroutine function
+    when ``func`` is one. When telemetry is disabled ``func`` is returned
+    unchanged.
+    
+    Args:
+        func: Tool function, sync or async
+        name: Metric label; defaults to the function name
+        
+    Returns:
+        The instrumented function, or ``func`` itself when disabled
+    """
+    if not enabled():
+        return func
+    name = name or func.__name__
+    signature = inspect.signature(func)
+    
+    def arguments(args: tuple, kwargs: dict) -> Dict[str, Any]:
+        try:
+            return signature.bind_partial(*args, **kwargs).arguments
+        except TypeError:
+            return kwargs
+    
+    if inspect.iscoroutinefunction(func):
+        @functools.wraps(func)
+        async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+            started = time.perf_counter()
+            try:
+                result = await func(*args, **kwargs)
+            except Exception as e:
+                _record_tool_call(name, started, arguments(args, kwargs), None, e)
+                raise
+            _record_tool_call(name, started, arguments(args, kwargs), result, None)
+            return result
+        
+        return async_wrapper
+    
+    @functools.wraps(func)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        started = time.perf_counter()
+        try:
+            result = func(*args, **kwargs)
+        except Exception as e:
+            _record_tool_call(name, started, arguments(args, kwargs), None, e)
+            raise
+        _record_tool_call(name, started, arguments(args, kwargs), result, None)
+        return result
+    
+    return wrapper
+
+
+def instrument_tools(tools: List[Any]) -> List[Any]:
+    """
+    Instrument the functions behind ADK ``FunctionTool`` objects in place.
+    
+    Args:
+        tools: FunctionTools to instrument
+        
+    Returns:
+        The same list, for use directly in the agent definition
+    """
+    if enabled():
+        for tool in tools:
+            tool.func = instrument_tool(tool.func, tool.name)
+    return tools
+
+
+def model_call_started(callback_context: Any, llm_request: Any) -> None:
+    """Start timing a model call (from an ADK before-model callback)."""
+    model = llm_request.model or Config.AGENT_MODEL
+    with _pending_lock:
+        _pending_model_calls[callback_context.invocation_id] = (
+            time.perf_counter(),
+            model,
+        )
+        while len(_pending_model_calls) > _MAX_PENDING:
+            _pending_model_calls.popitem(last=False)
+
+
+def model_call_finished(callback_context: Any, llm_response: Any) -> None:
+    """Record a model round trip (from an ADK after-model callback)."""
+    if llm_response.partial:
+        # Streamed chunks precede the complete reply; time to that
+        return
+    with _pending_lock:
+        pending = _pending_model_calls.pop(callback_context.invocation_id, None)
+    if pending is None:
+        return
+    started, model = pending
+    seconds = time.perf_counter() - started
+    status = "error" if llm_response.error_code else "ok"
+    
+    MODEL_SECONDS.observe(seconds, (model,))
+    MODEL_CALLS.inc(1, (model, status))
+    logger.info(
+        f"Model {model} {status} in {seconds * 1000:.1f}ms",
+        extra={
+            "event": "model_call",
+            "model": model,
+            "status": status,
+            "duration_ms": round(seconds * 1000, 3),
+            "error_code": llm_response.error_code,
+        },
+    )
+
+
+def render_metrics(
+    gauges: Iterable[Tuple[str, str, float]] = (),
+    counters: Iterable[Tuple[str, str, float]] = (),
+) -> str:
+    """
+    Render all metrics in the Prometheus text exposition format.
+    
+    Args:
+        gauges: Extra point-in-time values as (name, help text, value)
+        counters: Extra monotonic totals as (name, help text, value); names
+            should end in ``_total``
+            
+    Returns:
+        Metrics text, ending with a newline
+    """
+    lines: List[str] = []
+    for metric in _REGISTRY:
+        lines.extend(metric.render())
+    for kind, extra in (("gauge", gauges), ("counter", counters)):
+        for name, help_text, value in extra:
+            lines.extend([
+                f"# HELP {name} {help_text}",
+                f"# TYPE {name} {kind}",
+                f"{name} {value:g}",
+            ])
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,275 @@
+"""
+Exam timetable parsing tools for Taskify Agent.
+
+This module turns the text of an exam timetable into compact structured
+rows (subject, date, time, days left) without involving the language model.
+"""
+
+import logging
+import re
+from datetime import date
+from typing import Dict, List, Optional
+
+from tools.datetime_tools import (
+    DateParser,
+    current_time_context,
+    infer_slash_order,
+)
+from tools.pdf_tools import classify_document, extract_pdf_text
+
+logger = logging.getLogger(__name__)
+
+# English month names and abbreviations, optionally followed by "."
+_MONTH_NAME = (
+    r"(?i:jan(?:uary)?|feb(?:ruary)?|mar(?:ch)?|apr(?:il)?|may|june?|july?"
+    r"|aug(?:ust)?|sep(?:tember)?|oct(?:ober)?|nov(?:ember)?|dec(?:ember)?)\.?"
+)
+
+# Date forms accepted by DateParser, most specific first
+_DATE_PATTERN = re.compile(
+    r"\b("
+    r"\d{4}-\d{2}-\d{2}"
+    r"|\d{1,2}/\d{1,2}/\d{4}"
+    r"|\d{1,2}-\d{1,2}-\d{4}"
+    rf"|{_MONTH_NAME} \d{{1,2}}, \d{{4}}"
+    rf"|\d{{1,2}} {_MONTH_NAME},? \d{{4}}"
+    r")\b"
+)
+
+# "10:00 AM - 1:00 PM", "09.30-12.30", "2 PM to 5 PM"
+_TIME_PATTERN = re.compile(
+    r"\b\d{1,2}(?:[:.]\d{2})?\s*(?:[AaPp]\.?[Mm]\.?)?"
+    r"(?:\s*(?:-|–|to)\s*\d{1,2}(?:[:.]\d{2})?\s*(?:[AaPp]\.?[Mm]\.?)?)?"
+    r"(?=\s|$|[,;|)])"
+)
+
+# Session labels used instead of clock times on many university timetables
+_SESSION_PATTERN = re.compile(
+    r"\b(FN|AN|Forenoon|Afternoon|Morning|Evening)\b", re.IGNORECASE
+)
+
+_WEEKDAY_PATTERN = re.compile(
+    r"\b(Mon|Tue|Tues|Wed|Thu|Thur|Thurs|Fri|Sat|Sun)(day|nesday|sday|urday)?\b\.?",
+    re.IGNORECASE,
+)
+
+# Column separators: tabs, pipes, or runs of 2+ spaces in extracted tables
+_CELL_SPLIT = re.compile(r"\t+|\s*\|\s*|\s{2,}")
+
+_SERIAL_PATTERN = re.compile(r"^\(?\d{1,3}[.)]?$")
+
+# Page numbers and similar furniture repeated on every page
+_FURNITURE_PATTERN = re.compile(
+    r"^(page\s*\d+(\s*(of|/)\s*\d+)?|\d+\s*(of|/)\s*\d+|-\s*\d+\s*-)$",
+    re.IGNORECASE,
+)
+
+# Lines under a date heading longer than this are notes, not subjects
+_MAX_SUBJECT_WORDS = 8
+
+_HEADER_WORDS = {
+    "subject", "course", "paper", "date", "time", "day", "session",
+    "s.no", "sl.no", "sno", "code", "timing", "name",
+}
+
+_SUBJECT_HEADERS = ("subject", "course", "paper", "name")
+
+# Leading words of venue and invigilation cells such as "Room 12 Block 3"
+_VENUE_WORDS = {
+    "room", "rooms", "hall", "block", "venue", "centre", "center", "building",
+    "floor", "seat", "seating", "invigilator", "invigilators", "invigilation",
+}
+
+
+def _subject_column(cells: List[str]) -> Optional[int]:
+    """Find the subject column in a header row, preferring name over code."""
+    best = None
+    for i, cell in enumerate(cells):
+        label = cell.lower().strip(" .:")
+        if not label.startswith(_SUBJECT_HEADERS) or "code" in label:
+            continue
+        if "name" in label or "title" in label:
+            return i
+        if best is None:
+            best = i
+    return best
+
+
+def _looks_like_header(cells: List[str]) -> bool:
+    """Return True if most cells of a row are column header words."""
+    words = [cell.lower().strip(" .:") for cell in cells if cell.strip()]
+    if len(words) < 2:
+        return False
+    hits = sum(
+        1 for word in words
+        if word in _HEADER_WORDS or word.split()[0] in _HEADER_WORDS
+    )
+    return hits >= max(2, len(words) - 1)
+
+
+def _find_time(line: str) -> Optional[str]:
+    """Return the exam time or session label on a line, if any."""
+    for match in _TIME_PATTERN.finditer(line):
+        # Bare numbers are serials or room numbers, not times
+        if re.search(r"[:.]\d|[AaPp]\.?[Mm]", match.group(0)):
+            return match.group(0).strip()
+    session_match = _SESSION_PATTERN.search(line)
+    return session_match.group(0) if session_match else None
+
+
+def _clean_subject(text: str) -> str:
+    """Strip leftover separators and serial numbers from a subject string."""
+    text = re.sub(r"^\s*\(?\d{1,3}[.)]\s+", "", text)
+    text = re.sub(r"\(\s*\)|\[\s*\]", "", text)
+    text = re.sub(r"\s{2,}", " ", text)
+    return text.strip(" \t-–|,:;")
+
+
+def _subject_from_cells(
+    cells: List[str], subject_column: Optional[int]
+) -> Optional[str]:
+    """Pick the subject cell from a row split into columns."""
+    if subject_column is not None and subject_column < len(cells):
+        candidate = _clean_subject(cells[subject_column])
+        if re.search(r"[A-Za-z]{2,}", candidate):
+            return candidate
+    
+    candidates = []
+    for cell in cells:
+        words = cell.lower().split()
+        if words and words[0].strip(" .:-") in _VENUE_WORDS:
+            continue
+        residue = _TIME_PATTERN.sub("", _DATE_PATTERN.sub("", cell))
+        residue = _WEEKDAY_PATTERN.sub("", _SESSION_PATTERN.sub("", residue))
+        residue = _clean_subject(residue)
+        if residue and not _SERIAL_PATTERN.match(residue) and re.search(
+            r"[A-Za-z]{2,}", residue
+        ):
+            candidates.append(residue)
+    # Subject names are usually the longest free-text cell on the row
+    return max(candidates, key=len) if candidates else None
+
+
+def parse_exam_timetable(text: str) -> List[Dict[str, Optional[object]]]:
+    """
+    Parse exam timetable text into structured rows.
+    
+    Uses layout cues from the extracted text: a header row fixes which
+    column holds the subject, cells are split on tabs, pipes or wide gaps,
+    and a date printed on its own line applies to the subject lines below
+    it (a common grouped layout).
+    
+    Args:
+        text: Extracted timetable text
+        
+    Returns:
+        List of rows with 'subject', 'date' (YYYY-MM-DD), 'time' and
+        'days_left' keys, ordered by date without duplicates
+    """
+    rows: List[Dict[str, Optional[object]]] = []
+    seen = set()
+    subject_column: Optional[int] = None
+    current_date: Optional[str] = None
+    current_time: Optional[str] = None
+    # Read every slash date in the document in the same dd/mm or mm/dd order
+    date_parser = DateParser(infer_slash_order(_DATE_PATTERN.findall(text)))
+    # One "today" for every row, in the student's timezone
+    clock = current_time_context()
+    
+    for raw_line in text.splitlines():
+        line = raw_line.strip()
+        if not line or _FURNITURE_PATTERN.match(line):
+            continue
+        
+        cells = [cell for cell in _CELL_SPLIT.split(line) if cell.strip()]
+        if _looks_like_header(cells):
+            subject_column = _subject_column(cells)
+            continue
+        
+        date_match = _DATE_PATTERN.search(line)
+        time_text = _find_time(_DATE_PATTERN.sub(" ", line))
+        
+        if len(cells) > 1:
+            subject = _subject_from_cells(cells, subject_column)
+        else:
+            subject = _subject_from_cells([line], None)
+        
+        if date_match:
+            parsed = date_parser.parse(date_match.group(1))
+            if parsed is None:
+                continue
+            current_date = parsed.strftime("%Y-%m-%d")
+            current_time = time_text
+            if not subject:
+                # Date heading for the subject lines that follow
+                continue
+        elif (
+            not subject
+            or current_date is None
+            or len(subject.split()) > _MAX_SUBJECT_WORDS
+            or subject.endswith(".")
+        ):
+            continue
+        
+        row_time = time_text or current_time
+        key = (subject.lower(), current_date, row_time)
+        if key in seen:
+            continue
+        seen.add(key)
+        
+        rows.append({
+            "subject": subject,
+            "date": current_date,
+            "time": row_time,
+            "days_left": clock.days_until(date.fromisoformat(current_date)),
+        })
+    
+    # Stable sort keeps document order for exams on the same day
+    rows.sort(key=lambda row: str(row["date"]))
+    return rows
+
+
+def extract_exam_timetable(file_path: str) -> dict:
+    """
+    Extract structured exam rows from a timetable PDF.
+    
+    The document text stays in this process; only the parsed rows are
+    returned, which keeps the model context to a few hundred bytes.
+    
+    Args:
+        file_path: Path to the timetable PDF
+        
+    Returns:
+        Dictionary with 'document_type', 'confidence', 'rows' (each with
+        'subject', 'date', 'time', 'days_left') and 'row_count' keys. When
+        the file is not classified as an exam timetable, 'rows' is empty
+        and 'message' explains why.
+    """
+    text = extract_pdf_text(file_path)
+    classification = classify_document(text)
+    
+    if classification["type"] != "exam_timetable":
+        return {
+            "document_type": classification["type"],
+            "confidence": classification["confidence"],
+            "rows": [],
+            "row_count": 0,
+            "message": "Document is not an exam timetable",
+        }
+    
+    rows = parse_exam_timetable(text)
+    logger.info(
+        f"Parsed {len(rows)} exam rows from {len(text)} characters of timetable"
+    )
+    
+    result = {
+        "document_type": classification["type"],
+        "confidence": classification["confidence"],
+        "rows": rows,
+        "row_count": len(rows),
+    }
+    if not rows:
+        result["message"] = (
+            "No exam rows recognized; fall back to extract_pdf_text"
+        )
+    return result
@@ -0,0 +1,384 @@
+"""
+Syllabus to PYQ topic matching for Taskify Agent.
+
+This module maps previous year questions onto syllabus topics with TF-IDF
+weighted character n-grams, computed with NumPy over the whole corpus at
+once, and turns the matches into compact per-topic priority weights.
+"""
+
+import logging
+import re
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from config import Config
+from tools.pdf_tools import extract_pdf_text
+from tools.pyq_index import PyqIndex, get_pyq_index
+
+logger = logging.getLogger(__name__)
+
+# Character n-gram sizes; 3- and 4-grams tolerate plurals and word forms
+_NGRAM_SIZES = (3, 4)
+
+# Multiplier for the rolling n-gram hash (wraps modulo 2**64)
+_HASH_BASE = np.uint64(1099511628211)
+
+# Upper bound on score (or dense question) cells held in memory at once
+_SCORE_CHUNK_CELLS = 1 << 22
+
+# Largest dense n-gram x topic matrix built for the matrix product path
+_DENSE_MAX_CELLS = 1 << 24
+
+# Time of one sparse (question n-gram, topic) pair relative to one
+# multiply-add in a float32 matrix product; measured at ~1000x with
+# OpenBLAS, kept conservative so the low-memory sparse path is preferred
+_SPARSE_PAIR_COST = 500
+
+_NON_ALNUM = re.compile(r"[^a-z0-9]+")
+
+# "Unit 1", "UNIT-II:", "Module 3 -", "Chapter 4." at the start of a line
+_UNIT_HEADING = re.compile(
+    r"^\s*(unit|module|chapter)\s*[-–:.]?\s*([ivx]+|\d+)\b[\s.:–-]*",
+    re.IGNORECASE,
+)
+
+# Sections after the topic list that are not topics
+_SYLLABUS_END = re.compile(
+    r"^\s*(text\s*books?|reference\s*books?|references|course\s*outcomes?)\b",
+    re.IGNORECASE,
+)
+
+_TOPIC_SPLIT = re.compile(r"\s*(?:[,;•]|\s[–-]\s)\s*")
+
+_MAX_TOPIC_CHARS = 80
+
+
+def _normalize(text: str) -> bytes:
+    """Lowercase, collapse punctuation to spaces and pad word boundaries."""
+    return f" {_NON_ALNUM.sub(' ', text.lower()).strip()} ".encode("utf-8")
+
+
+def _ngram_features(texts: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Hash the character n-grams of many texts in one vectorized pass.
+    
+    All texts are joined with NUL separators into one byte array, and a
+    rolling hash is computed for every window of each n-gram size; windows
+    that span a separator are dropped.
+    
+    Args:
+        texts: Texts to featurize
+        
+    Returns:
+        Parallel arrays of text index and n-gram hash, one entry per
+        n-gram occurrence
+    """
+    corpus = np.frombuffer(
+        b"\0".join(_normalize(text) for text in texts), dtype=np.uint8
+    ).astype(np.uint64)
+    # Text index of every position; a separator starts the next text
+    separators = np.cumsum(corpus == 0)
+    
+    docs = []
+    hashes = []
+    for size in _NGRAM_SIZES:
+        count = len(corpus) - size + 1
+        if count <= 0:
+            continue
+        # Seed with the size so 3- and 4-grams never share a hash
+        rolling = np.full(count, size, dtype=np.uint64)
+        for offset in range(size):
+            rolling = rolling * _HASH_BASE + corpus[offset:offset + count]
+        valid = (separators[size - 1:] == separators[:count]) & (
+            corpus[:count] != 0
+        )
+        docs.append(separators[:count][valid])
+        hashes.append(rolling[valid])
+    
+    if not docs:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.uint64)
+    return np.concatenate(docs).astype(np.int64), np.concatenate(hashes)
+
+
+def _count_cells(
+    docs: np.ndarray, columns: np.ndarray, width: int
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Count n-gram occurrences per (row, column) cell.
+    
+    A single sort replaces ``np.unique(..., return_counts=True)``, which is
+    several times slower on millions of int64 keys.
+    
+    Args:
+        docs: Row index per n-gram occurrence
+        columns: Vocabulary column per n-gram occurrence
+        width: Vocabulary size
+        
+    Returns:
+        Row, column and count arrays, sorted by row, one entry per cell
+    """
+    cells = np.sort(docs * width + columns)
+    if not len(cells):
+        return cells, cells, cells
+    starts = np.flatnonzero(np.concatenate(([True], cells[1:] != cells[:-1])))
+    counts = np.diff(np.append(starts, len(cells)))
+    cells = cells[starts]
+    return cells // width, cells % width, counts
+
+
+def _tfidf_weights(
+    rows: np.ndarray,
+    cols: np.ndarray,
+    counts: np.ndarray,
+    num_docs: int,
+    idf: np.ndarray,
+) -> np.ndarray:
+    """Return L2-normalized sublinear TF-IDF weights for counted cells."""
+    values = (1.0 + np.log(counts)) * idf[cols]
+    norms = np.sqrt(
+        np.bincount(rows, weights=values * values, minlength=num_docs)
+    )
+    return (values / np.maximum(norms[rows], 1e-12)).astype(np.float32)
+
+
+def match_questions(
+    questions: List[str], topics: List[str]
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Find the most similar topic for each question.
+    
+    Texts are represented as TF-IDF weighted character 3- and 4-grams over
+    the topics' vocabulary, and scored by cosine similarity, a chunk of
+    questions at a time to bound memory. Each topic has only a few dozen
+    n-grams, so scores are usually computed as a sparse product: every
+    question n-gram is expanded to the topics that contain it and the
+    products are summed with ``np.bincount``. When topics share so many
+    n-grams that this expansion would cost more than a dense matrix
+    product over the (small) vocabulary, the dense product is used instead.
+    
+    Args:
+        questions: Question texts
+        topics: Topic names
+        
+    Returns:
+        Best topic index per question and its cosine similarity (0 when the
+        question shares no n-grams with any topic)
+    """
+    num_questions = len(questions)
+    num_topics = len(topics)
+    best = np.zeros(num_questions, dtype=np.int64)
+    scores = np.zeros(num_questions, dtype=np.float32)
+    if not num_questions or not num_topics:
+        return best, scores
+    
+    topic_docs, topic_hashes = _ngram_features(topics)
+    question_docs, question_hashes = _ngram_features(questions)
+    
+    # Only n-grams that occur in some topic can contribute to a score
+    vocab = np.unique(topic_hashes)
+    width = len(vocab)
+    topic_cols = np.searchsorted(vocab, topic_hashes)
+    question_cols = np.searchsorted(vocab, question_hashes).clip(max=width - 1)
+    known = vocab[question_cols] == question_hashes
+    question_docs = question_docs[known]
+    question_cols = question_cols[known]
+    
+    t_rows, t_cols, t_counts = _count_cells(topic_docs, topic_cols, width)
+    q_rows, q_cols, q_counts = _count_cells(question_docs, question_cols, width)
+    
+    # Document frequency over questions and topics together
+    df = np.bincount(t_cols, minlength=width) + np.bincount(q_cols, minlength=width)
+    idf = np.log((1.0 + num_questions + num_topics) / (1.0 + df)) + 1.0
+    t_values = _tfidf_weights(t_rows, t_cols, t_counts, num_topics, idf)
+    q_values = _tfidf_weights(q_rows, q_cols, q_counts, num_questions, idf)
+    
+    # Column-major topic matrix: the topics containing each n-gram
+    order = np.argsort(t_cols, kind="stable")
+    t_rows, t_cols, t_values = t_rows[order], t_cols[order], t_values[order]
+    col_counts = np.bincount(t_cols, minlength=width)
+    col_start = np.concatenate(([0], np.cumsum(col_counts)))
+    
+    # Sparse cost grows with (question n-gram, topic) pairs, dense cost with
+    # the full matrix product; pick the cheaper one
+    pairs = int(np.dot(np.bincount(q_cols, minlength=width), col_counts))
+    dense = (
+        width * num_topics <= _DENSE_MAX_CELLS
+        and pairs * _SPARSE_PAIR_COST > num_questions * width * num_topics
+    )
+    if dense:
+        topic_matrix = np.zeros((width, num_topics), dtype=np.float32)
+        topic_matrix[t_cols, t_rows] = t_values
+        chunk = max(1, _SCORE_CHUNK_CELLS // max(width, num_topics))
+    else:
+        chunk = max(1, _SCORE_CHUNK_CELLS // num_topics)
+    
+    q_bounds = np.searchsorted(
+        q_rows, np.arange(0, num_questions + chunk, chunk)
+    )
+    for index, first in enumerate(range(0, num_questions, chunk)):
+        lo, hi = q_bounds[index], q_bounds[index + 1]
+        rows, cols, values = q_rows[lo:hi] - first, q_cols[lo:hi], q_values[lo:hi]
+        size = min(chunk, num_questions - first)
+        
+        # float32 from the dense product, float64 from weighted bincount
+        block: np.ndarray
+        if dense:
+            block = np.zeros((size, width), dtype=np.float32)
+            block[rows, cols] = values
+            block = block @ topic_matrix
+        else:
+            # Expand each question entry to the topic entries of its column
+            fanout = col_counts[cols]
+            starts = np.repeat(col_start[cols] - np.cumsum(fanout) + fanout, fanout)
+            positions = starts + np.arange(fanout.sum())
+            block = np.bincount(
+                np.repeat(rows, fanout) * num_topics + t_rows[positions],
+                weights=np.repeat(values, fanout) * t_values[positions],
+                minlength=size * num_topics,
+            ).reshape(size, num_topics)
+        
+        best[first:first + size] = block.argmax(axis=1)
+        scores[first:first + size] = block.max(axis=1)
+    
+    return best, scores
+
+
+def split_syllabus_topics(text: str) -> List[Tuple[Optional[str], str]]:
+    """
+    Split syllabus text into (unit, topic) pairs.
+    
+    Unit headings such as "Unit 1" or "Module II" start a new unit; topics
+    are separated by commas, semicolons, bullets, dashes or line breaks.
+    Reading stops at the text book, reference or course outcome sections.
+    
+    Args:
+        text: Extracted syllabus text
+        
+    Returns:
+        Unit label (None before the first heading) and topic name pairs
+    """
+    pairs: List[Tuple[Optional[str], str]] = []
+    seen = set()
+    unit: Optional[str] = None
+    
+    for raw_line in text.splitlines():
+        line = raw_line.strip()
+        if not line:
+            continue
+        if _SYLLABUS_END.match(line):
+            break
+        heading = _UNIT_HEADING.match(line)
+        if heading:
+            unit = f"{heading.group(1).title()} {heading.group(2).upper()}"
+            line = line[heading.end():]
+        
+        for part in _TOPIC_SPLIT.split(line):
+            topic = part.strip(" .:()-–")
+            if (
+                not re.search(r"[A-Za-z]{3,}", topic)
+                or len(topic) > _MAX_TOPIC_CHARS
+                or topic.lower() in seen
+            ):
+                continue
+            seen.add(topic.lower())
+            pairs.append((unit, topic))
+    
+    if any(unit for unit, _ in pairs):
+        # Lines before the first unit are the course header
+        pairs = [pair for pair in pairs if pair[0]]
+    return pairs
+
+
+def match_syllabus_to_pyq(
+    subject: str,
+    topics: Optional[List[str]] = None,
+    syllabus_file: Optional[str] = None,
+) -> dict:
+    """
+    Weight syllabus topics by how often the subject's PYQs asked about them.
+    
+    Each question in the subject's PYQ index is assigned to its most similar
+    syllabus topic (if the similarity reaches Config.TOPIC_MATCH_THRESHOLD),
+    and topics are weighted by the share of indexed years they appeared in.
+    The weights can be passed straight to ``generate_study_plan``.
+    
+    Args:
+        subject: Subject whose PYQ papers were indexed with
+            ``index_pyq_document``
+        topics: Syllabus topic names; alternatively give ``syllabus_file``
+        syllabus_file: Path to the syllabus PDF to read topics from
+        
+    Returns:
+        Dictionary with 'subject', 'years', 'question_count',
+        'matched_questions' and 'topics' (each with 'topic', 'unit',
+        'weight', 'question_count', 'years', 'year_count' and 'total_marks',
+        highest weight first) keys
+        
+    Raises:
+        ValueError: If no topics are given or found, or the subject has no
+            indexed PYQ papers
+    """
+    return _match_syllabus(get_pyq_index(), subject, topics, syllabus_file)
+
+
+def _match_syllabus(
+    index: PyqIndex,
+    subject: str,
+    topics: Optional[List[str]],
+    syllabus_file: Optional[str],
+) -> dict:
+    """Weight syllabus topics against the questions of a given PYQ index."""
+    began = time.perf_counter()
+    
+    pairs: List[Tuple[Optional[str], str]]
+    if topics:
+        pairs = [(None, str(topic).strip()) for topic in topics if str(topic).strip()]
+    elif syllabus_file:
+        pairs = split_syllabus_topics(extract_pdf_text(syllabus_file))
+    else:
+        raise ValueError("Provide syllabus topics or a syllabus_file")
+    if not pairs:
+        raise ValueError("No syllabus topics found")
+    
+    years = index.years(subject)
+    questions = index.questions(subject)
+    
+    best, scores = match_questions(
+        [question["text"] for question in questions],
+        [topic for _, topic in pairs],
+    )
+    matched = scores >= Config.TOPIC_MATCH_THRESHOLD
+    
+    rows: List[Dict[str, Any]] = []
+    for topic_index, (unit, topic) in enumerate(pairs):
+        hits = np.flatnonzero(matched & (best == topic_index))
+        topic_years = sorted({int(questions[i]["year"]) for i in hits})
+        rows.append({
+            "topic": topic,
+            "unit": unit,
+            # 1 for never asked, up to 3 for asked every indexed year
+            "weight": round(1.0 + 2.0 * len(topic_years) / len(years), 2)
+            if years
+            else 1.0,
+            "question_count": int(hits.size),
+            "years": topic_years,
+            "year_count": len(topic_years),
+            "total_marks": sum(int(questions[i]["marks"] or 0) for i in hits),
+        })
+    rows.sort(key=lambda row: (-row["weight"], -row["question_count"]))
+    
+    elapsed_ms = (time.perf_counter() - began) * 1000
+    logger.info(
+        f"Matched {int(matched.sum())}/{len(questions)} {subject} questions "
+        f"to {len(pairs)} syllabus topics in {elapsed_ms:.1f}ms"
+    )
+    
+    return {
+        "subject": subject,
+        "years": years,
+        "question_count": len(questions),
+        "matched_questions": int(matched.sum()),
+        "topics": rows,
+    }